@@ -6,23 +6,78 @@ import logging
 import os
 import sys
 import time
+from urllib.parse import urlparse
 
 import pytest
-import base64
 from selenium import webdriver
 from selenium.common import TimeoutException
 from selenium.webdriver.chrome.options import Options as ChromeOptions
 from selenium.webdriver.common.by import By
 from selenium.webdriver.firefox.options import Options as FirefoxOptions
-from selenium.webdriver.firefox.service import Service as FirefoxService
 from selenium.webdriver.support.wait import WebDriverWait
-from webdriver_manager.firefox import GeckoDriverManager
 from selenium.webdriver.support import expected_conditions as EC
 from pages.landing_page import LandingPage
 from pages.login_page import LoginPage
+from util.asset_cache import AssetCache, fetch_version
+from util.auth_cache import AuthSessionCache
+from util.browser_pool import BrowserPool
+from util.browser_profile import BrowserFactory, ProfileTemplate, template_key
+from util.driver_manager import get_service, shutdown_services
+from util.health_gate import (
+    FAILURE_ENV as HEALTH_FAILURE_ENV, critical_failures, default_probes, format_results, run_probes,
+)
+from util.perf_baseline import PerformanceBaseline
+from util.network_profiles import PROFILES as NETWORK_PROFILES, apply_profile as apply_network_profile
+from util.replay_proxy import OriginRewriter, get_replay_proxy, has_cassettes
+from util.artifacts import enforce_retention, run_id, save_screenshot, save_screenshot_png, shutdown_pipeline
+from util.screenshots import report_html as screenshot_html
+from util.performance_tracker import WEB_VITALS_OBSERVER
+from util.command_trace import CommandTracer
+from util.session_trace import SessionTracer
+from util.sleep_budget import SleepBudget
+from util.step_timing import StepTimer
+from util.timeout_calibration import TimeoutCalibration, activate as activate_timeout_calibration
+from util.wait_scripts import NETWORK_TRACKER
+
+# Firefox preferences, also baked into the template profile (util/browser_profile.py)
+FIREFOX_PREFERENCES = {
+    # Custom User-Agent to identify automated tests for Matomo exclusion
+    "general.useragent.override": "Mozilla/5.0 (Selenium/AutomatedTest) Firefox/120.0",
+    # Enable WebGL/WebGL2 in Firefox (headless and headed)
+    "webgl.disabled": False,
+    "webgl.force-enabled": True,
+    "webgl.enable-webgl2": True,
+    "webgl.msaa-force": True,
+    "layers.acceleration.force-enabled": True,
+    "gfx.canvas.accelerated": True,
+    "gfx.webrender.all": True,
+}
+# Additional Firefox preferences for CI/CD stability
+FIREFOX_HEADLESS_PREFERENCES = {
+    "dom.webnotifications.enabled": False,
+    "media.volume_scale": "0.0",
+    "browser.startup.homepage": "about:blank",
+    "startup.homepage_welcome_url": "about:blank",
+    "startup.homepage_welcome_url.additional": "about:blank",
+}
+ANALYTICS_EXCLUSION_COOKIE = {"name": "disable_analytics", "value": "1", "path": "/"}
+DEFAULT_TIMEOUT_DB = ".timeout_calibration.sqlite"
+
+
+def firefox_preferences(headless):
+    return {**FIREFOX_PREFERENCES, **(FIREFOX_HEADLESS_PREFERENCES if headless else {})}
+
+
+def create_browser(pytestconfig, profile_dir=None, cache_dir=None):
+    """
+    Start a browser.
 
-def create_browser(pytestconfig):
+    Args:
+        profile_dir: Existing profile to run on (a template clone), None for a fresh one
+        cache_dir: HTTP disk cache directory (an asset cache seed copy), None for the default
+    """
     browser_name = pytestconfig.getoption("--browser-name")
+    cache_bytes = pytestconfig.getoption("--asset-cache-max-mb") * 1024 ** 2
 
     headless = pytestconfig.getoption("--headless")
 
@@ -43,39 +98,38 @@ def create_browser(pytestconfig):
             options.add_argument("--enable-features=Vulkan")
             options.add_argument("--ignore-certificate-errors")
             options.add_argument('--blink-settings=imagesEnabled=true')
+        if profile_dir:
+            options.add_argument(f"--user-data-dir={profile_dir}")
+        if cache_dir:
+            options.add_argument(f"--disk-cache-dir={cache_dir}")
+            options.add_argument(f"--disk-cache-size={cache_bytes}")
         
-        browser = webdriver.Chrome(options=options)
+        browser = webdriver.Chrome(service=get_service("chrome"), options=options)
         browser.set_window_size(1400, 900)
 
     elif browser_name == "firefox":
         options = FirefoxOptions()
-        # Set custom User-Agent to identify automated tests for Matomo exclusion
-        options.set_preference("general.useragent.override", "Mozilla/5.0 (Selenium/AutomatedTest) Firefox/120.0")
         if headless:
             options.add_argument("--headless")
             options.add_argument("--no-sandbox")
             options.add_argument("--window-size=1400,900")
-            # Additional Firefox options for CI/CD stability
-            options.set_preference("dom.webnotifications.enabled", False)
-            options.set_preference("media.volume_scale", "0.0")
-            options.set_preference("browser.startup.homepage", "about:blank")
-            options.set_preference("startup.homepage_welcome_url", "about:blank")
-            options.set_preference("startup.homepage_welcome_url.additional", "about:blank")
-            # WebGL2 support in headless Firefox
-            options.set_preference("webgl.force-enabled", True)
-            options.set_preference("webgl.disabled", False)
-            options.set_preference("webgl.enable-webgl2", True)
-
-        # Enable WebGL/WebGL2 in Firefox (headless and headed)
-        options.set_preference("webgl.disabled", False)
-        options.set_preference("webgl.force-enabled", True)
-        options.set_preference("webgl.enable-webgl2", True)
-        options.set_preference("webgl.msaa-force", True)
-        options.set_preference("layers.acceleration.force-enabled", True)
-        options.set_preference("gfx.canvas.accelerated", True)
-        options.set_preference("gfx.webrender.all", True)
-
-        browser = webdriver.Firefox(service=FirefoxService(GeckoDriverManager().install()), options=options)
+        # Already in a template profile's user.js; geckodriver applies them cheaply
+        for name, value in firefox_preferences(headless).items():
+            options.set_preference(name, value)
+        # Lets PerformanceTracker clear the HTTP cache for cold samples
+        options.add_argument("-remote-allow-system-access")
+        # WebDriver BiDi, for the preload script registered below
+        options.enable_bidi = True
+        if profile_dir:
+            # Run on the clone in place instead of geckodriver's copy of a temporary profile
+            options.add_argument("-profile")
+            options.add_argument(profile_dir)
+        if cache_dir:
+            options.set_preference("browser.cache.disk.parent_directory", cache_dir)
+            options.set_preference("browser.cache.disk.smart_size.enabled", False)
+            options.set_preference("browser.cache.disk.capacity", cache_bytes // 1024)
+
+        browser = webdriver.Firefox(service=get_service("firefox"), options=options)
 
     else:
         raise ValueError(f"Unsupported browser: {browser_name}")
@@ -85,14 +139,22 @@ def create_browser(pytestconfig):
     wait = WebDriverWait(browser, 30)  # Increased wait timeout
     
     # Set flag to exclude automated tests from Matomo analytics
-    # For Chrome, use CDP to inject script on every page load
+    # For Chrome, use CDP to inject script on every page load. The network tracker and
+    # performance observers are injected too, so network-idle waits and PerformanceTracker
+    # also see activity from before their first call.
     if browser_name == "chrome":
         try:
             browser.execute_cdp_cmd('Page.addScriptToEvaluateOnNewDocument', {
-                'source': 'window._isSeleniumTest = true;'
+                'source': 'window._isSeleniumTest = true;' + NETWORK_TRACKER + WEB_VITALS_OBSERVER
             })
         except Exception as e:
             print(f"Warning: Could not set Matomo exclusion flag via CDP: {e}")
+    elif browser_name == "firefox":
+        # Same as above as a WebDriver BiDi preload script (Selenium's public script.pin)
+        try:
+            browser.script.pin('window._isSeleniumTest = true;' + NETWORK_TRACKER + WEB_VITALS_OBSERVER)
+        except Exception as e:
+            print(f"Warning: Could not pin the preload script via BiDi: {e}")
     
     # For Firefox and as fallback, it'll be injected after each navigation
     # Store the flag setter function in browser for easy access
@@ -103,7 +165,6 @@ def create_browser(pytestconfig):
     def set_analytics_exclusion_cookie(base_url):
         try:
             # Extract domain from base_url
-            from urllib.parse import urlparse
             parsed = urlparse(base_url)
             domain = parsed.netloc
             
@@ -112,12 +173,7 @@ def create_browser(pytestconfig):
             browser.get(version_url)
             
             # Set the analytics exclusion cookie
-            browser.add_cookie({
-                'name': 'disable_analytics',
-                'value': '1',
-                'domain': domain,
-                'path': '/'
-            })
+            browser.add_cookie({**ANALYTICS_EXCLUSION_COOKIE, 'domain': domain})
             print("✓ Analytics exclusion cookie set")
         except Exception as e:
             print(f"Warning: Could not set analytics exclusion cookie: {e}")
@@ -126,12 +182,155 @@ def create_browser(pytestconfig):
 
     return browser, wait
 
+def _asset_cache(pytestconfig, base_url):
+    """Shared HTTP cache for the deployed app version, None when disabled or the version is unknown."""
+    if pytestconfig.getoption("--no-asset-cache"):
+        return None
+    version = fetch_version(base_url)
+    if version is None:
+        logging.getLogger(__name__).warning("Asset cache: could not read /app/version, browsers start cold")
+        return None
+    project_root = os.path.abspath(os.path.dirname(__file__))
+    cache = AssetCache(
+        root=os.path.join(project_root, ".asset_cache"),
+        browser_name=pytestconfig.getoption("--browser-name"),
+        version=version,
+        max_bytes=pytestconfig.getoption("--asset-cache-max-mb") * 1024 ** 2,
+        logger=logging.getLogger(__name__),
+    )
+    cache.prune()
+    return cache
+
+
+def _profile_template(pytestconfig, base_url):
+    """Template profile for this browser configuration, built on first use; None when disabled."""
+    if pytestconfig.getoption("--no-profile-template"):
+        return None
+    browser_name = pytestconfig.getoption("--browser-name")
+    headless = pytestconfig.getoption("--headless")
+    preferences = firefox_preferences(headless) if browser_name == "firefox" else {}
+    project_root = os.path.abspath(os.path.dirname(__file__))
+    template = ProfileTemplate(
+        root=os.path.join(project_root, ".profile_templates"),
+        browser_name=browser_name,
+        # The host, not the origin: the local stand-in server gets a new port per run
+        key=template_key(browser_name, urlparse(base_url).hostname, headless, preferences),
+        logger=logging.getLogger(__name__),
+    )
+    try:
+        template.ensure(
+            launch=lambda profile_dir: create_browser(pytestconfig, profile_dir=profile_dir),
+            warmup_url=f"{base_url.rstrip('/')}/app/version",
+            cookies=[ANALYTICS_EXCLUSION_COOKIE],
+            preferences=preferences,
+        )
+    except Exception as e:
+        logging.getLogger(__name__).warning(f"Profile template: build failed, using fresh profiles: {e}")
+        return None
+    return template
+
+
+@pytest.fixture(scope="session")
+def browser_factory(pytestconfig):
+    """Creates browsers on a clone of the template profile, with a seeded HTTP cache."""
+    config = build_test_config(pytestconfig)
+    factory = BrowserFactory(
+        create=lambda **dirs: create_browser(pytestconfig, **dirs),
+        template=_profile_template(pytestconfig, config["base_url"]),
+        asset_cache=_asset_cache(pytestconfig, config["base_url"]),
+        logger=logging.getLogger(__name__),
+    )
+    yield factory
+    factory.close()
+
+
+@pytest.fixture(scope="session")
+def browser_pool(pytestconfig, browser_factory):
+    """Session-scoped pool of warm browsers, reset between tests instead of quit."""
+    config = build_test_config(pytestconfig)
+    realm_url = config["oidc_login_url"].split("/protocol/")[0] + "/"
+    pool = BrowserPool(
+        factory=browser_factory,
+        size=pytestconfig.getoption("--browser-pool-size"),
+        max_uses=pytestconfig.getoption("--browser-max-uses"),
+        reset_urls=[f"{config['base_url']}/app/version", realm_url],
+        on_quit=browser_factory.release,
+        logger=logging.getLogger(__name__),
+    )
+    yield pool
+    pool.close()
+    shutdown_services()
+
+
+@pytest.fixture(scope="session")
+def auth_cache(pytestconfig):
+    """Session-level cache of the logged-in app session, shared by all workers of a run."""
+    if pytestconfig.getoption("--no-auth-cache"):
+        return None
+    config = build_test_config(pytestconfig)
+    project_root = os.path.abspath(os.path.dirname(__file__))
+    return AuthSessionCache(
+        cache_dir=os.path.join(project_root, ".auth_cache"),
+        base_url=config["base_url"],
+        username=config["username"],
+        max_age=pytestconfig.getoption("--auth-cache-max-age"),
+        logger=logging.getLogger(__name__),
+    )
+
+
+@pytest.fixture(scope="session")
+def perf_baseline(pytestconfig):
+    """Store of past performance runs; ``evaluate`` returns significant regressions."""
+    db_path = pytestconfig.getoption("--perf-baseline-db")
+    if not os.path.isabs(db_path):
+        db_path = os.path.join(str(pytestconfig.rootpath), db_path)
+    return PerformanceBaseline(
+        db_path=db_path,
+        env=pytestconfig.getoption("env"),
+        browser=pytestconfig.getoption("--browser-name"),
+        window=pytestconfig.getoption("--perf-baseline-window"),
+        alpha=pytestconfig.getoption("--perf-alpha"),
+        min_change=pytestconfig.getoption("--perf-min-change"),
+        logger=logging.getLogger(__name__),
+    )
+
+
+@pytest.fixture(scope="session", autouse=True)
+def timeout_calibration(pytestconfig):
+    """Record named waits and, with --calibrated-timeouts, use timeouts derived from their history."""
+    db_path = pytestconfig.getoption("--timeout-db")
+    apply = pytestconfig.getoption("--calibrated-timeouts")
+    if not (apply or db_path or pytestconfig.getoption("--record-timeouts")):
+        yield None  # Opt-in: no database file, no extra round trip per navigation
+        return
+    db_path = db_path or DEFAULT_TIMEOUT_DB
+    if not os.path.isabs(db_path):
+        db_path = os.path.join(str(pytestconfig.rootpath), db_path)
+    store = TimeoutCalibration(
+        db_path=db_path,
+        env=pytestconfig.getoption("env"),
+        apply=apply,
+        safety_factor=pytestconfig.getoption("--timeout-safety-factor"),
+        logger=logging.getLogger(__name__),
+    )
+    activate_timeout_calibration(store)
+    yield store
+    activate_timeout_calibration(None)
+
+
+def _network_profile(request):
+    """Profile of the test: its network_profile marker, else --network-profile."""
+    marker = request.node.get_closest_marker("network_profile")
+    return marker.args[0] if marker else request.config.getoption("--network-profile")
+
+
 @pytest.fixture(scope="function")
-def public_browsing(pytestconfig, test_config, request):
-    browser, wait = create_browser(pytestconfig)
+def public_browsing(browser_pool, test_config, request):
+    browser, wait = entry = browser_pool.checkout()
+    apply_network_profile(browser, _network_profile(request))
     request.node._browser = browser
     yield browser, wait, test_config["base_url"]
-    browser.quit()
+    browser_pool.checkin(entry)
 
 
 @pytest.fixture(scope="function")
@@ -151,17 +350,47 @@ def visit_public_pages(public_browsing, logger):
 @pytest.fixture(scope="function")
 def test_config(pytestconfig):
     """Gets credentials and IDS returns the correct environment-specific settings."""
-    username = os.getenv("OBI_USERNAME")
-    password = os.getenv("OBI_PASSWORD")
-    env = pytestconfig.getoption("env")
+    return build_test_config(pytestconfig)
 
-    if not username or not password:
-        raise ValueError("Username or password is missing in the configuration!")
 
+def get_worker_id():
+    """Return the pytest-xdist worker id (gw0, gw1, ...) or 'master' when running serially."""
+    return os.getenv("PYTEST_XDIST_WORKER", "master")
+
+
+def get_credentials():
+    """
+    Pick the account for this process.
+
+    OBI_USERNAME_1..N / OBI_PASSWORD_1..N form an optional account pool; each
+    xdist worker gets its own account so parallel sessions don't collide.
+    Without a pool every worker uses OBI_USERNAME / OBI_PASSWORD.
+    """
+    accounts = []
+    index = 1
+    while os.getenv(f"OBI_USERNAME_{index}") and os.getenv(f"OBI_PASSWORD_{index}"):
+        accounts.append((os.getenv(f"OBI_USERNAME_{index}"), os.getenv(f"OBI_PASSWORD_{index}")))
+        index += 1
+
+    worker_id = get_worker_id()
+    if accounts and worker_id != "master":
+        return accounts[int(worker_id.lstrip("gw")) % len(accounts)]
+    if accounts and not os.getenv("OBI_USERNAME"):
+        return accounts[0]
+    return os.getenv("OBI_USERNAME"), os.getenv("OBI_PASSWORD")
+
+
+UPSTREAM_ORIGINS = {
+    "staging": "https://staging.openbraininstitute.org",
+    "production": "https://www.openbraininstitute.org",
+}
+
+
+def _environment_settings(env):
+    """URLs and ids of a real environment."""
     if env =="staging":
-        base_url = "https://staging.openbraininstitute.org"
+        base_url = UPSTREAM_ORIGINS["staging"]
         # base_url = "https://main.preview.openbraininstitute.org"
-        lab_url = f"{base_url}/app/virtual-lab"
         lab_id = os.getenv("LAB_ID_STAGING")
         project_id = os.getenv("PROJECT_ID_STAGING")
         oidc_login_url = (
@@ -176,8 +405,7 @@ def test_config(pytestconfig):
             "code_challenge_method=S256"
         )
     elif env == "production":
-        base_url = "https://www.openbraininstitute.org"
-        lab_url = f"{base_url}/app/virtual-lab"
+        base_url = UPSTREAM_ORIGINS["production"]
         lab_id = os.getenv("LAB_ID_PRODUCTION")
         project_id = os.getenv("PROJECT_ID_PRODUCTION")
         oidc_login_url = (
@@ -193,9 +421,44 @@ def test_config(pytestconfig):
         )
     else:
         raise ValueError(f"Invalid environment: {env}")
+    return base_url, lab_id, project_id, oidc_login_url
+
+
+def _cassette_dir(config):
+    """Cassette directory of the --replay-upstream environment."""
+    cassette_dir = config.getoption("--replay-dir")
+    if not os.path.isabs(cassette_dir):
+        cassette_dir = os.path.join(str(config.rootpath), cassette_dir)
+    return os.path.join(cassette_dir, config.getoption("--replay-upstream"))
+
+
+def build_test_config(pytestconfig):
+    """Build the environment-specific settings. Shared by fixtures of any scope."""
+    username, password = get_credentials()
+    env = pytestconfig.getoption("env")
+
+    if not username or not password:
+        raise ValueError("Username or password is missing in the configuration!")
+
+    if env == "local":
+        # Local record/replay stand-in for the upstream environment, see util/replay_proxy.py
+        upstream = pytestconfig.getoption("--replay-upstream")
+        proxy = get_replay_proxy(
+            UPSTREAM_ORIGINS[upstream],
+            _cassette_dir(pytestconfig),
+            mode=pytestconfig.getoption("--replay-mode"),
+            port=pytestconfig.getoption("--replay-port"),
+        )
+        base_url, lab_id, project_id, oidc_login_url = _environment_settings(upstream)
+        base_url = proxy.base_url
+        oidc_login_url = OriginRewriter(UPSTREAM_ORIGINS[upstream], proxy.base_url).text(oidc_login_url)
+    else:
+        base_url, lab_id, project_id, oidc_login_url = _environment_settings(env)
+    lab_url = f"{base_url}/app/virtual-lab"
 
     return {
         "username": username,
+        "password": password,
         "base_url": base_url,
         "lab_url": lab_url,
         "lab_id": lab_id,
@@ -205,13 +468,14 @@ def test_config(pytestconfig):
 
 
 @pytest.fixture(scope="function", autouse=True)
-def setup(request, pytestconfig, test_config):
+def setup(request, pytestconfig, test_config, browser_pool):
     """Fixture to set up the browser/webdriver.
-    Skips browser creation if the test uses visit_public_pages or public_browsing.
+    Skips browser creation if the test uses visit_public_pages or public_browsing, or is marked own_browser.
     """
     # Skip browser creation for tests that use their own browser via public_browsing
     fixture_names = request.fixturenames
-    if 'visit_public_pages' in fixture_names or 'public_browsing' in fixture_names:
+    if ('visit_public_pages' in fixture_names or 'public_browsing' in fixture_names
+            or request.node.get_closest_marker("own_browser")):
         yield None, None, test_config["base_url"], test_config["lab_id"], test_config["project_id"]
         return
 
@@ -223,7 +487,8 @@ def setup(request, pytestconfig, test_config):
     print(f"Starting tests in {environment.upper()} mode.")
     print(f"Base URL: {base_url}")
 
-    browser, wait = create_browser(pytestconfig)
+    browser, wait = entry = browser_pool.checkout()
+    apply_network_profile(browser, _network_profile(request))
 
     request.cls.base_url = base_url
     request.cls.lab_id = lab_id
@@ -234,7 +499,7 @@ def setup(request, pytestconfig, test_config):
     yield browser, wait, base_url, lab_id, project_id
 
     if browser is not None:
-        browser.quit()
+        browser_pool.checkin(entry)
 
 
 @pytest.fixture(scope="function")
@@ -306,7 +571,7 @@ def navigate_to_login(setup, logger, request, test_config):
     except TimeoutException:
         current_url = browser.current_url
         logger.error(f"Failed to reach login page. Current URL: {current_url}")
-        browser.save_screenshot("/tmp/navigate_to_login_failed.png")
+        save_screenshot(browser, "navigate_to_login_failed")
         raise RuntimeError(f"Cannot reach OpenID login page. Current URL: {current_url}")
     
     print("DEBUG: Returning login_page from conftest.py/navigate_to_login")
@@ -339,18 +604,33 @@ def navigate_to_login_direct(setup, logger, test_config):
     except TimeoutException:
         current_url = browser.current_url
         logger.error(f"Failed to reach login page. Current URL: {current_url}")
-        browser.save_screenshot("/tmp/navigate_to_login_direct_failed.png")
+        save_screenshot(browser, "navigate_to_login_direct_failed")
         raise RuntimeError(f"Cannot reach OIDC login page. Current URL: {current_url}")
 
     return LoginPage(browser, wait, lab_url=test_config["lab_url"], logger=logger)
 
 
-@pytest.fixture(scope="function")
-def login_direct_complete(setup, navigate_to_login_direct, test_config, logger):
-    """Perform direct login and return browser + wait ready for use."""
-    login_page = navigate_to_login_direct
+def _authenticate(request, browser, auth_cache, test_config, full_login):
+    """Restore the cached auth session, or run the full login and cache the result."""
+    if auth_cache is None or request.node.get_closest_marker("no_auth_cache"):
+        full_login()
+        return
+
+    if auth_cache.restore(browser, test_config["lab_url"]):
+        return
+
+    with auth_cache.lock:
+        # Another worker may have refreshed the session while we waited for the lock
+        if auth_cache.restore(browser, test_config["lab_url"]):
+            return
+        full_login()
+        auth_cache.capture(browser)
+
+
+def _perform_direct_login(login_page, test_config, logger):
+    """Drive the OIDC login form with retries and alternative completion checks."""
     username = test_config["username"]
-    password = os.getenv("OBI_PASSWORD")
+    password = test_config["password"]
 
     max_login_attempts = 3
     for login_attempt in range(max_login_attempts):
@@ -364,7 +644,7 @@ def login_direct_complete(setup, navigate_to_login_direct, test_config, logger):
             logger.error(f"Login attempt {login_attempt + 1} timeout. Current URL: {login_page.browser.current_url}")
             
             # Take screenshot for debugging
-            login_page.browser.save_screenshot(f"/tmp/login_timeout_attempt_{login_attempt + 1}.png")
+            save_screenshot(login_page.browser, f"login_timeout_attempt_{login_attempt + 1}")
             
             # Try multiple alternative approaches
             success = False
@@ -462,30 +742,89 @@ def login_direct_complete(setup, navigate_to_login_direct, test_config, logger):
                 logger.warning(f"Login attempt {login_attempt + 1} failed, retrying...")
                 time.sleep(5)  # Wait before retry
 
+
+@pytest.fixture(scope="function")
+def login_direct_complete(setup, request, auth_cache, test_config, logger):
+    """Perform direct login (or restore the cached session) and return browser + wait ready for use."""
     browser, wait, base_url, lab_id, project_id = setup
+
+    def full_login():
+        login_page = request.getfixturevalue("navigate_to_login_direct")
+        _perform_direct_login(login_page, test_config, logger)
+
+    _authenticate(request, browser, auth_cache, test_config, full_login)
     yield browser, wait, base_url, lab_id, project_id
 
 @pytest.fixture(scope="function")
-def login(navigate_to_login, test_config, logger):
-    """Fixture to log in and ensure user is authenticated."""
-    login_page = navigate_to_login
+def login(setup, request, auth_cache, test_config, logger):
+    """Fixture to log in (or restore the cached session) and ensure user is authenticated."""
+    browser, wait = setup[0], setup[1]
 
     username = test_config.get("username")
-    password = os.getenv("OBI_PASSWORD")
+    password = test_config.get("password")
 
     if not username or not password:
         raise ValueError("Username or password is missing in the configuration!")
 
-    login_page.perform_login(test_config["username"], password)
-    login_page.wait_for_login_complete()
-    print("Login successful. Current URL:", login_page.browser.current_url)
+    def full_login():
+        login_page = request.getfixturevalue("navigate_to_login")
+        login_page.perform_login(test_config["username"], password)
+        login_page.wait_for_login_complete()
+        print("Login successful. Current URL:", login_page.browser.current_url)
+
+    _authenticate(request, browser, auth_cache, test_config, full_login)
 
-    yield login_page.browser, login_page.wait
+    yield browser, wait
     try:
-        login_page.browser.delete_all_cookies()
+        browser.delete_all_cookies()
     except Exception:
         pass  # Browser may already be closed
 
+@pytest.fixture(scope="function", autouse=True)
+def step_timing(request, pytestconfig):
+    """With --step-timing, time every page-object call of the test as a nested step."""
+    if not pytestconfig.getoption("--step-timing"):
+        yield None
+        return
+
+    timer = StepTimer(request.node.nodeid)
+    request.node._step_timer = timer
+    timer.start()
+    yield timer
+    timer.stop()
+
+    project_root = os.path.abspath(os.path.dirname(__file__))
+    test_name = request.node.nodeid.replace("::", "_").split("/")[-1]
+    trace_path = os.path.join(project_root, "latest_logs", "step_timing", f"{test_name}.json")
+    timer.save(trace_path)
+    print(f"Step timing saved to: {trace_path}")
+
+
+@pytest.fixture(scope="function", autouse=True)
+def command_trace(request, pytestconfig):
+    """With --command-trace, record every WebDriver command of the test with its call site."""
+    if not pytestconfig.getoption("--command-trace"):
+        yield None
+        return
+
+    tracer = CommandTracer(request.node.nodeid)
+    request.node._command_tracer = tracer
+    tracer.start()
+    yield tracer
+    tracer.stop()
+
+    summary = tracer.summary(top=5)
+    print(f"WebDriver commands: {summary['command_count']} ({summary['total_latency_ms']:.0f}ms)")
+    for site in summary["top_call_sites"]:
+        print(f"  {site['count']:>5} commands  {site['total_ms']:>8.0f}ms  {site['name']}")
+
+    project_root = os.path.abspath(os.path.dirname(__file__))
+    test_name = request.node.nodeid.replace("::", "_").split("/")[-1]
+    trace_path = os.path.join(project_root, "latest_logs", "command_trace", f"{test_name}.trace.json")
+    tracer.save(trace_path)
+    print(f"Command trace saved to: {trace_path}")
+
+
 @pytest.fixture(scope="function")
 def logger(request):
     """Fixture to initialize the logger object"""
@@ -495,7 +834,9 @@ def logger(request):
 
     project_root = os.path.abspath(os.path.dirname(__file__))
     allure_reports_dir = os.path.join(project_root, "allure_reports")
-    log_file_path = os.path.join(allure_reports_dir, "report.log")
+    worker_id = get_worker_id()
+    log_name = "report.log" if worker_id == "master" else f"report_{worker_id}.log"
+    log_file_path = os.path.join(allure_reports_dir, log_name)
     if not os.path.exists(allure_reports_dir):
         os.makedirs(allure_reports_dir)
 
@@ -569,15 +910,6 @@ def pytest_runtest_makereport(item):
         if (report.skipped and xfail) or (report.failed and not xfail):
             print("Test failed - handling it")
 
-            project_root = os.path.abspath(os.path.dirname(__file__))
-            error_logs_dir = os.path.join(project_root, "latest_logs", "errors")
-            os.makedirs(error_logs_dir, exist_ok=True)
-
-            test_name = report.nodeid.replace("::", "_").split("/")[-1]
-            timestamp = time.strftime("%Y%m%d_%H%M%S")
-            file_name = os.path.join(error_logs_dir, f"{test_name}_{timestamp}.png")
-            print(f"Intended screenshot path: {file_name}")
-
             browser = None
             if hasattr(item, "cls"):
                 browser = getattr(item.cls, "browser", None)
@@ -586,45 +918,35 @@ def pytest_runtest_makereport(item):
                 print(f"Browser found in item attribute", report.nodeid)
 
             if browser:
+                # Encoding and writing happen in the background; the path is known right away
+                print("Browser object found - making screenshot")
                 try:
-                    print("Browser object found - making screenshot")
-                    _capture_screenshot(file_name, browser)
-                    if os.path.exists(file_name):
-                        print(f"Screenshot successfully saved at: {file_name}")
-                        with open(file_name, "rb") as image_file:
-                            encoded = base64.b64encode(image_file.read()).decode("utf-8")
-                            html = f'<div><img src="data:image/png;base64,{encoded}" ' \
-                                   f'style="width:304px;height:228px;display:block;margin-top:8px;" ' \
-                                   f'onclick="window.open(this.src)" /></div>'
-                        extra.append(pytest_html.extras.html(html))
-                    else:
-                        print(f"Screenshot not found at: {file_name}")
+                    png = browser.get_screenshot_as_png()
                 except Exception as e:
-                    print(f"Exception occurred while capturing screenshot: {e}")
+                    print(f"Could not take screenshot: {e}")
+                    png = None
+                if png:
+                    screenshot_path = save_screenshot_png(png, f"failed_{report.when}", nodeid=report.nodeid)
+                    print(f"Screenshot for {report.nodeid}: {screenshot_path}")
+                    if pytest_html:
+                        htmlpath = getattr(item.config.option, "htmlpath", None)
+                        report_dir = os.path.dirname(os.path.abspath(htmlpath)) if htmlpath else None
+                        # A self-contained report embeds a thumbnail; the full image stays a file
+                        self_contained = getattr(item.config.option, "self_contained_html", False)
+                        extra.append(pytest_html.extras.html(
+                            screenshot_html(screenshot_path, report_dir, png if self_contained else None)
+                        ))
             else:
                 print("No browser object found - skipping screenshot capture")
 
-        report.extra = extra
-
-
-def _capture_screenshot(name, browser):
-    """
-        Helper function to capture and save a screenshot.
+        step_timer = getattr(item, "_step_timer", None)
+        if report.when == "call" and step_timer and pytest_html:
+            extra.append(pytest_html.extras.html(step_timer.to_html()))
+        command_tracer = getattr(item, "_command_tracer", None)
+        if report.when == "call" and command_tracer and pytest_html:
+            extra.append(pytest_html.extras.html(command_tracer.to_html()))
 
-        - Ensures the target directory exists.
-        - Uses the browser object to capture a full-page screenshot.
-        :param name: The full path where the screenshot will be saved.
-        :param browser: The browser object used for screenshot capture.
-        """
-    try:
-        print(f"Creating error  directory at:{os.path.dirname(name)}")
-        os.makedirs(os.path.dirname(name), exist_ok=True)
-        print(f"Saving screenshot to: {name}")
-        # browser.get_full_page_screenshot_as_file(name)
-        browser.save_screenshot(name)
-        print(f"Screenshot captured: {name}")
-    except Exception as e:
-        print(f"Failed to capture screenshot '{name}': {e}")
+        report.extra = extra
 
 
 def pytest_html_results_table_row(report, cells):
@@ -637,8 +959,77 @@ def pytest_html_results_table_row(report, cells):
         cells.insert(1, ("?", "skipped"))
 
 
+def pytest_configure(config):
+    """Bound the kept artifacts and register the optional session tracer and sleep budget plugins."""
+    if not hasattr(config, "workerinput"):
+        # The run id is inherited by the xdist workers started after this
+        enforce_retention(
+            max_runs=config.getoption("--artifact-max-runs"),
+            max_bytes=config.getoption("--artifact-max-mb") * 1024 ** 2,
+            keep=run_id(),
+        )
+
+    if config.getoption("--session-trace"):
+        project_root = os.path.abspath(os.path.dirname(__file__))
+        tracer = SessionTracer(
+            os.path.join(project_root, "latest_logs", "session_trace"),
+            worker_id=get_worker_id(),
+            is_controller=not hasattr(config, "workerinput"),
+        )
+        config.pluginmanager.register(tracer, "session_tracer")
+
+    budget = config.getoption("--sleep-budget")
+    if config.getoption("--sleep-report") or budget is not None:
+        project_root = os.path.abspath(os.path.dirname(__file__))
+        config.pluginmanager.register(SleepBudget(
+            budget=budget,
+            fail=config.getoption("--sleep-budget-fail"),
+            output_path=os.path.join(project_root, "latest_logs", "sleep_report.json"),
+        ), "sleep_budget")
+
+
+def _check_environment_health(config):
+    """
+    Probe the environment before any browser starts; abort or skip the session when it is down.
+
+    Runs on the controller before xdist starts its workers, which inherit the
+    skip decision through the environment.
+    """
+    mode = config.getoption("--health-gate")
+    env = config.getoption("env")
+    if mode == "off":
+        return
+    if env == "local":
+        # The local stand-in server has no live dependencies, but replaying needs cassettes;
+        # without them every request gets a 404 and each test would time out slowly
+        cassette_dir = _cassette_dir(config)
+        if config.getoption("--replay-mode") == "record" or has_cassettes(cassette_dir):
+            return
+        reason = (f"No recorded responses in {cassette_dir}: record them with --replay-mode=record, "
+                  f"or choose an environment with --env=staging/production")
+    elif env not in UPSTREAM_ORIGINS:
+        # e.g. sauce-labs: no URLs to probe, the tests report their own configuration errors
+        print(f"\nEnvironment health: no probes for --env={env}, skipped")
+        return
+    else:
+        base_url, _, _, oidc_login_url = _environment_settings(env)
+        results = run_probes(default_probes(base_url, oidc_login_url), timeout=config.getoption("--health-timeout"))
+        print(f"\nEnvironment health ({env}):\n{format_results(results)}")
+        failures = critical_failures(results)
+        if not failures:
+            return
+        reason = "Environment unhealthy: " + ", ".join(f"{r['name']} ({r['error']})" for r in failures)
+    if mode == "skip":
+        os.environ[HEALTH_FAILURE_ENV] = reason
+    else:
+        pytest.exit(reason, returncode=pytest.ExitCode.TESTS_FAILED)
+
+
 def pytest_sessionstart(session):
-    """ Hook to delete previous allure reports before running the tests"""
+    """Check the environment is up, then delete previous allure reports before running the tests"""
+    if hasattr(session.config, "workerinput"):
+        return  # xdist workers must not wipe each other's logs; the controller cleans up once
+    _check_environment_health(session.config)
     try:
         project_root = os.path.abspath(os.path.dirname(__file__))
         folder_path = os.path.join(project_root, "allure_reports")
@@ -652,6 +1043,34 @@ def pytest_sessionstart(session):
         print(f"Failed to clear allure reports: {e}")
 
 
+@pytest.hookimpl(tryfirst=True)
+def pytest_sessionfinish(session):
+    """Write the queued failure screenshots before the HTML report links to them."""
+    shutdown_pipeline()
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_collection_modifyitems(config, items):
+    """
+    Turn pytest-ordering markers into xdist dependency groups.
+
+    Tests of one module that carry @pytest.mark.run(order=...) are pinned to the
+    same worker (--dist loadgroup), where pytest-ordering still runs them in
+    order. Modules without order markers are spread freely across workers.
+    Runs before xdist appends the group name to the node ids. When the health
+    gate failed in skip mode, every test is skipped instead.
+    """
+    health_failure = os.environ.get(HEALTH_FAILURE_ENV)
+    if health_failure:
+        for item in items:
+            item.add_marker(pytest.mark.skip(reason=health_failure))
+    if getattr(config.option, "dist", "no") == "no":
+        return
+    for item in items:
+        if item.get_closest_marker("run") and not item.get_closest_marker("xdist_group"):
+            item.add_marker(pytest.mark.xdist_group(name=item.module.__name__))
+
+
 def pytest_addoption(parser):
     parser.addoption(
         "--browser-name",
@@ -685,6 +1104,212 @@ def pytest_addoption(parser):
         choices=["local", "staging", "production", "sauce-labs"],
         help="Specify the environment to run the tests in"
     )
+    parser.addoption(
+        "--browser-pool-size",
+        action="store",
+        type=int,
+        default=1,
+        help="Number of warm browsers kept between tests (0 quits the browser after every test)"
+    )
+    parser.addoption(
+        "--browser-max-uses",
+        action="store",
+        type=int,
+        default=20,
+        help="Recycle a pooled browser after this many tests"
+    )
+    parser.addoption(
+        "--no-asset-cache",
+        action="store_true",
+        default=False,
+        help="Start every browser with an empty HTTP cache instead of seeding it from earlier sessions"
+    )
+    parser.addoption(
+        "--asset-cache-max-mb",
+        action="store",
+        type=int,
+        default=512,
+        help="Disk cache size of each browser; larger caches aren't kept as seeds"
+    )
+    parser.addoption(
+        "--no-profile-template",
+        action="store_true",
+        default=False,
+        help="Start browsers on a fresh profile instead of a clone of the prebuilt template"
+    )
+    parser.addoption(
+        "--no-auth-cache",
+        action="store_true",
+        default=False,
+        help="Always run the full Keycloak login instead of restoring the cached session"
+    )
+    parser.addoption(
+        "--auth-cache-max-age",
+        action="store",
+        type=int,
+        default=1800,
+        help="Maximum age in seconds of a cached auth session before logging in again"
+    )
+    parser.addoption(
+        "--step-timing",
+        action="store_true",
+        default=False,
+        help="Time page-object methods per test (trace in latest_logs/step_timing and in the HTML report)"
+    )
+    parser.addoption(
+        "--command-trace",
+        action="store_true",
+        default=False,
+        help="Record every WebDriver command per test (Chrome trace in latest_logs/command_trace)"
+    )
+    parser.addoption(
+        "--session-trace",
+        action="store_true",
+        default=False,
+        help="Write a Perfetto/Chrome trace of the whole session to latest_logs/session_trace"
+    )
+    parser.addoption(
+        "--sleep-report",
+        action="store_true",
+        default=False,
+        help="Report time.sleep calls from pages/ and tests/ per call site, page class and test"
+    )
+    parser.addoption(
+        "--sleep-budget",
+        action="store",
+        type=float,
+        default=None,
+        help="Maximum seconds of time.sleep per test; implies --sleep-report"
+    )
+    parser.addoption(
+        "--sleep-budget-fail",
+        action="store_true",
+        default=False,
+        help="Fail tests over the sleep budget instead of warning"
+    )
+    parser.addoption(
+        "--artifact-max-runs",
+        action="store",
+        type=int,
+        default=20,
+        help="Number of runs whose screenshots and debug dumps are kept in latest_logs/artifacts"
+    )
+    parser.addoption(
+        "--artifact-max-mb",
+        action="store",
+        type=int,
+        default=1024,
+        help="Size cap of latest_logs/artifacts; the oldest runs are evicted first"
+    )
+    parser.addoption(
+        "--perf-samples",
+        action="store",
+        type=int,
+        default=1,
+        help="Cold/warm sample pairs per page in the performance tests"
+    )
+    parser.addoption(
+        "--perf-baseline-db",
+        action="store",
+        default=".perf_baseline.sqlite",
+        help="SQLite file storing performance samples for regression checks"
+    )
+    parser.addoption(
+        "--perf-baseline-window",
+        action="store",
+        type=int,
+        default=20,
+        help="Number of previous samples per page forming the performance baseline"
+    )
+    parser.addoption(
+        "--perf-alpha",
+        action="store",
+        type=float,
+        default=0.05,
+        help="Significance level for performance regressions"
+    )
+    parser.addoption(
+        "--perf-min-change",
+        action="store",
+        type=float,
+        default=0.2,
+        help="Minimum relative slowdown of the median that counts as a regression"
+    )
+    parser.addoption(
+        "--network-profile",
+        action="store",
+        default="full",
+        choices=list(NETWORK_PROFILES),
+        help="Requests to block and network to emulate; a network_profile marker overrides it per test"
+    )
+    parser.addoption(
+        "--replay-mode",
+        action="store",
+        default="replay",
+        choices=["record", "replay"],
+        help="With --env=local: record upstream responses into cassettes, or replay them offline"
+    )
+    parser.addoption(
+        "--replay-upstream",
+        action="store",
+        default="production",
+        choices=["staging", "production"],
+        help="With --env=local: environment the cassettes are recorded from"
+    )
+    parser.addoption(
+        "--replay-dir",
+        action="store",
+        default=".replay_cassettes",
+        help="With --env=local: directory of the recorded responses"
+    )
+    parser.addoption(
+        "--replay-port",
+        action="store",
+        type=int,
+        default=0,
+        help="With --env=local: port of the local stand-in server (0 = any free port)"
+    )
+    parser.addoption(
+        "--timeout-db",
+        action="store",
+        default=None,
+        help=f"SQLite file with the observed durations of named waits; implies --record-timeouts "
+             f"(default with recording: {DEFAULT_TIMEOUT_DB})"
+    )
+    parser.addoption(
+        "--record-timeouts",
+        action="store_true",
+        default=False,
+        help="Record the duration of named waits for timeout calibration"
+    )
+    parser.addoption(
+        "--calibrated-timeouts",
+        action="store_true",
+        default=False,
+        help="Use timeouts derived from the history of named waits instead of the hard-coded ones "
+             "(implies --record-timeouts)"
+    )
+    parser.addoption(
+        "--timeout-safety-factor",
+        action="store",
+        type=float,
+        default=1.5,
+        help="Calibrated timeout = p99 of durations (failures censored at their timeout) x this factor"
+    )
+    parser.addoption(
+        "--health-gate",
+        action="store",
+        default="abort",
+        choices=["abort", "skip", "off"],
+        help="When the app or Keycloak fails its pre-session health probes: abort the run, skip every test, or ignore"
+    )
+    parser.addoption(
+        "--health-timeout",
+        action="store",
+        type=float,
+        default=10.0,
+        help="Seconds each pre-session health probe may take"
+    )
     parser.addoption(
         "--env_url",
         action="store",
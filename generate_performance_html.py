@@ -9,9 +9,12 @@ Usage:
 """
 import json
 import sys
+from html import escape
 from pathlib import Path
 from datetime import datetime
 
+from util.har import load_har_pages
+
 
 HTML_TEMPLATE = """
 <!DOCTYPE html>
@@ -166,6 +169,40 @@ HTML_TEMPLATE = """
             font-weight: bold;
             color: #2c3e50;
         }}
+        .waterfall {{
+            margin-top: 15px;
+            font-size: 12px;
+        }}
+        .waterfall-row {{
+            display: grid;
+            grid-template-columns: 320px 1fr 80px 80px;
+            gap: 10px;
+            align-items: center;
+            padding: 2px 0;
+        }}
+        .waterfall-url {{
+            overflow: hidden;
+            text-overflow: ellipsis;
+            white-space: nowrap;
+            color: #2c3e50;
+        }}
+        .waterfall-track {{
+            position: relative;
+            height: 10px;
+            background: #f0f0f0;
+        }}
+        .waterfall-bar {{
+            position: absolute;
+            height: 100%;
+            min-width: 2px;
+            background: #4facfe;
+        }}
+        .waterfall-bar.cache, .waterfall-bar.revalidated {{
+            background: #38ef7d;
+        }}
+        .waterfall-bar.unknown {{
+            background: #bdc3c7;
+        }}
         .footer {{
             text-align: center;
             color: #7f8c8d;
@@ -219,6 +256,7 @@ HTML_TEMPLATE = """
             </tbody>
         </table>
         
+{distributions}
         <h2 style="margin-bottom: 20px; color: #2c3e50;">Detailed Metrics</h2>
         <div class="page-details">
             {page_cards}
@@ -260,7 +298,7 @@ def generate_table_row(metric, max_time):
     """
 
 
-def generate_page_card(metric):
+def generate_page_card(metric, har_entries=None):
     """Generate a detailed card for a page."""
     return f"""
         <div class="page-card">
@@ -299,11 +337,123 @@ def generate_page_card(metric):
                     <div class="metric-label">Content Loaded</div>
                     <div class="metric-value">{metric['dom_content_loaded_time']}ms</div>
                 </div>
+                {generate_vitals_items(metric)}
             </div>
+            {generate_waterfall(har_entries or [])}
         </div>
     """
 
 
+def generate_distributions(distributions):
+    """Generate the table of sample distributions (pages measured several times)."""
+    if not distributions:
+        return ''
+
+    rows = []
+    for page_name, states in distributions.items():
+        for cache_state, metrics in states.items():
+            for metric_name, d in metrics.items():
+                rows.append(f"""
+                <tr>
+                    <td><strong>{escape(page_name)}</strong></td>
+                    <td>{cache_state}</td>
+                    <td>{metric_name}</td>
+                    <td>{d['samples']}</td>
+                    <td>{d['min']}</td>
+                    <td>{d['median']}</td>
+                    <td>{d['p95']}</td>
+                    <td>{d['stddev']}</td>
+                </tr>""")
+
+    return f"""
+        <h2 style="margin-bottom: 20px; color: #2c3e50;">Sample Distributions</h2>
+        <table>
+            <thead>
+                <tr>
+                    <th>Page</th>
+                    <th>Cache</th>
+                    <th>Metric</th>
+                    <th>Samples</th>
+                    <th>Min</th>
+                    <th>Median</th>
+                    <th>P95</th>
+                    <th>Stddev</th>
+                </tr>
+            </thead>
+            <tbody>
+                {''.join(rows)}
+            </tbody>
+        </table>
+"""
+
+
+WATERFALL_MAX_ROWS = 60
+
+
+def generate_waterfall(entries):
+    """Generate the resource waterfall of a page from its HAR entries."""
+    if not entries:
+        return ''
+
+    starts = [datetime.fromisoformat(e['startedDateTime']).timestamp() * 1000 for e in entries]
+    origin = min(starts)
+    span = max(s - origin + e['time'] for s, e in zip(starts, entries)) or 1
+
+    rows = []
+    for start, entry in sorted(zip(starts, entries), key=lambda x: x[0])[:WATERFALL_MAX_ROWS]:
+        offset = start - origin
+        url = entry['request']['url']
+        cache = entry.get('_cacheStatus', 'network')
+        size = entry.get('_transferSize', 0)
+        rows.append(f"""
+                <div class="waterfall-row" title="{escape(url)} | {entry.get('_initiatorType', '')} | {cache}">
+                    <div class="waterfall-url">{escape(url.split('?')[0][-60:])}</div>
+                    <div class="waterfall-track">
+                        <div class="waterfall-bar {cache}" style="left: {offset / span * 100:.2f}%; width: {entry['time'] / span * 100:.2f}%;"></div>
+                    </div>
+                    <div>{entry['time']:.0f}ms</div>
+                    <div>{'cache' if cache in ('cache', 'revalidated') else f'{size / 1024:.1f}KB'}</div>
+                </div>""")
+
+    hidden = len(entries) - len(rows)
+    more = f'<div class="page-url">{hidden} more resources in the HAR file</div>' if hidden > 0 else ''
+    return f"""
+            <div class="waterfall">
+                <div class="metric-label">Resource Waterfall ({len(entries)} requests)</div>
+                {''.join(rows)}
+                {more}
+            </div>"""
+
+
+VITALS_ITEMS = [
+    ('First Contentful Paint', 'first_contentful_paint', 'ms'),
+    ('Largest Contentful Paint', 'largest_contentful_paint', 'ms'),
+    ('Layout Shift (CLS)', 'cumulative_layout_shift', ''),
+    ('Interaction to Next Paint', 'interaction_to_next_paint', 'ms'),
+    ('First Input Delay', 'first_input_delay', 'ms'),
+    ('Total Blocking Time', 'total_blocking_time', 'ms'),
+    ('Long Tasks', 'long_task_count', ''),
+    ('Soft Navigations', 'soft_navigations', ''),
+]
+
+
+def generate_vitals_items(metric):
+    """Generate metric items for the web vitals the browser reported."""
+    items = []
+    for label, key, unit in VITALS_ITEMS:
+        value = metric.get(key)
+        if key == 'soft_navigations':
+            value = len(value) if value else None
+        if value is None:
+            continue
+        items.append(f"""
+                <div class="metric-item">
+                    <div class="metric-label">{label}</div>
+                    <div class="metric-value">{value}{unit}</div>
+                </div>""")
+    return ''.join(items)
+
+
 def main():
     if len(sys.argv) < 2:
         print("Usage: python generate_performance_html.py <report.json>")
@@ -329,10 +479,19 @@ def main():
     test_run = report.get('test_run', 'Unknown')
     
     max_time = max([m['total_time'] for m in metrics]) if metrics else 1
+
+    # Resource waterfalls are stored next to the report as HAR
+    har_pages = {}
+    if report.get('har_file'):
+        har_path = Path(input_file).parent / report['har_file']
+        try:
+            har_pages = load_har_pages(str(har_path))
+        except (FileNotFoundError, json.JSONDecodeError, KeyError):
+            print(f"⚠️  Could not read HAR file: {har_path}")
     
     # Generate HTML components
     table_rows = '\n'.join([generate_table_row(m, max_time) for m in metrics])
-    page_cards = '\n'.join([generate_page_card(m) for m in metrics])
+    page_cards = '\n'.join([generate_page_card(m, har_pages.get(m.get('page_ref'))) for m in metrics])
     
     # Generate HTML
     html = HTML_TEMPLATE.format(
@@ -343,6 +502,7 @@ def main():
         min_load=summary.get('min_load_time', 0),
         max_load=summary.get('max_load_time', 0),
         table_rows=table_rows,
+        distributions=generate_distributions(summary.get('distributions')),
         page_cards=page_cards
     )
     
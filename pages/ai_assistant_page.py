@@ -231,9 +231,9 @@ class AIAssistantPage(ProjectHome):
                 continue
         
         if not response_found:
-            # Fallback: wait with timing
-            time.sleep(10)
-            self.logger.info("Waited for AI response (fallback timing)")
+            # Fallback: wait for the streamed response to stop changing the DOM
+            self.wait_for_dom_quiet(quiet_ms=1000, timeout=10)
+            self.logger.info("Waited for AI response (DOM quiet fallback)")
         
         # Now wait for the response to complete
         self.wait_for_ai_response_completion(timeout=60)
@@ -271,8 +271,8 @@ class AIAssistantPage(ProjectHome):
                 continue
         
         if not cancel_disappeared:
-            self.logger.info("No cancel button found or it didn't disappear, using fallback wait")
-            time.sleep(10)  # Fallback wait
+            self.logger.info("No cancel button found or it didn't disappear, waiting for the DOM to settle")
+            self.wait_for_dom_quiet(quiet_ms=1000, timeout=10)
         
         self.logger.info("✅ AI response completion wait finished")
     
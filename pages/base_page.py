@@ -3,15 +3,68 @@
 # SPDX-License-Identifier: Apache-2.0
 
 import pytest
+import random
 import time
-from selenium.common import TimeoutException
+from selenium.common import (
+    JavascriptException, ScriptTimeoutException, StaleElementReferenceException, TimeoutException,
+    WebDriverException,
+)
+from selenium.webdriver.common.by import By
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.support.wait import WebDriverWait
 
+from util.artifacts import save_page_source, save_screenshot
+from util.step_timing import instrument_class
+from util.timeout_calibration import calibrated_timeout, calibrated_wait, is_active, record_wait
+from util.wait_scripts import (
+    WAIT_FOR_DOM_QUIET, WAIT_FOR_ELEMENT_STABLE, WAIT_FOR_NETWORK_IDLE, WAIT_FOR_RENDER_IDLE
+)
+
+# arguments: rowBy, rowValue, headerBy, headerValue, rowAttributes.
+# Reads a whole table in one round trip instead of one WebDriver call per cell.
+TABLE_SNAPSHOT_SCRIPT = """
+function query(by, value) {
+    if (by === 'xpath') {
+        var result = document.evaluate(value, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+        var nodes = [];
+        for (var i = 0; i < result.snapshotLength; i++) { nodes.push(result.snapshotItem(i)); }
+        return nodes;
+    }
+    var selectors = {'css selector': value, 'tag name': value, 'class name': '.' + value, 'id': '#' + value};
+    if (!(by in selectors)) { throw new Error('Unsupported locator strategy: ' + by); }
+    return Array.prototype.slice.call(document.querySelectorAll(selectors[by]));
+}
+function text(el) { return (el.innerText || el.textContent || '').trim(); }
+var attributes = arguments[4] || [];
+var headers = query(arguments[2], arguments[3]).map(function (th) { return text(th).split('\\n')[0]; });
+var rows = query(arguments[0], arguments[1]).map(function (tr) {
+    var cells = Array.prototype.slice.call(tr.querySelectorAll('td'));
+    var rowAttributes = {};
+    attributes.forEach(function (name) { rowAttributes[name] = tr.getAttribute(name); });
+    return {
+        text: text(tr),
+        cells: cells.map(text),
+        cell_titles: cells.map(function (td) { return td.getAttribute('title') || ''; }),
+        attributes: rowAttributes,
+        visible: tr.getAttribute('aria-hidden') !== 'true' && tr.offsetParent !== null
+            && getComputedStyle(tr).display !== 'none'
+    };
+});
+return {headers: headers, rows: rows};
+"""
+
+TABLE_ROW_LOCATOR = (By.CSS_SELECTOR, "tbody tr")
+TABLE_HEADER_LOCATOR = (By.CSS_SELECTOR, "thead th")
+
 
 @pytest.mark.usefixtures("setup", "logger")
 class CustomBasePage:
 
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # Page-object methods are timed as steps when running with --step-timing
+        instrument_class(cls)
+
     def __init__(self, browser, wait, lab_url, logger=None):
         self.browser = browser
         self.wait = wait
@@ -25,7 +78,25 @@ class CustomBasePage:
 
         url = self.lab_url + page_url
         print(f"INFO: CustomPage base_url + page_url = {url}" )
-        self.browser.get(url)
+        # Pages set their own page load timeout; a calibrated one replaces it once known
+        name = f"{type(self).__name__}.page_load"
+        page_timeout = timeout = None
+        if is_active():
+            page_timeout = self.browser.timeouts.page_load
+            timeout = calibrated_timeout(name, page_timeout)
+        if timeout != page_timeout:
+            self.browser.set_page_load_timeout(timeout)
+        start = time.perf_counter()
+        try:
+            self.browser.get(url)
+        except TimeoutException:
+            record_wait(name, time.perf_counter() - start, False, page_timeout)
+            raise
+        finally:
+            # Later navigations of the page object (browser.get, refresh) keep its own timeout
+            if timeout != page_timeout:
+                self.browser.set_page_load_timeout(page_timeout)
+        record_wait(name, time.perf_counter() - start, True, page_timeout)
         
         # Set Matomo exclusion flag for automated tests
         try:
@@ -112,7 +183,11 @@ class CustomBasePage:
         element = WebDriverWait(self.browser, timeout).until(
             EC.element_to_be_clickable(by_locator)
         )
-        time.sleep(0.5)  # short buffer for UI animation
+        # Let UI animations finish; best effort, the element is already clickable
+        try:
+            self.wait_for_element_stable(element, timeout=1)
+        except (StaleElementReferenceException, TimeoutException, ScriptTimeoutException, JavascriptException):
+            pass
         return element
 
     def assert_element_text(self, by_locator, expected_text):
@@ -126,6 +201,16 @@ class CustomBasePage:
     def enter_text(self, by_locator, text):
         return self.wait.until(EC.visibility_of_element_located(by_locator)).send_keys(text)
 
+    def named_wait(self, name, timeout):
+        """
+        Calibrated timeout of a named wait of this page, recording how long the block took.
+
+        Usage:
+            with self.named_wait("brain_region_panel", timeout) as timeout:
+                ...
+        """
+        return calibrated_wait(f"{type(self).__name__}.{name}", timeout)
+
     def is_visible(self, by_locator, timeout=10):
         try:
             return WebDriverWait(self.browser, timeout).until(
@@ -165,32 +250,131 @@ class CustomBasePage:
 
     def wait_for_network_idle(self, timeout=10, idle_time=1):
         """Wait until no network requests are pending.
-        Uses Performance API to detect when all resources have finished loading.
+        An injected agent counts in-flight fetch/XHR/WebSocket-connect requests, and a single
+        async script call resolves once nothing is in flight for ``idle_time`` seconds.
         Reduces database connection pool pressure by not navigating away while requests are in-flight.
         """
         start = time.time()
-        end_time = start + timeout
-        while time.time() < end_time:
-            pending = self.browser.execute_script("""
-                return window.performance.getEntriesByType('resource')
-                    .filter(e => e.responseEnd === 0).length;
-            """)
-            if pending == 0:
-                time.sleep(idle_time)
-                # Re-check after idle period
-                pending = self.browser.execute_script("""
-                    return window.performance.getEntriesByType('resource')
-                        .filter(e => e.responseEnd === 0).length;
-                """)
-                if pending == 0:
-                    elapsed = round(time.time() - start, 2)
-                    self.logger.info(f"Network idle after {elapsed}s")
-                    return True
-            time.sleep(0.5)
+        result = self._execute_async(WAIT_FOR_NETWORK_IDLE, timeout, idle_time * 1000, timeout * 1000)
         elapsed = round(time.time() - start, 2)
-        self.logger.warning(f"Network NOT idle after {elapsed}s (timeout={timeout}s)")
+        if result is None:
+            return False
+        if result["idle"]:
+            if self.logger:
+                self.logger.info(f"Network idle after {elapsed}s")
+            return True
+        if self.logger:
+            self.logger.warning(
+                f"Network NOT idle after {elapsed}s (timeout={timeout}s, in flight={result['inflight']})"
+            )
         return False
 
+    def _execute_async(self, script, timeout, *args):
+        """
+        Run an async wait script; the driver timeout outlasts the in-page timeout.
+
+        Returns:
+            The script's result, or None when the script failed, e.g. because a
+            navigation unloaded the document it ran in. Like the fixed sleeps these
+            waits replace, a wait must not fail the test.
+        """
+        previous_timeout = self.browser.timeouts.script
+        self.browser.set_script_timeout(timeout + 5)
+        try:
+            return self.browser.execute_async_script(script, *args)
+        except WebDriverException as e:
+            if self.logger:
+                self.logger.warning(f"Wait script interrupted: {type(e).__name__}: {e.msg}")
+            return None
+        finally:
+            # Pooled browsers are shared with later tests and PerformanceTracker
+            self.browser.set_script_timeout(previous_timeout)
+
+    def wait_for_dom_quiet(self, quiet_ms=500, timeout=10):
+        """
+        Wait until the DOM has not changed for ``quiet_ms`` milliseconds.
+
+        A MutationObserver is installed once per page and the check runs in the
+        browser, so this returns as soon as the page stops re-rendering.
+
+        Returns:
+            bool: True if the DOM went quiet within the timeout, False otherwise.
+        """
+        quiet = bool(self._execute_async(WAIT_FOR_DOM_QUIET, timeout, quiet_ms, timeout * 1000))
+        if not quiet and self.logger:
+            self.logger.warning(f"DOM still changing after {timeout}s")
+        return quiet
+
+    def wait_for_render_idle(self, timeout=5):
+        """Wait for pending React renders to commit (two animation frames + an idle callback)."""
+        return bool(self._execute_async(WAIT_FOR_RENDER_IDLE, timeout, timeout * 1000))
+
+    def wait_for_element_stable(self, element, frames=2, timeout=2):
+        """Wait until the element's position and size stop changing (e.g. after scroll or animation)."""
+        return bool(self._execute_async(WAIT_FOR_ELEMENT_STABLE, timeout, element, frames, timeout * 1000))
+
+    def wait_for_element_state(self, by_locator, state="visible", timeout=10):
+        """
+        Wait for an element to reach a state and return as soon as it does.
+
+        Args:
+            by_locator: Locator tuple of the element.
+            state: One of 'present', 'visible', 'clickable', 'hidden' or 'stable'
+                (visible and no longer moving/resizing).
+            timeout: Maximum time to wait in seconds.
+
+        Returns:
+            The element, or True for 'hidden'.
+        """
+        conditions = {
+            "present": EC.presence_of_element_located,
+            "visible": EC.visibility_of_element_located,
+            "clickable": EC.element_to_be_clickable,
+            "hidden": EC.invisibility_of_element_located,
+            "stable": EC.visibility_of_element_located,
+        }
+        if state not in conditions:
+            raise ValueError(f"Unknown element state: {state}")
+
+        result = WebDriverWait(self.browser, timeout).until(
+            conditions[state](by_locator),
+            message=f"Element {by_locator} did not become {state} within {timeout} seconds"
+        )
+        if state == "stable":
+            self.wait_for_element_stable(result, timeout=timeout)
+        return result
+
+    def wait_for_ui_settled(self, timeout=15, quiet_ms=500):
+        """
+        Wait until the UI settles: document loaded, network idle, DOM quiet and renders committed.
+        Use instead of a fixed time.sleep after navigation or an action that re-renders the page;
+        passing the old sleep duration as ``timeout`` keeps the worst case unchanged.
+
+        Returns:
+            bool: True if every signal settled within the timeout, False otherwise.
+        """
+        # Every sub-wait gets what is left of one deadline, so the worst case is ``timeout``
+        deadline = time.time() + timeout
+        try:
+            WebDriverWait(self.browser, timeout).until(
+                lambda d: d.execute_script("return document.readyState") == "complete"
+            )
+        except WebDriverException:
+            # Timed out, or a navigation interrupted the check
+            return False
+        remaining = deadline - time.time()
+        if remaining <= 0:
+            return False
+        if not self.wait_for_network_idle(timeout=remaining, idle_time=quiet_ms / 1000):
+            return False
+        remaining = deadline - time.time()
+        if remaining <= 0 or not self.wait_for_dom_quiet(quiet_ms=quiet_ms, timeout=remaining):
+            return False
+        remaining = deadline - time.time()
+        if remaining > 0:
+            self.wait_for_render_idle(timeout=min(remaining, 1))
+        return True
+
     def wait_for_page_to_load(self, timeout=10, element_locator=None):
         local_wait = WebDriverWait(self.browser, timeout)
         local_wait.until(
@@ -266,10 +450,7 @@ class CustomBasePage:
         """Wait until element is visible and enabled, then click (with JS fallback)."""
         try:
 
-            WebDriverWait(self.browser, 10).until(
-                lambda d: d.execute_script("return document.readyState") == "complete"
-            )
-            time.sleep(2)
+            self.wait_for_ui_settled(timeout=10)
 
             WebDriverWait(self.browser, timeout).until(
                 EC.presence_of_element_located(by_locator)
@@ -280,7 +461,7 @@ class CustomBasePage:
 
             elem = self.browser.find_element(*by_locator)
             self.browser.execute_script("arguments[0].scrollIntoView({block: 'center'});", elem)
-            time.sleep(2)
+            self.wait_for_element_stable(elem)
 
             try:
                 elem.click()
@@ -291,10 +472,12 @@ class CustomBasePage:
             return
 
         except Exception as e:
-            timestamp = int(time.time())
-            self.browser.save_screenshot(f"error_wait_and_click_{timestamp}.png")
-            with open(f"error_wait_and_click_{timestamp}.html", "w", encoding="utf-8") as f:
-                f.write(self.browser.page_source)
+            screenshot_path = save_screenshot(self.browser, "wait_and_click")
+            source_path = save_page_source(self.browser, "wait_and_click")
+            if self.logger:
+                self.logger.error(
+                    f"wait_and_click failed for {by_locator}; screenshot: {screenshot_path}, page source: {source_path}"
+                )
 
             try:
                 elem = self.browser.find_element(*by_locator)
@@ -353,6 +536,94 @@ class CustomBasePage:
 
         return WebDriverWait(self.browser, timeout).until(check_text)
 
+    def get_table_snapshot(self, row_locator=TABLE_ROW_LOCATOR, header_locator=TABLE_HEADER_LOCATOR,
+                           attributes=(), timeout=10):
+        """
+        Read a table's headers, rows, cell text and row attributes in a single execute_script call.
+
+        Args:
+            row_locator: Locator matching the table rows (css, xpath, tag, class or id).
+            header_locator: Locator matching the header cells.
+            attributes: Row attribute names to collect (e.g. 'data-row-key').
+            timeout: Seconds to wait for the first row; 0 reads the table as it is.
+
+        Returns:
+            dict: {'headers': [str], 'rows': [{'text', 'cells', 'cell_titles', 'attributes', 'visible'}]}
+        """
+        if timeout:
+            self.find_element(row_locator, timeout=timeout)
+        return self.browser.execute_script(
+            TABLE_SNAPSHOT_SCRIPT, *row_locator, *header_locator, list(attributes)
+        )
+
+    def get_table_column_values(self, column, row_locator=TABLE_ROW_LOCATOR,
+                                header_locator=TABLE_HEADER_LOCATOR, timeout=10):
+        """
+        Return the text of one column for every visible row.
+
+        Args:
+            column: 0-based column index or header text (case-insensitive).
+        """
+        snapshot = self.get_table_snapshot(row_locator, header_locator, timeout=timeout)
+        if isinstance(column, str):
+            headers = [h.lower() for h in snapshot["headers"]]
+            if column.lower() not in headers:
+                available_columns = ", ".join(f"'{h}'" for h in snapshot["headers"])
+                raise ValueError(f"Column '{column}' not found. Available columns: {available_columns}")
+            column = headers.index(column.lower())
+        return [row["cells"][column] for row in snapshot["rows"]
+                if row["visible"] and column < len(row["cells"])]
+
+    def pick_random_row(self, row_locator, header_locator=TABLE_HEADER_LOCATOR, limit=10, exclude=None,
+                        timeout=15):
+        """
+        Choose a random row among the first ``limit`` visible ones, reading their text in one snapshot.
+
+        Args:
+            row_locator: Locator matching the table rows.
+            header_locator: Locator matching the header cells, used by ``exclude``.
+            limit: Number of leading rows to choose from.
+            exclude: Optional {header text: cell text}. A row is skipped when its cell under
+                every one of these headers contains the text, unless that leaves no row.
+            timeout: Seconds to wait for the first row.
+
+        Returns:
+            tuple: (row element, first line of the row text, at most 60 characters)
+        """
+        try:
+            snapshot = self.get_table_snapshot(row_locator, header_locator, timeout=timeout)
+        except TimeoutException:
+            snapshot = {"headers": [], "rows": []}
+        # The elements to click, in the same document order as the snapshot rows
+        elements = self.browser.find_elements(*row_locator)
+        candidates = [(element, row) for element, row in zip(elements, snapshot["rows"]) if row["visible"]][:limit]
+        if not candidates:
+            raise RuntimeError("No rows found in the table")
+
+        columns = {}
+        for header, text in (exclude or {}).items():
+            index = next((i for i, h in enumerate(snapshot["headers"]) if header in h), None)
+            if index is None:
+                columns = {}  # Can't tell excluded rows apart without every column
+                break
+            columns[index] = text
+        if columns:
+            eligible = []
+            for element, row in candidates:
+                cells = row["cells"]
+                if all(i < len(cells) and text in cells[i] for i, text in columns.items()):
+                    if self.logger:
+                        self.logger.info(f"Skipping row: {[cells[i] for i in columns]}")
+                else:
+                    eligible.append((element, row))
+            if eligible:
+                candidates = eligible
+            elif self.logger:
+                self.logger.warning("No eligible rows after filtering, using all visible")
+
+        element, row = random.choice(candidates)
+        return element, row["text"].split('\n')[0][:60]
+
     def _get_counts_with_retry(self, record_count_locators, timeout):
         record_counts = []
         for locator in record_count_locators:
@@ -367,4 +638,8 @@ class CustomBasePage:
                 raise TimeoutException(f"Timeout: No text found for record at {locator} within {timeout} seconds.")
             except ValueError:
                 raise ValueError(f"Could not parse record count from text: '{record_text}'")
-        return record_counts
\ No newline at end of file
+        return record_counts
+
+
+# Base helpers (find_element, wait_and_click, ...) show up as nested steps
+instrument_class(CustomBasePage)
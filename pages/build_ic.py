@@ -9,6 +9,7 @@ import logging
 
 from locators.build_ic_locators import BuildIcLocators
 from pages.home_page import HomePage
+from util.artifacts import save_screenshot
 
 
 class BuildIcPage(HomePage):
@@ -117,7 +118,7 @@ class BuildIcPage(HomePage):
                 logger.error("No 'ion channel' text found in page source")
             
             # Take screenshot for debugging
-            self.browser.save_screenshot("debug_workflows_page.png")
+            save_screenshot(self.browser, "ion_channel_card_not_found")
             raise Exception("Cannot find Ion channel card on workflows page")
         
         assert ion_channel_card.is_displayed(), "Ion channel card is not displayed"
@@ -309,9 +310,12 @@ class BuildIcPage(HomePage):
 
         # Try to extract the recording name from the row containing this radio button
         try:
-            row = radio_btns[chosen_index].find_element(By.XPATH, "./ancestor::tr")
-            cells = row.find_elements(By.TAG_NAME, "td")
-            row_text = " | ".join(cell.text.strip() for cell in cells if cell.text.strip())
+            cells = self.browser.execute_script(
+                "return Array.from(arguments[0].closest('tr').querySelectorAll('td'), "
+                "td => (td.innerText || '').trim());",
+                radio_btns[chosen_index],
+            )
+            row_text = " | ".join(cell for cell in cells if cell)
             logger.info(f"Selected ephys recording: {row_text}")
         except Exception as e:
             logger.info(f"Could not extract recording details from row: {e}")
@@ -672,7 +676,7 @@ class BuildIcPage(HomePage):
         
         if not equation_btn:
             logger.info(f"Cannot find equation option for {tab_name}, taking screenshot")
-            self.browser.save_screenshot(f"debug_{tab_name}_equation_not_found.png")
+            save_screenshot(self.browser, f"{tab_name}_equation_not_found")
             return False
         
         # Scroll into view
@@ -757,7 +761,7 @@ class BuildIcPage(HomePage):
         
         if not build_model_btn:
             logger.info("Cannot find Build model button or it's still disabled")
-            self.browser.save_screenshot("debug_build_model_button_not_found.png")
+            save_screenshot(self.browser, "build_model_button_not_found")
             return False
         
         # Click the button
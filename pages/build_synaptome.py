@@ -12,6 +12,7 @@ import logging
 
 from locators.build_synaptome_locators import BuildSynaptomeLocators
 from pages.home_page import HomePage
+from util.artifacts import save_screenshot
 
 
 class BuildSynaptomePage(HomePage):
@@ -111,51 +112,33 @@ class BuildSynaptomePage(HomePage):
         :param column_index: Index of the column to retrieve values (0-based).
         :return: List of text values from the specified column.
         """
-        rows = self.find_all_elements(BuildSynaptomeLocators.ROWS)
-
-        column_values = []
-        for row in rows:
-            cells = self.find_all_elements(BuildSynaptomeLocators.CELLS)
-            if column_index < len(cells):
-                column_values.append(cells[column_index].text.strip())
-
-        return column_values
+        self.find_all_elements(BuildSynaptomeLocators.ROWS)
+        return self.get_table_column_values(column_index)
 
     def get_first_table_row_content(self):
         """
         Fetches the content of the first table cell from the first row.
         """
-        first_data_row = self.is_visible(BuildSynaptomeLocators.ROW1)
-
-        return [cell.text.strip() for cell in first_data_row.find_elements(By.TAG_NAME, "td")]
+        self.is_visible(BuildSynaptomeLocators.ROW1)
+        rows = self.get_table_snapshot(BuildSynaptomeLocators.ROW1, timeout=0)["rows"]
+        return rows[0]["cells"] if rows else []
 
 
     def get_table_content(self):
         # Wait until the table element is present
-        table = self.find_element(BuildSynaptomeLocators.TABLE)
-        # Wait until at least one row of the table is populated with data
-        WebDriverWait(self.browser, 20).until(
-            lambda driver: any(
-                self.find_all_elements((By.TAG_NAME, "td"), timeout=10) and  # Corrected Tuple Argument
-                any(cell.text.strip() for cell in self.find_all_elements((By.TAG_NAME, "td"), timeout=10))
-                # Corrected Tuple Argument
-                for row in table.find_elements(By.TAG_NAME, "tr")
-            ),
-            "Table rows are not populated with data within the timeout."
-        )
+        self.find_element(BuildSynaptomeLocators.TABLE)
 
-        # Extract table content once it is fully loaded
-        rows = self.find_all_elements((By.TAG_NAME, "tr"))  # Corrected Tuple Argument
-        table_content = []
-        for row in rows:
-            # For each row, get all cell elements using the custom helper
-            cells = self.find_all_elements((By.TAG_NAME, "td"), timeout=10)  # Corrected Tuple Argument
-            # Extract and clean the text content of all cells in the row
-            row_content = [cell.text.strip() for cell in cells]
-            if row_content:  # Include non-empty rows only
-                table_content.append(row_content)
+        def populated_snapshot(driver):
+            # Whole table in one round trip; retry until at least one cell has data
+            snapshot = self.get_table_snapshot(timeout=0)
+            return snapshot if any(any(row["cells"]) for row in snapshot["rows"] if row["visible"]) else False
 
-        return table_content
+        snapshot = WebDriverWait(self.browser, 20).until(
+            populated_snapshot,
+            "Table rows are not populated with data within the timeout."
+        )
+        # Include visible, non-empty rows only
+        return [row["cells"] for row in snapshot["rows"] if row["visible"] and row["cells"]]
 
     def input_name_field(self):
         return self.find_element(BuildSynaptomeLocators.INPUT_NAME_FIELD)
@@ -415,7 +398,7 @@ class BuildSynaptomePage(HomePage):
                 logger.error("No 'synaptome' text found in page source")
             
             # Take screenshot for debugging
-            self.browser.save_screenshot("debug_workflows_page.png")
+            save_screenshot(self.browser, "synaptome_card_not_found")
             raise Exception("Cannot find Synaptome card on workflows page")
         
         assert synaptome_card.is_displayed(), "Synaptome card is not displayed"
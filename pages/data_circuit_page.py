@@ -372,16 +372,17 @@ class DataCircuitPage(HomePage):
             raise RuntimeError("No rows found in the circuit table")
 
         visible_rows = rows[:min(10, len(rows))]
-        # Filter out excluded rows
+        # Filter out excluded rows; row texts come from one snapshot call instead of one call per row
+        row_texts = [r["text"] for r in self.get_table_snapshot(DataCircuitLocators.TABLE_ROWS, timeout=0)["rows"]]
         valid_rows = [
-            r for r in visible_rows
-            if not any(excl in (r.text or "") for excl in EXCLUDED_ROWS)
+            (r, text) for r, text in zip(visible_rows, row_texts)
+            if not any(excl in text for excl in EXCLUDED_ROWS)
         ]
         if not valid_rows:
-            valid_rows = visible_rows  # fallback if all filtered out
+            valid_rows = list(zip(visible_rows, row_texts))  # fallback if all filtered out
 
-        row = random.choice(valid_rows)
-        row_text = row.text.split('\n')[0][:60]
+        row, text = random.choice(valid_rows)
+        row_text = text.split('\n')[0][:60]
         self.logger.info(f"Clicking row: '{row_text}...'")
 
         # Click on a cell within the row (2nd td) for reliable click registration
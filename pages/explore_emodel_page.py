@@ -45,10 +45,11 @@ class ExploreEModelDataPage(ExplorePage):
         return self.find_element(ExploreEModelPageLocators.BR_SEARCH_FIELD_TYPE, timeout=timeout)
 
     def find_brain_region_panel(self, timeout=40):
-        WebDriverWait(self.browser, timeout).until(
-            lambda driver: driver.execute_script("return document.readyState") == "complete"
-        )
-        return self.is_visible(ExploreEModelPageLocators.BRAIN_REGION_PANEL, timeout=timeout)
+        with self.named_wait("brain_region_panel", timeout) as timeout:
+            WebDriverWait(self.browser, timeout).until(
+                lambda driver: driver.execute_script("return document.readyState") == "complete"
+            )
+            return self.is_visible(ExploreEModelPageLocators.BRAIN_REGION_PANEL, timeout=timeout)
 
     def find_br_cerebrum_title(self, timeout=15):
         return self.find_element(ExploreEModelPageLocators.BR_CEREBRUM_TITLE, timeout=timeout)
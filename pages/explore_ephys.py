@@ -276,46 +276,37 @@ class ExploreElectrophysiologyPage(ExplorePage):
 
     def verify_filtered_results(self, expected_value, column_type="species"):
         """Verify that filtered results contain the expected value"""
-        table_rows = self.get_table_rows()
-        if not table_rows:
+        try:
+            rows = self.get_table_snapshot(ExploreEphysLocators.TABLE_ROWS)["rows"]
+        except TimeoutException:
+            rows = []
+        if not rows:
             self.logger.warning("No table rows found")
             return False
         
         found_matches = 0
         total_checked = 0
         
-        for row in table_rows[:10]:  # Check first 10 rows
-            try:
-                total_checked += 1
-                cells = row.find_elements(By.TAG_NAME, "td")
-                
-                if column_type == "species":
-                    species_cell = None
-                    
-                    if len(cells) > 5:
-                        species_cell = cells[5]
-                    
-                    if species_cell:
-                        cell_text = species_cell.text.strip()
-                        cell_title = species_cell.get_attribute('title') or ""
-                        
-                        if expected_value.lower() in cell_text.lower() or expected_value.lower() in cell_title.lower():
-                            found_matches += 1
-                            self.logger.debug(f"Row {total_checked}: ✅ Found match - text: '{cell_text}', title: '{cell_title}'")
-                        else:
-                            # Log all cells for debugging
-                            all_cells_text = [f"[{i}]: '{c.text.strip()}'" for i, c in enumerate(cells)]
-                            self.logger.debug(f"Row {total_checked}: ❌ No match in column 5 - text: '{cell_text}', title: '{cell_title}'. All cells: {', '.join(all_cells_text[:7])}")
+        for row in rows[:10]:  # Check first 10 rows
+            total_checked += 1
+            cells = row["cells"]
+            
+            if column_type == "species":
+                if len(cells) > 5:
+                    cell_text = cells[5]
+                    cell_title = row["cell_titles"][5]
                     
-                elif column_type == "contributor":
-                    if len(cells) > 6:
-                        contributor_cell = cells[6]
-                        if expected_value.lower() in contributor_cell.text.lower():
-                            found_matches += 1
-                            
-            except Exception as e:
-                self.logger.debug(f"Could not check row {total_checked} for {column_type}: {e}")
-                continue
+                    if expected_value.lower() in cell_text.lower() or expected_value.lower() in cell_title.lower():
+                        found_matches += 1
+                        self.logger.debug(f"Row {total_checked}: ✅ Found match - text: '{cell_text}', title: '{cell_title}'")
+                    else:
+                        # Log all cells for debugging
+                        all_cells_text = [f"[{i}]: '{c}'" for i, c in enumerate(cells)]
+                        self.logger.debug(f"Row {total_checked}: ❌ No match in column 5 - text: '{cell_text}', title: '{cell_title}'. All cells: {', '.join(all_cells_text[:7])}")
+                
+            elif column_type == "contributor":
+                if len(cells) > 6 and expected_value.lower() in cells[6].lower():
+                    found_matches += 1
         
         if found_matches > 0:
             self.logger.info(f"✅ Found {found_matches} matching results out of {total_checked} rows for {column_type}: {expected_value}")
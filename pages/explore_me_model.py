@@ -162,13 +162,10 @@ class ExploreMeModelPage(ExplorePage):
 
     def click_random_row(self):
         """Click a random row from the ME-model table."""
-        rows = self.get_table_rows()
-        if not rows:
+        try:
+            row, row_text = self.pick_random_row(ExploreMeModelLocators.LV_TABLE_ROWS, timeout=20)
+        except RuntimeError:
             raise RuntimeError("No rows found in ME-model table")
-
-        visible_rows = rows[:min(10, len(rows))]
-        row = random.choice(visible_rows)
-        row_text = row.text.split('\n')[0][:60]
         self.logger.info(f"Clicking row: '{row_text}...'")
         self.browser.execute_script("arguments[0].scrollIntoView({block: 'center'});", row)
         time.sleep(1)
@@ -2,6 +2,7 @@
 # Copyright (c) 2025 Open Brain Institute
 # SPDX-License-Identifier: Apache-2.0
 import time
+from urllib.parse import urlparse
 
 from selenium.common import TimeoutException, StaleElementReferenceException
 from selenium.webdriver.common.by import By
@@ -10,6 +11,7 @@ from selenium.webdriver.support.wait import WebDriverWait
 from locators.explore_page_locators import ExplorePageLocators
 from selenium.webdriver.support import expected_conditions as EC
 from pages.home_page import HomePage
+from util.har import RESOURCE_TIMING_SCRIPT
 
 
 class ExplorePage(HomePage):
@@ -66,10 +68,11 @@ class ExplorePage(HomePage):
         return self.find_element(ExplorePageLocators.ATLAS_FULLSCREEN, timeout=timeout)
 
     def find_brain_region_panel(self, timeout=40):
-        WebDriverWait(self.browser, timeout).until(
-            lambda driver: driver.execute_script("return document.readyState") == "complete"
-        )
-        return self.is_visible(ExplorePageLocators.BRAIN_REGION_PANEL, timeout=timeout)
+        with self.named_wait("brain_region_panel", timeout) as timeout:
+            WebDriverWait(self.browser, timeout).until(
+                lambda driver: driver.execute_script("return document.readyState") == "complete"
+            )
+            return self.is_visible(ExplorePageLocators.BRAIN_REGION_PANEL, timeout=timeout)
 
     def find_species_dropdown(self, timeout=10):
         return self.find_element(ExplorePageLocators.BRAIN_REGION_SPECIES_DROPDOWN, timeout=timeout)
@@ -368,16 +371,17 @@ class ExplorePage(HomePage):
     def get_slow_network_resources(self, min_duration_ms=2000, max_entries=10):
         """Get slow network resources from Performance API for debugging."""
         try:
-            return self.browser.execute_script(f"""
-                return performance.getEntriesByType('resource')
-                    .filter(e => e.duration > {min_duration_ms})
-                    .map(e => {{
-                        const url = new URL(e.name);
-                        const path = url.pathname.length > 60 ? '...' + url.pathname.slice(-60) : url.pathname;
-                        return {{ name: path, duration: Math.round(e.duration), type: e.initiatorType }};
-                    }})
-                    .sort((a, b) => b.duration - a.duration)
-                    .slice(0, {max_entries});
-            """)
+            entries = self.browser.execute_script(RESOURCE_TIMING_SCRIPT, 0)['entries']
+            slow = sorted((e for e in entries if e['duration'] > min_duration_ms),
+                          key=lambda e: e['duration'], reverse=True)[:max_entries]
+            resources = []
+            for e in slow:
+                path = urlparse(e['url']).path
+                resources.append({
+                    'name': '...' + path[-60:] if len(path) > 60 else path,
+                    'duration': round(e['duration']),
+                    'type': e['initiator'],
+                })
+            return resources
         except Exception:
             return []
@@ -40,7 +40,8 @@ class ExploreSynaptomeDataPage(ExplorePage):
 
     def find_brain_region_panel(self, timeout=20):
         """Find the brain region panel"""
-        return self.find_element(ExploreSynaptomePageLocators.BRAIN_REGION_PANEL, timeout)
+        with self.named_wait("brain_region_panel", timeout) as timeout:
+            return self.find_element(ExploreSynaptomePageLocators.BRAIN_REGION_PANEL, timeout)
 
     def find_search_button(self, timeout=20):
         """Find the search button"""
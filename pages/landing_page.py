@@ -6,6 +6,7 @@ import time
 from selenium.common import TimeoutException
 from locators.landing_locators import LandingLocators
 from pages.home_page import HomePage
+from util.artifacts import save_screenshot
 
 
 class LandingPage(HomePage):
@@ -138,14 +139,8 @@ class LandingPage(HomePage):
             self.logger.error(f"❌ Failed to click any login button: {e}")
             
             # Take screenshot for debugging
-            try:
-                import os
-                os.makedirs("latest_logs/errors", exist_ok=True)
-                screenshot_path = f"latest_logs/errors/login_click_failed_{int(time.time())}.png"
-                self.browser.save_screenshot(screenshot_path)
-                self.logger.info(f"Screenshot saved: {screenshot_path}")
-            except:
-                pass
+            screenshot_path = save_screenshot(self.browser, "login_click_failed")
+            self.logger.info(f"Screenshot saved: {screenshot_path}")
                 
             raise
 
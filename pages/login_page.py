@@ -110,7 +110,7 @@ class LoginPage(CustomBasePage):
                 # Don't fail here, just log and continue
         
         # Final wait to ensure page is fully loaded
-        time.sleep(2)
+        self.wait_for_ui_settled(timeout=2)
 
     def find_form_container(self, timeout=10):
         return self.find_element(LoginPageLocators.FORM_CONTAINER, timeout=timeout)
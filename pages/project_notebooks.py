@@ -10,8 +10,8 @@ from selenium.webdriver.support.wait import WebDriverWait
 
 from locators.project_notebooks_locators import ProjectNotebooksLocators
 from pages.home_page import HomePage
+from util.artifacts import save_screenshot
 from typing import List
-from selenium.webdriver.remote.webelement import WebElement
 
 class ProjectNotebooks(HomePage):
     def __init__(self, browser, wait, logger, base_url):
@@ -92,28 +92,15 @@ class ProjectNotebooks(HomePage):
     def filter_scale_title(self, timeout=10):
         return self.find_element(ProjectNotebooksLocators.FILTER_SCALE_TITLE, timeout=timeout)
 
-    def get_column_cells(self, column_name: str) -> List[WebElement]:
-        """Get all cells in a specific column by column name."""
+    def get_column_values(self, column_name: str) -> List[str]:
+        """Get the non-empty text of every visible cell in a column, read in a single round trip."""
         try:
-            header_texts = self.get_column_header_texts()
-            column_index = None
-
-            for i, header_text in enumerate(header_texts, start=1):
-                if header_text.lower() == column_name.lower():
-                    column_index = i
-                    break
-
-            if column_index is None:
-                available_columns = ", ".join([f"'{h}'" for h in header_texts])
-                raise ValueError(f"Column '{column_name}' not found. Available columns: {available_columns}")
-
-            xpath = f"//tbody/tr[not(contains(@style,'display: none'))]/td[{column_index}]"
-            cells = self.find_all_elements((By.XPATH, xpath))
-
-            return [cell for cell in cells if cell.text.strip()]
-            
+            values = self.get_table_column_values(
+                column_name, header_locator=(By.CSS_SELECTOR, "th[data-testid='column-header']")
+            )
+            return [value for value in values if value]
         except Exception as e:
-            self.logger.error(f"Failed to get column cells for '{column_name}': {str(e)}")
+            self.logger.error(f"Failed to get column values for '{column_name}': {str(e)}")
             return []
 
     def page_filter(self):
@@ -241,21 +228,8 @@ class ProjectNotebooks(HomePage):
         value = value.lower()
 
         def check_scale_values(driver):
-            try:
-                cells = self.get_column_cells("Scale")
-                if not cells:
-                    return False
-                
-                for cell in cells:
-                    try:
-                        cell_text = cell.text.strip().lower()
-                        if cell_text != value:
-                            return False
-                    except Exception:
-                        return False
-                return True
-            except Exception:
-                return False
+            values = self.get_column_values("Scale")
+            return bool(values) and all(v.lower() == value for v in values)
 
         WebDriverWait(self.browser, timeout).until(check_scale_values)
 
@@ -355,8 +329,8 @@ class ProjectNotebooks(HomePage):
 
         if not jupyter_loaded:
             self.logger.error(f"Jupyter notebook did not load after {max_attempts} attempts")
-            self.browser.save_screenshot("debug_jupyter_not_loaded.png")
-            self.logger.info("Screenshot saved as debug_jupyter_not_loaded.png")
+            screenshot_path = save_screenshot(self.browser, "jupyter_not_loaded")
+            self.logger.info(f"Screenshot saved as {screenshot_path}")
 
         self.browser.switch_to.window(original_window)
         self.logger.info("Switched back to original tab")
@@ -7,6 +7,7 @@ from selenium.common import TimeoutException, StaleElementReferenceException, El
 from selenium.webdriver.support.wait import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from pages.base_page import CustomBasePage
+from util.artifacts import save_screenshot
 
 
 class RobustBasePage(CustomBasePage):
@@ -87,8 +88,9 @@ class RobustBasePage(CustomBasePage):
             except:
                 pass  # jQuery might not be present
                 
-            # Additional wait for any animations/transitions
-            time.sleep(1)
+            # Wait for any animations/transitions to finish re-rendering
+            self.wait_for_dom_quiet(quiet_ms=300, timeout=1)
+            self.wait_for_render_idle(timeout=1)
             
             if self.logger:
                 self.logger.info("Page is stable and ready")
@@ -120,8 +122,7 @@ class RobustBasePage(CustomBasePage):
     def take_debug_screenshot(self, name="debug"):
         """Take screenshot for debugging purposes."""
         try:
-            filename = f"/tmp/{name}_{int(time.time())}.png"
-            self.browser.save_screenshot(filename)
+            filename = save_screenshot(self.browser, name)
             if self.logger:
                 self.logger.info(f"Debug screenshot saved: {filename}")
             return filename
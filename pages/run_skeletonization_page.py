@@ -10,6 +10,7 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.common.action_chains import ActionChains
 from selenium.webdriver.common.keys import Keys
 from pages.home_page import HomePage
+from util.timeout_calibration import calibrated_timeout, record_wait
 from locators.run_skeletonization_locators import RunSkeletonizationLocators as Loc
 
 
@@ -147,13 +148,7 @@ class RunSkeletonizationPage(HomePage):
 
     def click_random_row(self):
         """Click a random visible row. Returns the row text snippet."""
-        rows = self.get_table_rows()
-        if not rows:
-            raise RuntimeError("No rows found in the table")
-
-        visible_rows = rows[:min(10, len(rows))]
-        row = random.choice(visible_rows)
-        row_text = row.text.split('\n')[0][:60]
+        row, row_text = self.pick_random_row(Loc.TABLE_ROWS)
         self.logger.info(f"Clicking row: '{row_text}...'")
         self.browser.execute_script("arguments[0].scrollIntoView({block: 'center'});", row)
         time.sleep(1)
@@ -574,6 +569,8 @@ class RunSkeletonizationPage(HomePage):
     def wait_for_skeletonization_terminal_state(self, timeout=300, poll_interval=10):
         """Poll skeletonization card statuses until all reach a terminal state."""
         import time as _time
+        name = f"{type(self).__name__}.skeletonization_terminal_state"
+        default, timeout = timeout, calibrated_timeout(name, timeout)
         terminal = {'done', 'failed', 'error', 'completed', 'success'}
         start = _time.time()
         while _time.time() - start < timeout:
@@ -583,6 +580,7 @@ class RunSkeletonizationPage(HomePage):
                 self.logger.info(
                     f"All skeletonizations reached terminal state after {elapsed}s: {statuses}"
                 )
+                record_wait(name, _time.time() - start, True, default)
                 return True
             elapsed = int(_time.time() - start)
             self.logger.info(
@@ -590,6 +588,7 @@ class RunSkeletonizationPage(HomePage):
             )
             _time.sleep(poll_interval)
         self.logger.warning(f"Skeletonizations did not complete within {timeout}s")
+        record_wait(name, _time.time() - start, False, default)
         return False
 
     # ── Cost modal ───────────────────────────────────────────────────────
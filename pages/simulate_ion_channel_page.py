@@ -43,13 +43,13 @@ class SimulateIonChannelPage(HomePage):
 
     def wait_for_page_ready(self, timeout=30):
         super().wait_for_page_ready(timeout=timeout)
-        time.sleep(2)
+        self.wait_for_ui_settled(timeout=2)
 
     def click_simulate_category(self):
         el = self.element_to_be_clickable(Loc.SIMULATE_CATEGORY_CARD, timeout=15)
         el.click()
         self.logger.info("Clicked Simulate category")
-        time.sleep(3)
+        self.wait_for_ui_settled(timeout=3)
 
     def click_ion_channel_card(self):
         """Click the Ion channel card, scrolling the carousel if needed."""
@@ -58,7 +58,7 @@ class SimulateIonChannelPage(HomePage):
             if el.is_displayed():
                 el.click()
                 self.logger.info("Clicked Ion channel card (already visible)")
-                time.sleep(5)
+                self.wait_for_ui_settled(timeout=5)
                 return
         except TimeoutException:
             pass
@@ -68,13 +68,13 @@ class SimulateIonChannelPage(HomePage):
                 next_btn = self.element_to_be_clickable(Loc.TYPE_CAROUSEL_NEXT_BTN, timeout=5)
                 next_btn.click()
                 self.logger.info("Clicked carousel next arrow")
-                time.sleep(1)
+                self.wait_for_ui_settled(timeout=1)
                 try:
                     el = self.find_element(Loc.ION_CHANNEL_CARD, timeout=3)
                     if el.is_displayed():
                         el.click()
                         self.logger.info("Clicked Ion channel card (after scrolling)")
-                        time.sleep(5)
+                        self.wait_for_ui_settled(timeout=5)
                         return
                 except TimeoutException:
                     continue
@@ -89,7 +89,7 @@ class SimulateIonChannelPage(HomePage):
         el = self.find_element(Loc.PUBLIC_TAB, timeout=15)
         el.click()
         self.logger.info("Clicked Public tab")
-        time.sleep(3)
+        self.wait_for_ui_settled(timeout=3)
 
     def get_table_rows(self, timeout=15):
         self.find_element(Loc.TABLE_ROWS, timeout=timeout)
@@ -102,18 +102,12 @@ class SimulateIonChannelPage(HomePage):
 
     def click_random_row(self):
         """Click a random visible row. Returns the row text snippet."""
-        rows = self.get_table_rows()
-        if not rows:
-            raise RuntimeError("No rows found in the table")
-
-        visible_rows = rows[:min(10, len(rows))]
-        row = random.choice(visible_rows)
-        row_text = row.text.split('\n')[0][:60]
+        row, row_text = self.pick_random_row(Loc.TABLE_ROWS)
         self.logger.info(f"Clicking row: '{row_text}...'")
         self.browser.execute_script(
             "arguments[0].scrollIntoView({block: 'center'});", row
         )
-        time.sleep(1)
+        self.wait_for_element_stable(row)
         try:
             ActionChains(self.browser).move_to_element(row).click().perform()
         except Exception:
@@ -126,7 +120,7 @@ class SimulateIonChannelPage(HomePage):
     def wait_for_mini_detail(self, timeout=15):
         self.element_visibility(Loc.MINI_VIEWER, timeout=timeout)
         self.logger.info("Mini-detail view appeared")
-        time.sleep(1)
+        self.wait_for_ui_settled(timeout=1)
 
     def verify_mini_detail_title_and_description(self):
         results = {}
@@ -156,7 +150,7 @@ class SimulateIonChannelPage(HomePage):
     def wait_for_config_page(self, timeout=30):
         self.find_element(Loc.CONFIG_LAYOUT, timeout=timeout)
         self.logger.info("Config page layout loaded")
-        time.sleep(2)
+        self.wait_for_ui_settled(timeout=2)
 
     def verify_config_tabs(self):
         results = {}
@@ -194,7 +188,7 @@ class SimulateIonChannelPage(HomePage):
         dd = self.element_to_be_clickable(Loc.MODEL_TRACES_DROPDOWN, timeout=timeout)
         dd.click()
         self.logger.info("Clicked Model traces dropdown")
-        time.sleep(1)
+        self.wait_for_ui_settled(timeout=1)
         return self._get_select_dropdown_items()
 
     def click_activation_dropdown(self, timeout=10):
@@ -202,7 +196,7 @@ class SimulateIonChannelPage(HomePage):
         dd = self.element_to_be_clickable(Loc.ACTIVATION_DROPDOWN, timeout=timeout)
         dd.click()
         self.logger.info("Clicked Activation dropdown")
-        time.sleep(1)
+        self.wait_for_ui_settled(timeout=1)
         return self._get_select_dropdown_items()
 
     def _get_select_dropdown_items(self, timeout=5):
@@ -223,7 +217,7 @@ class SimulateIonChannelPage(HomePage):
             label = item.text.strip()
             item.click()
             self.logger.info(f"Selected dropdown item [{index}]: '{label}'")
-            time.sleep(1)
+            self.wait_for_ui_settled(timeout=1)
             return label
         self.logger.warning(f"Dropdown item index {index} out of range ({len(items)})")
         return None
@@ -315,7 +309,7 @@ class SimulateIonChannelPage(HomePage):
                 self.browser.execute_script(
                     "arguments[0].scrollIntoView({block: 'center'});", dd
                 )
-                time.sleep(0.3)
+                self.wait_for_element_stable(dd)
                 dd.click()
                 clicked += 1
                 time.sleep(0.3)
@@ -331,13 +325,13 @@ class SimulateIonChannelPage(HomePage):
         self.browser.execute_script(
             "arguments[0].scrollIntoView({block: 'center'});", btn
         )
-        time.sleep(0.5)
+        self.wait_for_element_stable(btn)
         try:
             ActionChains(self.browser).move_to_element(btn).click().perform()
         except Exception:
             self.browser.execute_script("arguments[0].click();", btn)
         self.logger.info(f"Clicked '{label}' menu button")
-        time.sleep(2)
+        self.wait_for_ui_settled(timeout=2)
 
     def click_info_tab(self):
         self._click_left_menu_btn(Loc.LEFT_MENU_INFO_BTN, "Info")
@@ -372,7 +366,7 @@ class SimulateIonChannelPage(HomePage):
             self.browser.execute_script(
                 "arguments[0].scrollIntoView({block: 'center'});", btn
             )
-            time.sleep(0.3)
+            self.wait_for_element_stable(btn)
 
             # Check if the sub-entry is open by looking for an active sub-entry
             # sibling within the same parent container
@@ -385,7 +379,7 @@ class SimulateIonChannelPage(HomePage):
                 if sub_entry.is_displayed():
                     btn.click()
                     self.logger.info(f"Collapsed {label} sub-entry")
-                    time.sleep(1)
+                    self.wait_for_ui_settled(timeout=1)
                     return
             except Exception:
                 pass
@@ -400,13 +394,13 @@ class SimulateIonChannelPage(HomePage):
         self.browser.execute_script(
             "arguments[0].scrollIntoView({block: 'center'});", btn
         )
-        time.sleep(0.5)
+        self.wait_for_element_stable(btn)
         try:
             ActionChains(self.browser).move_to_element(btn).click().perform()
         except Exception:
             self.browser.execute_script("arguments[0].click();", btn)
         self.logger.info("Clicked 'Add' ion channel model")
-        time.sleep(2)
+        self.wait_for_ui_settled(timeout=2)
 
     def get_ion_channel_model_type_items(self, timeout=10):
         """Get all model type items in the middle column after clicking Add."""
@@ -432,13 +426,13 @@ class SimulateIonChannelPage(HomePage):
         self.browser.execute_script(
             "arguments[0].scrollIntoView({block: 'center'});", item
         )
-        time.sleep(0.5)
+        self.wait_for_element_stable(item)
         try:
             ActionChains(self.browser).move_to_element(item).click().perform()
         except Exception:
             self.browser.execute_script("arguments[0].click();", item)
         self.logger.info(f"Clicked model type item [{index}]: '{label}'")
-        time.sleep(2)
+        self.wait_for_ui_settled(timeout=2)
         return label
 
     def click_ion_channel_model_field(self, timeout=10):
@@ -447,10 +441,10 @@ class SimulateIonChannelPage(HomePage):
         self.browser.execute_script(
             "arguments[0].scrollIntoView({block: 'center'});", field
         )
-        time.sleep(0.5)
+        self.wait_for_element_stable(field)
         field.click()
         self.logger.info("Clicked ion channel model selection field")
-        time.sleep(3)
+        self.wait_for_ui_settled(timeout=3)
 
     def select_ion_channel_model_from_list(self, row_index=None, exclude_prefix="Test_DONT_USE_", timeout=15):
         """Select a model from the list view by clicking its radio button.
@@ -461,6 +455,9 @@ class SimulateIonChannelPage(HomePage):
         """
         rows = self.find_all_elements(Loc.ION_CHANNEL_MODEL_LIST_ROWS, timeout=timeout)
         assert len(rows) > 0, "No model rows found in the list"
+        # Row names from one snapshot instead of one call per row
+        names = [r["text"].split('\n')[0].strip()
+                 for r in self.get_table_snapshot(Loc.ION_CHANNEL_MODEL_LIST_ROWS, timeout=0)["rows"]]
 
         if row_index is not None:
             # Legacy explicit index selection
@@ -471,12 +468,10 @@ class SimulateIonChannelPage(HomePage):
         else:
             # Skip first 2 rows and any row matching exclude_prefix
             eligible = []
-            for i, r in enumerate(rows):
+            for i, (r, row_name) in enumerate(zip(rows, names)):
                 if i < 2:
-                    row_name = r.text.split('\n')[0].strip()
                     self.logger.info(f"Skipping row [{i}]: '{row_name[:60]}' (first two)")
                     continue
-                row_name = r.text.split('\n')[0].strip()
                 if exclude_prefix and row_name.startswith(exclude_prefix):
                     self.logger.info(f"Skipping row [{i}]: '{row_name[:60]}' (matches exclude prefix)")
                     continue
@@ -490,11 +485,12 @@ class SimulateIonChannelPage(HomePage):
 
             row = random.choice(eligible)
 
-        row_text = row.text.split('\n')[0][:60]
+        index = rows.index(row)
+        row_text = names[index][:60] if index < len(names) else row.text.split('\n')[0][:60]
         self.browser.execute_script(
             "arguments[0].scrollIntoView({block: 'center'});", row
         )
-        time.sleep(0.5)
+        self.wait_for_element_stable(row)
 
         # Try clicking the radio button inside the row
         try:
@@ -510,7 +506,7 @@ class SimulateIonChannelPage(HomePage):
                 self.browser.execute_script("arguments[0].click();", row)
 
         self.logger.info(f"Selected model row: '{row_text}'")
-        time.sleep(1)
+        self.wait_for_ui_settled(timeout=1)
 
         # Click the Select button if present (modal footer)
         try:
@@ -519,7 +515,7 @@ class SimulateIonChannelPage(HomePage):
             )
             select_btn.click()
             self.logger.info("Clicked 'Select' button in modal")
-            time.sleep(2)
+            self.wait_for_ui_settled(timeout=2)
         except TimeoutException:
             self.logger.info("No modal Select button found — selection may be inline")
 
@@ -531,7 +527,7 @@ class SimulateIonChannelPage(HomePage):
         self.browser.execute_script(
             "arguments[0].scrollIntoView({block: 'center'});", inp
         )
-        time.sleep(0.3)
+        self.wait_for_element_stable(inp)
         inp.click()
         inp.send_keys(Keys.COMMAND + "a")
         inp.send_keys(Keys.BACKSPACE)
@@ -679,7 +675,7 @@ class SimulateIonChannelPage(HomePage):
             self.browser.execute_script(
                 "arguments[0].scrollIntoView({block: 'center'});", block_element
             )
-            time.sleep(1)
+            self.wait_for_element_stable(block_element)
 
             # Find ALL plus-circle icons and click the LAST one
             icons = block_element.find_elements(
@@ -693,10 +689,10 @@ class SimulateIonChannelPage(HomePage):
             self.browser.execute_script(
                 "arguments[0].scrollIntoView({block: 'center'});", add_icon
             )
-            time.sleep(0.5)
+            self.wait_for_element_stable(add_icon)
             self.browser.execute_script("arguments[0].click();", add_icon)
             self.logger.info(f"Clicked sweep add button (icon {len(icons)} of {len(icons)})")
-            time.sleep(2)
+            self.wait_for_ui_settled(timeout=2)
             return True
         except Exception as e:
             self.logger.warning(f"Could not click sweep add button: {e}")
@@ -710,7 +706,7 @@ class SimulateIonChannelPage(HomePage):
             self.browser.execute_script(
                 "arguments[0].scrollIntoView({block: 'center'});", inp
             )
-            time.sleep(0.3)
+            self.wait_for_element_stable(inp)
             inp.click()
             inp.send_keys(Keys.COMMAND + "a")
             inp.send_keys(Keys.BACKSPACE)
@@ -782,13 +778,13 @@ class SimulateIonChannelPage(HomePage):
         self.browser.execute_script(
             "arguments[0].scrollIntoView({block: 'center'});", btn
         )
-        time.sleep(0.5)
+        self.wait_for_element_stable(btn)
         try:
             ActionChains(self.browser).move_to_element(btn).click().perform()
         except Exception:
             self.browser.execute_script("arguments[0].click();", btn)
         self.logger.info("Clicked 'Add Stimulus'")
-        time.sleep(2)
+        self.wait_for_ui_settled(timeout=2)
 
     def get_dictionary_items(self, timeout=10):
         """Get all dictionary item buttons in the middle column."""
@@ -823,10 +819,10 @@ class SimulateIonChannelPage(HomePage):
                 self.browser.execute_script(
                     "arguments[0].scrollIntoView({block: 'center'});", item
                 )
-                time.sleep(0.5)
+                self.wait_for_element_stable(item)
                 self.browser.execute_script("arguments[0].click();", item)
                 self.logger.info(f"Clicked dictionary item: '{text}'")
-                time.sleep(2)
+                self.wait_for_ui_settled(timeout=2)
                 return text
         raise AssertionError(f"Dictionary item '{target_label}' not found")
 
@@ -856,10 +852,10 @@ class SimulateIonChannelPage(HomePage):
         self.browser.execute_script(
             "arguments[0].scrollIntoView({block: 'center'});", item
         )
-        time.sleep(0.5)
+        self.wait_for_element_stable(item)
         self.browser.execute_script("arguments[0].click();", item)
         self.logger.info(f"Clicked dictionary item: '{label}'")
-        time.sleep(2)
+        self.wait_for_ui_settled(timeout=2)
         return label
 
     def wait_for_block_single(self, timeout=10):
@@ -896,7 +892,7 @@ class SimulateIonChannelPage(HomePage):
                     self.browser.execute_script(
                         "arguments[0].scrollIntoView({block: 'center'});", inp
                     )
-                    time.sleep(0.3)
+                    self.wait_for_element_stable(inp)
                     inp.click()
                     inp.send_keys(select_all)
                     inp.send_keys(Keys.BACKSPACE)
@@ -916,7 +912,7 @@ class SimulateIonChannelPage(HomePage):
             if add_level_btn.is_displayed():
                 self.browser.execute_script("arguments[0].click();", add_level_btn)
                 self.logger.info("Clicked 'Add level' for voltage clamp stimulus")
-                time.sleep(1)
+                self.wait_for_ui_settled(timeout=1)
                 # Fill the new Voltage and Duration inputs
                 block = self.browser.find_element(*Loc.CONFIG_BLOCK_SINGLE)
                 inputs = block.find_elements(*Loc.BLOCK_NUMBER_INPUT)
@@ -926,7 +922,7 @@ class SimulateIonChannelPage(HomePage):
                         self.browser.execute_script(
                             "arguments[0].scrollIntoView({block: 'center'});", inp
                         )
-                        time.sleep(0.3)
+                        self.wait_for_element_stable(inp)
                         inp.click()
                         inp.send_keys(select_all)
                         inp.send_keys(Keys.BACKSPACE)
@@ -946,10 +942,10 @@ class SimulateIonChannelPage(HomePage):
             self.browser.execute_script(
                 "arguments[0].scrollIntoView({block: 'center'});", btn
             )
-            time.sleep(0.5)
+            self.wait_for_element_stable(btn)
             self.browser.execute_script("arguments[0].click();", btn)
             self.logger.info("Clicked 'Add Recording'")
-            time.sleep(2)
+            self.wait_for_ui_settled(timeout=2)
         except TimeoutException:
             self.logger.warning("Add Recording button not found")
 
@@ -979,14 +975,14 @@ class SimulateIonChannelPage(HomePage):
         self.browser.execute_script(
             "arguments[0].scrollIntoView({block: 'center'});", entry
         )
-        time.sleep(0.5)
+        self.wait_for_element_stable(entry)
         try:
             entry.click()
         except Exception:
             self.browser.execute_script("arguments[0].click();", entry)
         label = entry.text.strip().split(chr(10))[0][:40]
         self.logger.info(f"Clicked recording entry [{index}]: '{label}'")
-        time.sleep(2)
+        self.wait_for_ui_settled(timeout=2)
         return True
 
     def select_recording_variable(self, item_index=0, timeout=10):
@@ -1000,7 +996,7 @@ class SimulateIonChannelPage(HomePage):
             self.browser.execute_script(
                 "arguments[0].scrollIntoView({block: 'center'});", dd
             )
-            time.sleep(1)
+            self.wait_for_element_stable(dd)
 
             # Check current state
             placeholder = dd.get_attribute("data-placeholder")
@@ -1026,7 +1022,7 @@ class SimulateIonChannelPage(HomePage):
             except Exception:
                 self.browser.execute_script("arguments[0].click();", dd)
             self.logger.info("Clicked Ion Channel Variable Name dropdown")
-            time.sleep(3)  # Radix portals can be slow
+            self.wait_for_ui_settled(timeout=3)  # Radix portals can be slow
 
             # Log the page source around the dropdown for debugging
             expanded = dd.get_attribute("aria-expanded")
@@ -1098,13 +1094,13 @@ class SimulateIonChannelPage(HomePage):
             self.browser.execute_script(
                 "arguments[0].scrollIntoView({block: 'center'});", item
             )
-            time.sleep(0.5)
+            self.wait_for_element_stable(item)
             try:
                 item.click()
             except Exception:
                 self.browser.execute_script("arguments[0].click();", item)
             self.logger.info(f"Selected recording type [{type_index}]: '{label}'")
-            time.sleep(2)
+            self.wait_for_ui_settled(timeout=2)
 
             # Wait for the form to appear
             try:
@@ -1135,13 +1131,13 @@ class SimulateIonChannelPage(HomePage):
         self.browser.execute_script(
             "arguments[0].scrollIntoView({block: 'center'});", btn
         )
-        time.sleep(0.5)
+        self.wait_for_element_stable(btn)
         try:
             ActionChains(self.browser).move_to_element(btn).click().perform()
         except Exception:
             self.browser.execute_script("arguments[0].click();", btn)
         self.logger.info("Clicked 'Generate simulation(s)'")
-        time.sleep(3)
+        self.wait_for_ui_settled(timeout=3)
 
     # ── Simulations tab ──────────────────────────────────────────────────
 
@@ -1149,7 +1145,7 @@ class SimulateIonChannelPage(HomePage):
         tab = self.element_to_be_clickable(Loc.CONFIG_TAB_SIMULATIONS, timeout=10)
         tab.click()
         self.logger.info("Clicked Simulations tab")
-        time.sleep(3)
+        self.wait_for_ui_settled(timeout=3)
 
     def is_simulations_tab_active(self):
         try:
@@ -1220,13 +1216,13 @@ class SimulateIonChannelPage(HomePage):
                 self.browser.execute_script(
                     "arguments[0].scrollIntoView({block: 'center'});", btn
                 )
-                time.sleep(0.5)
+                self.wait_for_element_stable(btn)
                 try:
                     ActionChains(self.browser).move_to_element(btn).click().perform()
                 except Exception:
                     self.browser.execute_script("arguments[0].click();", btn)
                 self.logger.info(f"Clicked input file: '{filename}'")
-                time.sleep(2)
+                self.wait_for_ui_settled(timeout=2)
                 return True
         self.logger.warning(f"Input file '{filename}' not found")
         return False
@@ -1258,13 +1254,13 @@ class SimulateIonChannelPage(HomePage):
         self.browser.execute_script(
             "arguments[0].scrollIntoView({block: 'center'});", btn
         )
-        time.sleep(0.5)
+        self.wait_for_element_stable(btn)
         try:
             ActionChains(self.browser).move_to_element(btn).click().perform()
         except Exception:
             self.browser.execute_script("arguments[0].click();", btn)
         self.logger.info("Clicked 'Launch simulations'")
-        time.sleep(3)
+        self.wait_for_ui_settled(timeout=3)
 
     def wait_for_simulation_terminal_state(self, timeout=300, poll_interval=10):
         """Poll simulation card statuses until all reach a terminal state."""
@@ -1312,13 +1308,13 @@ class SimulateIonChannelPage(HomePage):
                 self.browser.execute_script(
                     "arguments[0].scrollIntoView({block: 'center'});", btn
                 )
-                time.sleep(0.5)
+                self.wait_for_element_stable(btn)
                 try:
                     ActionChains(self.browser).move_to_element(btn).click().perform()
                 except Exception:
                     self.browser.execute_script("arguments[0].click();", btn)
                 self.logger.info(f"Clicked output file: '{filename}'")
-                time.sleep(2)
+                self.wait_for_ui_settled(timeout=2)
                 return True
         self.logger.warning(f"Output file '{filename}' not found")
         return False
@@ -1351,13 +1347,13 @@ class SimulateIonChannelPage(HomePage):
         tab = self.element_to_be_clickable(Loc.OVERVIEW_TAB, timeout=10)
         tab.click()
         self.logger.info("Clicked Overview tab")
-        time.sleep(2)
+        self.wait_for_ui_settled(timeout=2)
 
     def click_interactive_details_tab(self):
         tab = self.element_to_be_clickable(Loc.INTERACTIVE_DETAILS_TAB, timeout=10)
         tab.click()
         self.logger.info("Clicked Interactive details tab")
-        time.sleep(2)
+        self.wait_for_ui_settled(timeout=2)
 
     def is_tab_plot_visible(self, timeout=10):
         """Check if a plot is visible in the currently active tab."""
@@ -45,7 +45,7 @@ class SimulateMeBetaPage(HomePage):
     def wait_for_page_ready(self, timeout=30):
         """Wait for the page to be fully loaded."""
         super().wait_for_page_ready(timeout=timeout)
-        time.sleep(2)
+        self.wait_for_ui_settled(timeout=2)
 
     # ── Tabs ─────────────────────────────────────────────────────────────
 
@@ -54,14 +54,14 @@ class SimulateMeBetaPage(HomePage):
         el = self.find_element(SimulateMeBetaLocators.PUBLIC_TAB, timeout=15)
         el.click()
         self.logger.info("Clicked Public tab")
-        time.sleep(3)
+        self.wait_for_ui_settled(timeout=3)
 
     def click_project_tab(self):
         """Click the Project tab."""
         el = self.find_element(SimulateMeBetaLocators.PROJECT_TAB, timeout=15)
         el.click()
         self.logger.info("Clicked Project tab")
-        time.sleep(3)
+        self.wait_for_ui_settled(timeout=3)
 
     # ── Column headers ───────────────────────────────────────────────────
 
@@ -122,44 +122,13 @@ class SimulateMeBetaPage(HomePage):
     def click_random_row(self, exclude_date="10.09.2025", exclude_creator="Gil Barrios"):
         """Click a random row, skipping rows that match the excluded date and creator."""
         from selenium.webdriver.common.action_chains import ActionChains
-        rows = self.get_table_rows()
-        if not rows:
-            raise RuntimeError("No rows found in the table")
-
-        # Find column indices dynamically
-        headers = self.browser.find_elements(*SimulateMeBetaLocators.COLUMN_HEADERS)
-        creator_idx = None
-        date_idx = None
-        for i, h in enumerate(headers):
-            text = h.text.strip()
-            if 'Created by' in text:
-                creator_idx = i
-            if 'Registration date' in text:
-                date_idx = i
-
-        visible_rows = rows[:min(10, len(rows))]
-        eligible = []
-        for row in visible_rows:
-            cells = row.find_elements("tag name", "td")
-            skip = False
-            if creator_idx is not None and date_idx is not None and len(cells) > max(creator_idx, date_idx):
-                creator = cells[creator_idx].text.strip()
-                reg_date = cells[date_idx].text.strip()
-                if exclude_creator in creator and exclude_date in reg_date:
-                    self.logger.info(f"Skipping row: creator='{creator}', date='{reg_date}'")
-                    skip = True
-            if not skip:
-                eligible.append(row)
-
-        if not eligible:
-            self.logger.warning("No eligible rows after filtering, falling back to all visible rows")
-            eligible = visible_rows
-
-        row = random.choice(eligible)
-        row_text = row.text.split('\n')[0][:60]
+        row, row_text = self.pick_random_row(
+            SimulateMeBetaLocators.TABLE_ROWS, SimulateMeBetaLocators.COLUMN_HEADERS,
+            exclude={"Created by": exclude_creator, "Registration date": exclude_date},
+        )
         self.logger.info(f"Clicking random row: '{row_text}...'")
         self.browser.execute_script("arguments[0].scrollIntoView({block: 'center'});", row)
-        time.sleep(1)
+        self.wait_for_element_stable(row)
         try:
             ActionChains(self.browser).move_to_element(row).click().perform()
         except Exception:
@@ -175,7 +144,7 @@ class SimulateMeBetaPage(HomePage):
         row_text = row.text.split('\n')[0][:60]
         self.logger.info(f"Clicking first row: '{row_text}...'")
         self.browser.execute_script("arguments[0].scrollIntoView({block: 'center'});", row)
-        time.sleep(1)
+        self.wait_for_element_stable(row)
         try:
             ActionChains(self.browser).move_to_element(row).click().perform()
         except Exception:
@@ -195,16 +164,9 @@ class SimulateMeBetaPage(HomePage):
 
     def get_etype_column_values(self):
         """Get all E-type values from the visible rows by finding the E-type column index dynamically."""
-        # Find E-type column index from headers
-        etype_idx = None
-        try:
-            headers = self.browser.find_elements(*SimulateMeBetaLocators.COLUMN_HEADERS)
-            for i, h in enumerate(headers):
-                if 'E-type' in h.text:
-                    etype_idx = i
-                    break
-        except Exception:
-            pass
+        # Headers and cells of every row in one round trip
+        snapshot = self.get_table_snapshot(SimulateMeBetaLocators.TABLE_ROWS, SimulateMeBetaLocators.COLUMN_HEADERS)
+        etype_idx = next((i for i, h in enumerate(snapshot["headers"]) if 'E-type' in h), None)
 
         if etype_idx is None:
             self.logger.warning("E-type column header not found, defaulting to index 6")
@@ -212,12 +174,8 @@ class SimulateMeBetaPage(HomePage):
 
         self.logger.info(f"E-type column index: {etype_idx}")
 
-        rows = self.get_table_rows()
-        values = []
-        for row in rows:
-            cells = row.find_elements("tag name", "td")
-            if len(cells) > etype_idx:
-                values.append(cells[etype_idx].text.strip())
+        values = [row["cells"][etype_idx] for row in snapshot["rows"]
+                  if row["visible"] and len(row["cells"]) > etype_idx]
         self.logger.info(f"E-type values: {values[:5]}...")
         return values
 
@@ -228,21 +186,21 @@ class SimulateMeBetaPage(HomePage):
         btn = self.find_element(SimulateMeBetaLocators.FILTER_BUTTON, timeout=10)
         btn.click()
         self.logger.info("Opened filter panel")
-        time.sleep(2)
+        self.wait_for_ui_settled(timeout=2)
 
     def close_filter_panel(self):
         """Close the filter panel."""
         btn = self.find_element(SimulateMeBetaLocators.FILTER_CLOSE_BUTTON, timeout=5)
         btn.click()
         self.logger.info("Closed filter panel")
-        time.sleep(1)
+        self.wait_for_ui_settled(timeout=1)
 
     def expand_etype_filter(self):
         """Expand the E-type accordion in the filter panel."""
         trigger = self.find_element(SimulateMeBetaLocators.FILTER_ETYPE_TRIGGER, timeout=10)
         trigger.click()
         self.logger.info("Expanded E-type filter")
-        time.sleep(1)
+        self.wait_for_ui_settled(timeout=1)
 
     def type_etype_filter(self, value):
         """Type a value into the E-type filter search input."""
@@ -252,7 +210,7 @@ class SimulateMeBetaPage(HomePage):
         input_el.click()
         input_el.send_keys(value)
         self.logger.info(f"Typed '{value}' in E-type filter")
-        time.sleep(2)
+        self.wait_for_ui_settled(timeout=2)
 
     def select_etype_option(self, option_text):
         """Select an option from the E-type dropdown."""
@@ -260,7 +218,7 @@ class SimulateMeBetaPage(HomePage):
         option = self.element_to_be_clickable(locator, timeout=10)
         option.click()
         self.logger.info(f"Selected E-type option: '{option_text}'")
-        time.sleep(1)
+        self.wait_for_ui_settled(timeout=1)
 
     def click_filter_apply(self):
         """Click the Apply button in the filter panel."""
@@ -288,7 +246,7 @@ class SimulateMeBetaPage(HomePage):
         btn = self.find_element(SimulateMeBetaLocators.SEARCH_BUTTON, timeout=10)
         btn.click()
         self.logger.info("Opened search")
-        time.sleep(1)
+        self.wait_for_ui_settled(timeout=1)
 
     def search_for(self, query):
         """Type a search query."""
@@ -297,7 +255,7 @@ class SimulateMeBetaPage(HomePage):
         input_el.clear()
         input_el.send_keys(query)
         self.logger.info(f"Searched for: '{query}'")
-        time.sleep(3)
+        self.wait_for_ui_settled(timeout=3)
 
     # ── Breadcrumbs ──────────────────────────────────────────────────────
 
@@ -308,7 +266,7 @@ class SimulateMeBetaPage(HomePage):
         link = self.find_breadcrumb_workflows()
         link.click()
         self.logger.info("Clicked Workflows breadcrumb")
-        time.sleep(2)
+        self.wait_for_ui_settled(timeout=2)
 
     # ── Mini-detail view ────────────────────────────────────────────────
 
@@ -316,7 +274,7 @@ class SimulateMeBetaPage(HomePage):
         """Wait for the mini-detail view to appear after clicking a row."""
         self.element_visibility(SimulateMeBetaLocators.MINI_VIEWER, timeout=timeout)
         self.logger.info("Mini-detail view appeared")
-        time.sleep(1)
+        self.wait_for_ui_settled(timeout=1)
 
     def find_mini_detail_title(self, timeout=10):
         """Find the title (h1) in the mini-detail view."""
@@ -413,13 +371,13 @@ class SimulateMeBetaPage(HomePage):
         """Wait for the config page layout to appear."""
         self.find_element(SimulateMeBetaLocators.CONFIG_LAYOUT, timeout=timeout)
         self.logger.info("Config page layout loaded")
-        time.sleep(2)
+        self.wait_for_ui_settled(timeout=2)
 
     def wait_for_neuron_visualizer(self, timeout=60):
         """Wait for the 3D morphology viewer canvas to be present."""
         self.wait_for_long_load(SimulateMeBetaLocators.NEURON_VISUALIZER_CANVAS, timeout=timeout)
         self.logger.info("Neuron visualizer canvas loaded")
-        time.sleep(2)
+        self.wait_for_ui_settled(timeout=2)
 
     def find_config_tab(self, timeout=10):
         """Find the Configuration tab button."""
@@ -501,7 +459,7 @@ class SimulateMeBetaPage(HomePage):
         btn = self.element_to_be_clickable(SimulateMeBetaLocators.CONFIG_INIT_TAB, timeout=10)
         btn.click()
         self.logger.info("Clicked Initialization tab")
-        time.sleep(2)
+        self.wait_for_ui_settled(timeout=2)
 
     def is_initialization_tab_active(self):
         """Check if the Initialization tab has data-active='true'."""
@@ -574,13 +532,13 @@ class SimulateMeBetaPage(HomePage):
         # Step 1: Click the first plus-circle to convert to sweep mode
         plus_btn = target_block.find_element(*SimulateMeBetaLocators.BLOCK_PLUS_CIRCLE)
         self.browser.execute_script("arguments[0].scrollIntoView({block: 'center'});", plus_btn)
-        time.sleep(0.5)
+        self.wait_for_element_stable(plus_btn)
         try:
             ActionChains(self.browser).move_to_element(plus_btn).click().perform()
         except Exception:
             self.browser.execute_script("arguments[0].click();", plus_btn)
         self.logger.info(f"Clicked plus-circle on block [{block_index}] '{label}' to enable sweep")
-        time.sleep(1)
+        self.wait_for_ui_settled(timeout=1)
 
         # Re-find the block after DOM change (it becomes float_parameter_sweep_multiple)
         blocks = self.find_all_elements(SimulateMeBetaLocators.CONFIG_BLOCK_ELEMENTS, timeout=10)
@@ -591,13 +549,13 @@ class SimulateMeBetaPage(HomePage):
         if inner_plus_btns:
             inner_plus = inner_plus_btns[-1]  # last plus-circle in the block
             self.browser.execute_script("arguments[0].scrollIntoView({block: 'center'});", inner_plus)
-            time.sleep(0.5)
+            self.wait_for_element_stable(inner_plus)
             try:
                 ActionChains(self.browser).move_to_element(inner_plus).click().perform()
             except Exception:
                 self.browser.execute_script("arguments[0].click();", inner_plus)
             self.logger.info(f"Clicked inner plus-circle to add new sweep input row")
-            time.sleep(1)
+            self.wait_for_ui_settled(timeout=1)
 
         # Step 3: Find the empty input and type the value
         blocks = self.find_all_elements(SimulateMeBetaLocators.CONFIG_BLOCK_ELEMENTS, timeout=10)
@@ -631,13 +589,13 @@ class SimulateMeBetaPage(HomePage):
         if plus_btns:
             plus_btn = plus_btns[-1]
             self.browser.execute_script("arguments[0].scrollIntoView({block: 'center'});", plus_btn)
-            time.sleep(0.5)
+            self.wait_for_element_stable(plus_btn)
             try:
                 ActionChains(self.browser).move_to_element(plus_btn).click().perform()
             except Exception:
                 self.browser.execute_script("arguments[0].click();", plus_btn)
             self.logger.info(f"Clicked plus-circle to add sweep row in block [{block_index}] '{label}'")
-            time.sleep(1)
+            self.wait_for_ui_settled(timeout=1)
 
         # Type value into the last (newly added) input
         blocks = self.find_all_elements(SimulateMeBetaLocators.CONFIG_BLOCK_ELEMENTS, timeout=10)
@@ -667,7 +625,7 @@ class SimulateMeBetaPage(HomePage):
         btn = self.element_to_be_clickable(SimulateMeBetaLocators.CONFIG_STIMULI_TAB, timeout=10)
         btn.click()
         self.logger.info("Clicked Stimuli tab")
-        time.sleep(2)
+        self.wait_for_ui_settled(timeout=2)
 
     def is_stimuli_tab_active(self):
         """Check if the Stimuli tab has data-active='true'."""
@@ -684,7 +642,7 @@ class SimulateMeBetaPage(HomePage):
         btn = self.element_to_be_clickable(SimulateMeBetaLocators.CONFIG_RECORDINGS_TAB, timeout=10)
         btn.click()
         self.logger.info("Clicked Recordings tab")
-        time.sleep(2)
+        self.wait_for_ui_settled(timeout=2)
 
     def is_recordings_tab_active(self):
         """Check if the Recordings tab has data-active='true'."""
@@ -709,13 +667,13 @@ class SimulateMeBetaPage(HomePage):
         from selenium.webdriver.common.action_chains import ActionChains
         btn = self.element_to_be_clickable(SimulateMeBetaLocators.CONFIG_STIMULI_ADD_BTN, timeout=10)
         self.browser.execute_script("arguments[0].scrollIntoView({block: 'center'});", btn)
-        time.sleep(0.5)
+        self.wait_for_element_stable(btn)
         try:
             ActionChains(self.browser).move_to_element(btn).click().perform()
         except Exception:
             self.browser.execute_script("arguments[0].click();", btn)
         self.logger.info("Clicked 'Add Stimulus' button")
-        time.sleep(2)
+        self.wait_for_ui_settled(timeout=2)
 
     def get_stimuli_sub_items(self):
         """Get all stimulus sub-items in the left menu (e.g. Stimulus 1, Stimulus 2)."""
@@ -736,13 +694,13 @@ class SimulateMeBetaPage(HomePage):
             item = items[index]
             label = item.text.strip()
             self.browser.execute_script("arguments[0].scrollIntoView({block: 'center'});", item)
-            time.sleep(0.5)
+            self.wait_for_element_stable(item)
             try:
                 ActionChains(self.browser).move_to_element(item).click().perform()
             except Exception:
                 self.browser.execute_script("arguments[0].click();", item)
             self.logger.info(f"Clicked stimulus sub-item [{index}]: '{label}'")
-            time.sleep(1)
+            self.wait_for_ui_settled(timeout=1)
             return label
         else:
             raise IndexError(f"Stimulus sub-item index {index} out of range (have {len(items)})")
@@ -810,7 +768,7 @@ class SimulateMeBetaPage(HomePage):
         btn = self.element_to_be_clickable(SimulateMeBetaLocators.CONFIG_NEURONAL_MANIP_TAB, timeout=10)
         btn.click()
         self.logger.info("Clicked Neuronal manipulations tab")
-        time.sleep(2)
+        self.wait_for_ui_settled(timeout=2)
 
     def is_neuronal_manip_tab_active(self):
         """Check if the Neuronal manipulations tab has data-active='true'."""
@@ -847,7 +805,7 @@ class SimulateMeBetaPage(HomePage):
         block = self.find_element(SimulateMeBetaLocators.CONFIG_BLOCK_SINGLE, timeout=timeout)
         trigger = block.find_element(*SimulateMeBetaLocators.BLOCK_COMBOBOX_TRIGGER)
         self.browser.execute_script("arguments[0].scrollIntoView({block: 'center'});", trigger)
-        time.sleep(0.5)
+        self.wait_for_element_stable(trigger)
 
         def click_trigger():
             try:
@@ -902,7 +860,7 @@ class SimulateMeBetaPage(HomePage):
                 self.browser.execute_script(
                     "arguments[0].scrollIntoView({block: 'center'});", group_btn
                 )
-                time.sleep(0.3)
+                self.wait_for_element_stable(group_btn)
                 self.browser.execute_script("arguments[0].click();", group_btn)
                 time.sleep(2)
                 break
@@ -932,7 +890,7 @@ class SimulateMeBetaPage(HomePage):
                     self.browser.execute_script(
                         "arguments[0].scrollIntoView({block: 'center'});", chosen_item
                     )
-                    time.sleep(0.3)
+                    self.wait_for_element_stable(chosen_item)
                     self.browser.execute_script("arguments[0].click();", chosen_item)
                     time.sleep(1)
                     break
@@ -1016,10 +974,10 @@ class SimulateMeBetaPage(HomePage):
         else:
             btn = self.element_to_be_clickable(SimulateMeBetaLocators.CONFIG_ADD_BTN_IN_SUB_ENTRY, timeout=10)
         self.browser.execute_script("arguments[0].scrollIntoView({block: 'center'});", btn)
-        time.sleep(0.5)
+        self.wait_for_element_stable(btn)
         self.browser.execute_script("arguments[0].click();", btn)
         self.logger.info(f"Clicked 'Add' button: '{btn.text.strip()}'")
-        time.sleep(2)
+        self.wait_for_ui_settled(timeout=2)
 
     def get_dictionary_items(self, timeout=10):
         """Get all block_dictionary_item buttons in the middle column."""
@@ -1048,13 +1006,13 @@ class SimulateMeBetaPage(HomePage):
         item = random.choice(enabled_items)
         label = item.text.strip().split('\n')[0][:40]
         self.browser.execute_script("arguments[0].scrollIntoView({block: 'center'});", item)
-        time.sleep(0.5)
+        self.wait_for_element_stable(item)
         try:
             ActionChains(self.browser).move_to_element(item).click().perform()
         except Exception:
             self.browser.execute_script("arguments[0].click();", item)
         self.logger.info(f"Clicked dictionary item: '{label}'")
-        time.sleep(2)
+        self.wait_for_ui_settled(timeout=2)
         return label
 
     def wait_for_block_single(self, timeout=10):
@@ -1077,13 +1035,13 @@ class SimulateMeBetaPage(HomePage):
             pass
         btn = self.element_to_be_clickable(SimulateMeBetaLocators.CONFIG_TIMESTAMPS_TAB, timeout=10)
         self.browser.execute_script("arguments[0].scrollIntoView({block: 'center'});", btn)
-        time.sleep(0.5)
+        self.wait_for_element_stable(btn)
         try:
             btn.click()
         except Exception:
             self.browser.execute_script("arguments[0].click();", btn)
         self.logger.info("Clicked Timestamps tab")
-        time.sleep(2)
+        self.wait_for_ui_settled(timeout=2)
 
     def is_timestamps_tab_active(self):
         """Check if the Timestamps tab has data-active='true'."""
@@ -1136,13 +1094,13 @@ class SimulateMeBetaPage(HomePage):
             if plus_btns:
                 plus_btn = plus_btns[-1]
                 self.browser.execute_script("arguments[0].scrollIntoView({block: 'center'});", plus_btn)
-                time.sleep(0.5)
+                self.wait_for_element_stable(plus_btn)
                 try:
                     ActionChains(self.browser).move_to_element(plus_btn).click().perform()
                 except Exception:
                     self.browser.execute_script("arguments[0].click();", plus_btn)
                 self.logger.info("Clicked plus-circle to convert to sweep mode")
-                time.sleep(1)
+                self.wait_for_ui_settled(timeout=1)
 
             # Re-find after DOM change
             target_sweep = self._find_timestamp_sweep_container()
@@ -1155,13 +1113,13 @@ class SimulateMeBetaPage(HomePage):
         if plus_btns:
             plus_btn = plus_btns[-1]
             self.browser.execute_script("arguments[0].scrollIntoView({block: 'center'});", plus_btn)
-            time.sleep(0.5)
+            self.wait_for_element_stable(plus_btn)
             try:
                 ActionChains(self.browser).move_to_element(plus_btn).click().perform()
             except Exception:
                 self.browser.execute_script("arguments[0].click();", plus_btn)
             self.logger.info("Clicked plus-circle to add new sweep input row")
-            time.sleep(1)
+            self.wait_for_ui_settled(timeout=1)
 
         # Type into the last (newly added) input
         target_sweep = self._find_timestamp_sweep_container()
@@ -1208,13 +1166,13 @@ class SimulateMeBetaPage(HomePage):
         from selenium.webdriver.common.action_chains import ActionChains
         btn = self.element_to_be_clickable(SimulateMeBetaLocators.CONFIG_GENERATE_SIMULATION_BTN, timeout=10)
         self.browser.execute_script("arguments[0].scrollIntoView({block: 'center'});", btn)
-        time.sleep(0.5)
+        self.wait_for_element_stable(btn)
         try:
             ActionChains(self.browser).move_to_element(btn).click().perform()
         except Exception:
             self.browser.execute_script("arguments[0].click();", btn)
         self.logger.info("Clicked 'Generate simulation(s)' button")
-        time.sleep(3)
+        self.wait_for_ui_settled(timeout=3)
 
     def wait_for_simulations_page(self, timeout=60):
         """Wait for the Simulations tab/page to become active after generating.
@@ -1302,13 +1260,13 @@ class SimulateMeBetaPage(HomePage):
         except Exception:
             title = card.text.split('\n')[0][:60]
         self.browser.execute_script("arguments[0].scrollIntoView({block: 'center'});", card)
-        time.sleep(0.5)
+        self.wait_for_element_stable(card)
         try:
             ActionChains(self.browser).move_to_element(card).click().perform()
         except Exception:
             self.browser.execute_script("arguments[0].click();", card)
         self.logger.info(f"Clicked simulation card [{index}]: '{title}'")
-        time.sleep(2)
+        self.wait_for_ui_settled(timeout=2)
         return title
 
     def get_input_file_buttons(self, timeout=10):
@@ -1335,13 +1293,13 @@ class SimulateMeBetaPage(HomePage):
         for btn, name in file_buttons:
             if name == filename:
                 self.browser.execute_script("arguments[0].scrollIntoView({block: 'center'});", btn)
-                time.sleep(0.5)
+                self.wait_for_element_stable(btn)
                 try:
                     ActionChains(self.browser).move_to_element(btn).click().perform()
                 except Exception:
                     self.browser.execute_script("arguments[0].click();", btn)
                 self.logger.info(f"Clicked input file: '{filename}'")
-                time.sleep(2)
+                self.wait_for_ui_settled(timeout=2)
                 return True
         raise ValueError(f"Input file '{filename}' not found among: {[n for _, n in file_buttons]}")
 
@@ -1373,13 +1331,13 @@ class SimulateMeBetaPage(HomePage):
         from selenium.webdriver.common.action_chains import ActionChains
         btn = self.element_to_be_clickable(SimulateMeBetaLocators.SIM_LAUNCH_BTN, timeout=10)
         self.browser.execute_script("arguments[0].scrollIntoView({block: 'center'});", btn)
-        time.sleep(0.5)
+        self.wait_for_element_stable(btn)
         try:
             ActionChains(self.browser).move_to_element(btn).click().perform()
         except Exception:
             self.browser.execute_script("arguments[0].click();", btn)
         self.logger.info(f"Clicked 'Launch simulations' button: '{btn.text.strip()}'")
-        time.sleep(3)
+        self.wait_for_ui_settled(timeout=3)
 
     def wait_for_simulations_complete(self, timeout=300, poll_interval=10):
         """Poll simulation card status badges until all reach a terminal state.
@@ -3,7 +3,6 @@
 # SPDX-License-Identifier: Apache-2.0
 
 import time
-import random
 from datetime import datetime
 from selenium.common import TimeoutException
 from selenium.webdriver.common.by import By
@@ -76,39 +75,10 @@ class SimulateMemPage(HomePage):
 
     def click_random_row(self, exclude_date="10.09.2025", exclude_creator="Gil Barrios"):
         """Click a random row, skipping rows matching excluded date+creator."""
-        rows = self.get_table_rows()
-        if not rows:
-            raise RuntimeError("No rows found in the table")
-
-        headers = self.browser.find_elements(*SimulateMemLocators.COLUMN_HEADERS)
-        creator_idx = date_idx = None
-        for i, h in enumerate(headers):
-            text = h.text.strip()
-            if 'Created by' in text:
-                creator_idx = i
-            if 'Registration date' in text:
-                date_idx = i
-
-        visible_rows = rows[:min(10, len(rows))]
-        eligible = []
-        for row in visible_rows:
-            cells = row.find_elements("tag name", "td")
-            skip = False
-            if creator_idx is not None and date_idx is not None and len(cells) > max(creator_idx, date_idx):
-                creator = cells[creator_idx].text.strip()
-                reg_date = cells[date_idx].text.strip()
-                if exclude_creator in creator and exclude_date in reg_date:
-                    self.logger.info(f"Skipping row: creator='{creator}', date='{reg_date}'")
-                    skip = True
-            if not skip:
-                eligible.append(row)
-
-        if not eligible:
-            self.logger.warning("No eligible rows after filtering, using all visible")
-            eligible = visible_rows
-
-        row = random.choice(eligible)
-        row_text = row.text.split('\n')[0][:60]
+        row, row_text = self.pick_random_row(
+            SimulateMemLocators.TABLE_ROWS, SimulateMemLocators.COLUMN_HEADERS,
+            exclude={"Created by": exclude_creator, "Registration date": exclude_date},
+        )
         self.logger.info(f"Clicking row: '{row_text}...'")
         self.browser.execute_script("arguments[0].scrollIntoView({block: 'center'});", row)
         time.sleep(1)
@@ -10,6 +10,7 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.common.action_chains import ActionChains
 from selenium.webdriver.common.keys import Keys
 from pages.home_page import HomePage
+from util.timeout_calibration import calibrated_timeout, record_wait
 from locators.simulate_paired_neurons_locators import SimulatePairedNeuronsLocators as Loc
 
 
@@ -149,12 +150,7 @@ class SimulatePairedNeuronsPage(HomePage):
         time.sleep(3)
 
     def click_random_row(self):
-        rows = self.get_table_rows()
-        if not rows:
-            raise RuntimeError("No rows found in the table")
-        visible_rows = rows[:min(10, len(rows))]
-        row = random.choice(visible_rows)
-        row_text = row.text.split('\n')[0][:60]
+        row, row_text = self.pick_random_row(Loc.TABLE_ROWS)
         self.logger.info(f"Clicking row: '{row_text}...'")
         self.browser.execute_script("arguments[0].scrollIntoView({block: 'center'});", row)
         time.sleep(1)
@@ -620,6 +616,8 @@ class SimulatePairedNeuronsPage(HomePage):
 
     def wait_for_simulation_terminal_state(self, timeout=300, poll_interval=10):
         import time as _time
+        name = f"{type(self).__name__}.simulation_terminal_state"
+        default, timeout = timeout, calibrated_timeout(name, timeout)
         terminal = {'done', 'failed', 'error', 'completed', 'success'}
         start = _time.time()
         while _time.time() - start < timeout:
@@ -627,9 +625,11 @@ class SimulatePairedNeuronsPage(HomePage):
             if statuses and all(s['status'] in terminal for s in statuses):
                 elapsed = int(_time.time() - start)
                 self.logger.info(f"All simulations reached terminal state after {elapsed}s")
+                record_wait(name, _time.time() - start, True, default)
                 return True
             elapsed = int(_time.time() - start)
             self.logger.info(f"Simulations still running after {elapsed}s: {[s['status'] for s in statuses]}")
             _time.sleep(poll_interval)
         self.logger.warning(f"Simulations did not complete within {timeout}s")
+        record_wait(name, _time.time() - start, False, default)
         return False
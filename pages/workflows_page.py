@@ -629,21 +629,20 @@ class WorkflowsPage(HomePage):
     def get_selected_row_data(self):
         """Get data from the selected row"""
         try:
-            # Find the selected radio button's row
-            selected_row = self.browser.find_element(
-                By.XPATH, 
-                "//table//tbody//tr[.//input[@type='radio' and @checked]]"
-            )
-            
-            # Extract cell data
-            cells = selected_row.find_elements(By.TAG_NAME, "td")
+            # Find the selected radio button's row and read its cells in one round trip
+            rows = self.get_table_snapshot(
+                (By.XPATH, "//table//tbody//tr[.//input[@type='radio' and @checked]]"), timeout=0
+            )["rows"]
+            if not rows:
+                return None
+            cells = rows[0]["cells"]
             if len(cells) >= 6:
                 return {
-                    'name': cells[1].text,
-                    'category': cells[2].text,
-                    'type': cells[3].text,
-                    'date': cells[4].text,
-                    'status': cells[5].text
+                    'name': cells[1],
+                    'category': cells[2],
+                    'type': cells[3],
+                    'date': cells[4],
+                    'status': cells[5]
                 }
             return None
         except Exception as e:
@@ -15,10 +15,9 @@ import sys
 import time
 from selenium import webdriver
 from selenium.webdriver.firefox.options import Options as FirefoxOptions
-from selenium.webdriver.firefox.service import Service as FirefoxService
 from selenium.webdriver.support.wait import WebDriverWait
-from webdriver_manager.firefox import GeckoDriverManager
 
+from util.driver_manager import get_service
 from util.test_recorder import TestRecorder
 
 
@@ -127,7 +126,7 @@ def create_browser(headless=False):
         options.add_argument("--headless")
     
     browser = webdriver.Firefox(
-        service=FirefoxService(GeckoDriverManager().install()),
+        service=get_service("firefox"),
         options=options
     )
     browser.set_window_size(1400, 900)
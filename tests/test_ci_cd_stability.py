@@ -2,13 +2,14 @@
 # Copyright (c) 2025 Open Brain Institute
 # SPDX-License-Identifier: Apache-2.0
 
-import os
 import pytest
 import time
 from selenium.common import TimeoutException
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.common.by import By
 
+from util.artifacts import save_screenshot
+
 
 class TestCICDStability:
     """Test cases specifically designed to validate CI/CD stability and identify environment-specific issues."""
@@ -40,7 +41,7 @@ class TestCICDStability:
         """Test login process stability with enhanced error handling."""
         login_page = navigate_to_login_direct
         username = test_config["username"]
-        password = os.getenv("OBI_PASSWORD")
+        password = test_config["password"]
         
         logger.info(f"Testing login with username: {username[:3]}***")
         
@@ -58,7 +59,7 @@ class TestCICDStability:
                 if attempt == max_attempts - 1:
                     # Final attempt failed, capture debug info
                     logger.error(f"All login attempts failed. Final URL: {login_page.browser.current_url}")
-                    login_page.browser.save_screenshot("/tmp/login_failure.png")
+                    save_screenshot(login_page.browser, "login_failure")
                     raise
                 else:
                     # Wait before retry
@@ -170,6 +171,6 @@ class TestCICDStability:
             
         except Exception as e:
             logger.error(f"Element interaction failed: {str(e)}")
-            landing_page.browser.save_screenshot("/tmp/interaction_failure.png")
+            save_screenshot(landing_page.browser, "interaction_failure")
             raise
 
@@ -6,6 +6,7 @@ import time
 import pytest
 
 from pages.landing_page import LandingPage
+from util.artifacts import save_screenshot
 from selenium.webdriver.common.action_chains import ActionChains
 
 @pytest.mark.no_auto_nav
@@ -227,12 +228,8 @@ class TestLanding:
                 logger.error(f"🚨 URL changed but not to expected login page")
             
             # Take screenshot for debugging
-            try:
-                screenshot_name = f"staging_login_fail_{int(time.time())}.png"
-                browser.save_screenshot(screenshot_name)
-                logger.info(f"Screenshot saved: {screenshot_name}")
-            except:
-                pass
+            screenshot_path = save_screenshot(browser, "staging_login_fail")
+            logger.info(f"Screenshot saved: {screenshot_path}")
                 
             raise
 
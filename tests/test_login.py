@@ -8,6 +8,7 @@ import pytest
 from pages.login_page import LoginPage
 
 
+@pytest.mark.no_auth_cache
 @pytest.mark.usefixtures("setup", "logger", "login")
 class TestLogin:
     @pytest.mark.run(order=1)
@@ -11,31 +11,25 @@ from util.performance_tracker import PerformanceTracker
 class TestPerformanceTracking:
     """Example tests showing how to measure page performance."""
     
-    def test_measure_public_pages_performance(self, visit_public_pages, logger):
+    def test_measure_public_pages_performance(self, visit_public_pages, perf_baseline, pytestconfig, logger):
         """Measure performance of public pages."""
         visit, base_url = visit_public_pages
         browser, wait = visit("")
         
-        # Initialize performance tracker
-        perf_tracker = PerformanceTracker(browser, logger)
+        # Initialize performance tracker; --perf-samples sets the cold/warm samples per page
+        perf_tracker = PerformanceTracker(browser, logger, samples=pytestconfig.getoption("--perf-samples"),
+                                          report_path="performance_public_pages.json")
         
-        # Measure landing page
-        perf_tracker.capture_metrics("Landing Page")
-        
-        # Measure about page
-        browser, wait = visit("about")
-        perf_tracker.capture_metrics("About Page")
-        
-        # Measure mission page
-        browser, wait = visit("mission")
-        perf_tracker.capture_metrics("Mission Page")
-        
-        # Measure news page
-        browser, wait = visit("news")
-        perf_tracker.capture_metrics("News Page")
+        for page_name, path in [
+            ("Landing Page", ""),
+            ("About Page", "about"),
+            ("Mission Page", "mission"),
+            ("News Page", "news"),
+        ]:
+            perf_tracker.sample_page(page_name, f"{base_url.rstrip('/')}/{path}")
         
         # Save report
-        perf_tracker.save_report("performance_public_pages.json")
+        perf_tracker.save_report()
         
         # Get summary
         summary = perf_tracker.get_summary()
@@ -44,69 +38,58 @@ class TestPerformanceTracking:
         logger.info(f"Average load time: {summary['average_load_time']:.2f}ms")
         logger.info(f"Slowest page: {summary['slowest_page']}")
         
-        # Optional: Assert performance thresholds
-        assert summary['average_load_time'] < 5000, "Average load time exceeds 5 seconds"
+        # Fail only on statistically significant slowdowns against previous runs
+        regressions = perf_baseline.evaluate(perf_tracker.metrics)
+        assert not regressions, perf_baseline.format_regressions(regressions)
     
-    def test_measure_authenticated_pages_performance(self, login_direct_complete, logger, test_config):
+    def test_measure_authenticated_pages_performance(self, login_direct_complete, perf_baseline, pytestconfig,
+                                                     logger, test_config):
         """Measure performance of authenticated pages."""
         browser, wait, base_url, lab_id, project_id = login_direct_complete
         
-        perf_tracker = PerformanceTracker(browser, logger)
+        perf_tracker = PerformanceTracker(browser, logger, samples=pytestconfig.getoption("--perf-samples"),
+                                          report_path="performance_authenticated_pages.json")
         
         # Note: Skip measuring the initial login page as it's already loaded
         # and timing data may be stale
         
         # Measure project home page
         project_url = f"{base_url}/app/virtual-lab/lab/{lab_id}/project/{project_id}/home"
-        logger.info(f"Navigating to: {project_url}")
-        browser.get(project_url)
-        wait.until(lambda d: d.execute_script("return document.readyState") == "complete")
-        perf_tracker.capture_metrics("Project Home")
+        logger.info(f"Sampling: {project_url}")
+        perf_tracker.sample_page("Project Home", project_url)
         
         # Measure notebooks page
         notebooks_url = f"{base_url}/app/virtual-lab/{lab_id}/{project_id}/notebooks/public"
-        logger.info(f"Navigating to: {notebooks_url}")
-        browser.get(notebooks_url)
-        wait.until(lambda d: d.execute_script("return document.readyState") == "complete")
-        perf_tracker.capture_metrics("Notebooks Page")
+        logger.info(f"Sampling: {notebooks_url}")
+        perf_tracker.sample_page("Notebooks Page", notebooks_url)
         
         # Measure workflows page
         workflows_url = f"{base_url}/app/virtual-lab/{lab_id}/{project_id}/workflows"
-        logger.info(f"Navigating to: {workflows_url}")
-        browser.get(workflows_url)
-        wait.until(lambda d: d.execute_script("return document.readyState") == "complete")
-        perf_tracker.capture_metrics("Workflows Page")
+        logger.info(f"Sampling: {workflows_url}")
+        perf_tracker.sample_page("Workflows Page", workflows_url)
         
         # Measure data page
         data_url = f"{base_url}/app/virtual-lab/{lab_id}/{project_id}/data"
-        logger.info(f"Navigating to: {data_url}")
-        browser.get(data_url)
-        wait.until(lambda d: d.execute_script("return document.readyState") == "complete")
-        perf_tracker.capture_metrics("Data Page")
+        logger.info(f"Sampling: {data_url}")
+        perf_tracker.sample_page("Data Page", data_url)
         
         # Measure explore/browse page (loads all entity counts)
         explore_url = f"{base_url}/app/virtual-lab/{lab_id}/{project_id}/data/browse/entity/cell-morphology"
-        logger.info(f"Navigating to: {explore_url}")
-        browser.get(explore_url)
-        wait.until(lambda d: d.execute_script("return document.readyState") == "complete")
-        perf_tracker.capture_metrics("Explore Data - Experimental")
+        logger.info(f"Sampling: {explore_url}")
+        perf_tracker.sample_page("Explore Data - Experimental", explore_url)
         
         # Measure Model tab
         model_url = f"{base_url}/app/virtual-lab/{lab_id}/{project_id}/data/browse/model/e-model"
-        logger.info(f"Navigating to: {model_url}")
-        browser.get(model_url)
-        wait.until(lambda d: d.execute_script("return document.readyState") == "complete")
-        perf_tracker.capture_metrics("Explore Data - Model")
+        logger.info(f"Sampling: {model_url}")
+        perf_tracker.sample_page("Explore Data - Model", model_url)
         
         # Measure Simulations tab
         simulations_url = f"{base_url}/app/virtual-lab/{lab_id}/{project_id}/data/browse/simulation/single-neuron-simulation"
-        logger.info(f"Navigating to: {simulations_url}")
-        browser.get(simulations_url)
-        wait.until(lambda d: d.execute_script("return document.readyState") == "complete")
-        perf_tracker.capture_metrics("Explore Data - Simulations")
+        logger.info(f"Sampling: {simulations_url}")
+        perf_tracker.sample_page("Explore Data - Simulations", simulations_url)
         
         # Save report
-        perf_tracker.save_report("performance_authenticated_pages.json")
+        perf_tracker.save_report()
         
         summary = perf_tracker.get_summary()
         logger.info(f"\nAuthenticated Pages Performance Summary:")
@@ -114,10 +97,49 @@ class TestPerformanceTracking:
         logger.info(f"Average load time: {summary['average_load_time']:.2f}ms")
         logger.info(f"Slowest page: {summary['slowest_page']}")
         
-        # Optional: Assert performance thresholds
-        assert summary['average_load_time'] < 5000, "Average load time exceeds 5 seconds"
+        # Fail only on statistically significant slowdowns against previous runs
+        regressions = perf_baseline.evaluate(perf_tracker.metrics)
+        assert not regressions, perf_baseline.format_regressions(regressions)
+
+    @pytest.mark.own_browser
+    def test_measure_browser_startup(self, browser_factory, perf_baseline, pytestconfig, logger, test_config):
+        """Measure browser start to first navigation, on a fresh profile and on a template clone."""
+        import statistics
+        import time
+
+        version_url = f"{test_config['base_url'].rstrip('/')}/app/version"
+        # (profile, use the template and the seeded asset cache); fresh means no cache either
+        variants = [("fresh", False)]
+        if browser_factory.template:
+            variants.append(("template", True))
+
+        metrics = []
+        for index in range(max(pytestconfig.getoption("--perf-samples"), 3)):
+            for profile, use_template in variants:
+                start = time.perf_counter()
+                browser, wait = browser_factory(use_template=use_template, use_asset_cache=use_template)
+                try:
+                    browser.get(version_url)
+                    wait.until(lambda d: d.execute_script("return document.readyState") == "complete")
+                    metrics.append({
+                        # The profile is its own dimension, not a cold/warm cache state
+                        'page_name': f'Browser Startup ({profile} profile)',
+                        'profile': profile,
+                        'sample_index': index,
+                        'total_time': (time.perf_counter() - start) * 1000,
+                    })
+                finally:
+                    browser.quit()
+                    browser_factory.release(browser)
+
+        for profile, _ in variants:
+            times = [m['total_time'] for m in metrics if m['profile'] == profile]
+            logger.info(f"Browser startup to first navigation ({profile} profile): median {statistics.median(times):.0f}ms")
+
+        regressions = perf_baseline.evaluate(metrics)
+        assert not regressions, perf_baseline.format_regressions(regressions)
 
-    def test_measure_login_flow_performance(self, public_browsing, logger, test_config):
+    def test_measure_login_flow_performance(self, public_browsing, perf_baseline, logger, test_config):
         """Measure performance of login flow including redirects."""
         import time
         import os
@@ -125,7 +147,8 @@ class TestPerformanceTracking:
         from selenium.webdriver.support import expected_conditions as EC
         
         browser, wait, base_url = public_browsing
-        perf_tracker = PerformanceTracker(browser, logger)
+        # Samples are streamed to performance_login_flow.jsonl, so a failure midway keeps them
+        perf_tracker = PerformanceTracker(browser, logger, report_path="performance_login_flow.json")
         
         # Navigate to landing page first
         logger.info(f"Navigating to landing page: {base_url}")
@@ -195,7 +218,7 @@ class TestPerformanceTracking:
         
         # Add custom metrics for redirects
         from datetime import datetime
-        perf_tracker.metrics.append({
+        perf_tracker.add_metrics({
             'page_name': 'Landing → Login Redirect',
             'url': 'redirect',
             'timestamp': datetime.now().isoformat(),
@@ -211,7 +234,7 @@ class TestPerformanceTracking:
             'redirect_count': 1
         })
         
-        perf_tracker.metrics.append({
+        perf_tracker.add_metrics({
             'page_name': 'Login → Virtual Lab Redirect',
             'url': 'redirect',
             'timestamp': datetime.now().isoformat(),
@@ -228,7 +251,7 @@ class TestPerformanceTracking:
         })
         
         # Save report
-        perf_tracker.save_report("performance_login_flow.json")
+        perf_tracker.save_report()
         
         summary = perf_tracker.get_summary()
         logger.info(f"\nLogin Flow Performance Summary:")
@@ -238,6 +261,6 @@ class TestPerformanceTracking:
         logger.info(f"Login → Virtual Lab: {login_time:.2f}ms")
         logger.info(f"Total login flow time: {redirect_time + login_time:.2f}ms")
         
-        # Assert reasonable login flow time
-        total_flow_time = redirect_time + login_time
-        assert total_flow_time < 10000, f"Login flow too slow: {total_flow_time:.2f}ms"
+        # Fail only on statistically significant slowdowns against previous runs
+        regressions = perf_baseline.evaluate(perf_tracker.metrics)
+        assert not regressions, perf_baseline.format_regressions(regressions)
@@ -5,6 +5,7 @@
 import time
 import pytest
 from pages.simulate_mem_page import SimulateMemPage
+from util.performance_tracker import PerformanceTracker
 
 
 class TestSimulateMem:
@@ -48,7 +49,10 @@ class TestSimulateMem:
         title = sim_page.find_mini_detail_title().text
         logger.info(f"Selected model: '{title}'")
 
-        sim_page.click_use_model()
+        # The Use model click is a client-side route change; time it as a soft navigation
+        perf = PerformanceTracker(sim_page.browser, logger, report_path="performance_simulate_mem.json")
+        with perf.soft_navigation("simulate_mem_use_model_to_config"):
+            sim_page.click_use_model()
         logger.info(f"After Use model, URL: {sim_page.browser.current_url}")
 
         # Step 3: Wait for config page
@@ -66,10 +70,8 @@ class TestSimulateMem:
             logger.warning(f"Neuron visualizer not loaded after {morph_elapsed}s: {e}")
 
         # Capture Navigation Timing API metrics for the config page
-        from util.performance_tracker import PerformanceTracker
-        perf = PerformanceTracker(sim_page.browser, logger)
         perf.capture_metrics("simulate_mem_config_page")
-        perf.save_report("performance_simulate_mem.json")
+        perf.save_report()
 
         # Step 4: Verify Configuration and Results tabs
         tabs = sim_page.verify_config_tabs()
@@ -0,0 +1,14 @@
+# Copyright (c) 2025 Open Brain Institute
+# SPDX-License-Identifier: Apache-2.0
+"""
+Unit tests of the pure-Python helpers in util/. They need no browser or environment:
+
+    pytest tests/unit --health-gate=off
+"""
+import pytest
+
+
+@pytest.fixture(scope="function", autouse=True)
+def setup():
+    """Overrides the browser setup of the root conftest."""
+    yield None
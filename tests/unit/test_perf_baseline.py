@@ -0,0 +1,85 @@
+# Copyright (c) 2025 Open Brain Institute
+# SPDX-License-Identifier: Apache-2.0
+import random
+
+import pytest
+
+from util.perf_baseline import (
+    PerformanceBaseline, bootstrap_median_diff, mann_whitney_greater, spread_p_value,
+)
+
+
+def _samples(center, spread, count, seed=0):
+    rng = random.Random(seed)
+    return [rng.gauss(center, spread) for _ in range(count)]
+
+
+@pytest.fixture
+def baseline(tmp_path):
+    return PerformanceBaseline(str(tmp_path / "baseline.sqlite"), env="staging", browser="chrome", git_sha="abc")
+
+
+def test_mann_whitney_greater_detects_shift():
+    assert mann_whitney_greater(_samples(1500, 50, 5), _samples(1000, 50, 20, seed=1)) < 0.01
+
+
+def test_mann_whitney_greater_no_shift():
+    assert mann_whitney_greater(_samples(1000, 50, 5), _samples(1000, 50, 20, seed=1)) > 0.05
+
+
+def test_mann_whitney_greater_single_sample_floor():
+    # The exact single-sample p-value can't go below 1 / (n2 + 1)
+    assert mann_whitney_greater([10000], [1000] * 19) == pytest.approx(0.05)
+
+
+def test_spread_p_value():
+    base = _samples(1000, 50, 10)
+    assert spread_p_value(10000, base) < 0.001
+    assert spread_p_value(1000, base) > 0.3
+    assert spread_p_value(1001, [1000] * 10) == 0.0
+    assert spread_p_value(1000, [1000] * 10) == 1.0
+
+
+def test_bootstrap_median_diff_brackets_shift():
+    low, high = bootstrap_median_diff(_samples(1500, 50, 10), _samples(1000, 50, 20, seed=1))
+    assert 400 < low < 500 < high < 600
+
+
+def test_bootstrap_median_diff_deterministic():
+    current, base = _samples(1000, 50, 5), _samples(1000, 50, 20, seed=1)
+    assert bootstrap_median_diff(current, base) == bootstrap_median_diff(current, base)
+
+
+def test_compare_too_small_baseline(baseline):
+    baseline.record([{"page_name": "Landing", "total_time": 1000}] * 4)
+    assert baseline.compare("Landing", "total_time", [5000]) is None
+
+
+def test_compare_single_sample_regression(baseline):
+    baseline.record([{"page_name": "Landing", "total_time": t} for t in _samples(1000, 50, 19)])
+    result = baseline.compare("Landing", "total_time", [10000])
+    assert result["regression"]
+    assert result["p_value"] < baseline.alpha
+
+
+def test_compare_single_sample_within_noise(baseline):
+    baseline.record([{"page_name": "Landing", "total_time": t} for t in _samples(1000, 50, 19)])
+    assert not baseline.compare("Landing", "total_time", [1050])["regression"]
+
+
+def test_compare_small_significant_change_is_not_a_regression(baseline):
+    baseline.record([{"page_name": "Landing", "total_time": t} for t in _samples(1000, 10, 19)])
+    # Far outside the baseline spread, but below min_change
+    assert not baseline.compare("Landing", "total_time", [1100])["regression"]
+
+
+def test_compare_several_samples(baseline):
+    baseline.record([{"page_name": "Landing", "total_time": t} for t in _samples(1000, 50, 20)])
+    assert baseline.compare("Landing", "total_time", _samples(1500, 50, 3, seed=2))["regression"]
+    assert not baseline.compare("Landing", "total_time", _samples(1000, 50, 3, seed=2))["regression"]
+
+
+def test_min_samples_must_be_able_to_reach_alpha(tmp_path):
+    with pytest.raises(ValueError):
+        PerformanceBaseline(str(tmp_path / "baseline.sqlite"), env="staging", browser="chrome",
+                            git_sha="abc", min_samples=2, alpha=0.05)
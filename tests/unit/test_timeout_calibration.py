@@ -0,0 +1,58 @@
+# Copyright (c) 2025 Open Brain Institute
+# SPDX-License-Identifier: Apache-2.0
+import pytest
+
+from util.timeout_calibration import TimeoutCalibration, censored_percentile, required_samples
+
+
+@pytest.fixture
+def store(tmp_path):
+    return TimeoutCalibration(str(tmp_path / "timeouts.sqlite"), env="staging", apply=True)
+
+
+def test_censored_percentile_without_failures():
+    samples = [(float(i), True) for i in range(1, 101)]
+    assert censored_percentile(samples, 50) == 50
+    assert censored_percentile(samples, 99) == 99
+
+
+def test_censored_percentile_failures_raise_the_estimate():
+    successes = [(float(i), True) for i in range(1, 91)]
+    failures = [(10.0, False)] * 10
+    assert censored_percentile(successes + failures, 50) > censored_percentile(successes, 50)
+
+
+def test_censored_percentile_unreached_returns_longest_observation():
+    # 5% of the waits ran into their 20s timeout, p99 lies somewhere beyond it
+    samples = [(3.0, True)] * 95 + [(20.0, False)] * 5
+    assert censored_percentile(samples, 99) == 20.0
+
+
+def test_required_samples():
+    assert required_samples(99) == 500
+    assert required_samples(90) == 50
+
+
+def test_calibrated_needs_enough_samples(store):
+    for _ in range(store.min_samples - 1):
+        store.record("wait", 3.0, True, 40)
+    assert store.calibrated("wait") is None
+    assert store.timeout("wait", 40) == 40
+
+
+def test_calibrated_learns_from_failures(store):
+    for _ in range(store.min_samples - 10):
+        store.record("wait", 3.0, True, 5)
+    for _ in range(10):
+        store.record("wait", 5.0, False, 5)
+    # Waits failed at their 5s timeout, so the calibrated one must grow beyond it
+    assert store.calibrated("wait") == 7.5
+
+
+def test_calibrated_never_below_longest_success(tmp_path):
+    store = TimeoutCalibration(str(tmp_path / "timeouts.sqlite"), env="staging", apply=True,
+                               min_samples=10, ceiling=30)
+    for _ in range(9):
+        store.record("wait", 1.0, True, 40)
+    store.record("wait", 42.04, True, 40)
+    assert store.calibrated("wait") == 42.1
@@ -0,0 +1,154 @@
+# Copyright (c) 2025 Open Brain Institute
+# SPDX-License-Identifier: Apache-2.0
+"""
+Failure and debug artifacts with bounded retention.
+
+Every run writes its screenshots and page sources to its own directory under
+``latest_logs/artifacts/<run id>``. The run id comes from the environment, so all
+xdist workers of a run share it. Each artifact gets a line in the run's
+``index.jsonl`` with the test node id it belongs to. At the start of a session
+the oldest run directories are evicted until the number of runs and their total
+size are within the configured limits, so long-lived CI runners don't fill up.
+
+Page objects and fixtures call ``save_screenshot``/``save_page_source`` instead of
+writing files themselves.
+"""
+import atexit
+import json
+import logging
+import os
+import shutil
+import threading
+import time
+from typing import Optional
+
+from util.screenshots import ArtifactPipeline
+
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir))
+ARTIFACTS_ROOT = os.path.join(PROJECT_ROOT, "latest_logs", "artifacts")
+RUN_ID_ENV = "OBI_ARTIFACT_RUN"
+INDEX_FILE = "index.jsonl"
+
+logger = logging.getLogger(__name__)
+
+_pipeline: Optional[ArtifactPipeline] = None
+_pipeline_lock = threading.Lock()
+
+
+def run_id() -> str:
+    """Id of the current run; set once by the first process and inherited by xdist workers."""
+    return os.environ.setdefault(RUN_ID_ENV, time.strftime("%Y%m%d-%H%M%S") + f"-{os.getpid()}")
+
+
+def run_dir() -> str:
+    path = os.path.join(ARTIFACTS_ROOT, run_id())
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def current_test() -> Optional[str]:
+    """Node id of the running test, from the variable pytest maintains during each phase."""
+    value = os.environ.get("PYTEST_CURRENT_TEST")
+    return value.rsplit(" ", 1)[0] if value else None
+
+
+def get_pipeline() -> ArtifactPipeline:
+    """Return the process-wide artifact pipeline writing to the run directory."""
+    global _pipeline
+    with _pipeline_lock:
+        if _pipeline is None:
+            _pipeline = ArtifactPipeline(run_dir())
+        return _pipeline
+
+
+def shutdown_pipeline():
+    """Write the queued artifacts; called at session end and at exit."""
+    global _pipeline
+    with _pipeline_lock:
+        if _pipeline is not None:
+            _pipeline.close()
+            _pipeline = None
+
+
+atexit.register(shutdown_pipeline)
+
+
+def _index(path: str, kind: str, label: str, nodeid: Optional[str]):
+    entry = {
+        "time": time.time(),
+        "test": nodeid or current_test(),
+        "kind": kind,
+        "label": label,
+        "path": os.path.relpath(path, ARTIFACTS_ROOT),
+        "worker": os.getenv("PYTEST_XDIST_WORKER", "master"),
+    }
+    # One write per line in append mode, so lines of parallel workers don't interleave
+    with open(os.path.join(run_dir(), INDEX_FILE), "a") as f:
+        f.write(json.dumps(entry) + "\n")
+
+
+def save_screenshot(browser, label: str, nodeid: Optional[str] = None) -> Optional[str]:
+    """Store a screenshot of ``browser`` for the current test; returns its path, None on failure."""
+    try:
+        png = browser.get_screenshot_as_png()
+    except Exception as e:
+        logger.warning(f"Could not take screenshot: {e}")
+        return None
+    return save_screenshot_png(png, label, nodeid)
+
+
+def save_screenshot_png(png: bytes, label: str, nodeid: Optional[str] = None) -> str:
+    """Store an already taken PNG screenshot for the current test; returns its path."""
+    path = get_pipeline().submit_screenshot(png)
+    _index(path, "screenshot", label, nodeid)
+    return path
+
+
+def save_page_source(browser, label: str, nodeid: Optional[str] = None) -> Optional[str]:
+    """Store the page source of ``browser`` for the current test; returns its path, None on failure."""
+    try:
+        source = browser.page_source
+    except Exception as e:
+        logger.warning(f"Could not read page source: {e}")
+        return None
+    path = get_pipeline().submit_text(source)
+    _index(path, "page_source", label, nodeid)
+    return path
+
+
+def _dir_size(path: str) -> int:
+    total = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.path.getsize(os.path.join(root, name))
+            except OSError:
+                pass  # Removed concurrently
+    return total
+
+
+def enforce_retention(max_runs: int = 20, max_bytes: int = 1024 ** 3, keep: Optional[str] = None):
+    """
+    Evict the least recently modified run directories beyond ``max_runs`` or ``max_bytes``.
+
+    Args:
+        max_runs: Number of run directories to keep
+        max_bytes: Total size of the run directories to stay under
+        keep: Run id that is never evicted (the current run)
+    """
+    if not os.path.isdir(ARTIFACTS_ROOT):
+        return
+    runs = []
+    for name in os.listdir(ARTIFACTS_ROOT):
+        path = os.path.join(ARTIFACTS_ROOT, name)
+        if os.path.isdir(path) and name != keep:
+            runs.append((os.path.getmtime(path), _dir_size(path), path))
+    runs.sort()  # Oldest first
+
+    total = sum(size for _, size, _ in runs)
+    while runs and (len(runs) > max_runs or total > max_bytes):
+        _, size, path = runs.pop(0)
+        shutil.rmtree(path, ignore_errors=True)
+        total -= size
+        logger.info(f"Evicted artifacts of run {os.path.basename(path)} ({size / 1024 ** 2:.1f} MB)")
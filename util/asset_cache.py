@@ -0,0 +1,147 @@
+# Copyright (c) 2025 Open Brain Institute
+# SPDX-License-Identifier: Apache-2.0
+"""
+HTTP disk cache shared across browser sessions.
+
+Every browser starts with an empty profile, so each one downloads the same
+JS bundles, WebGL assets and fonts again. Instead, each browser gets a private
+disk cache directory copied from the newest seed of the cache. When the pool
+quits the browser, its cache becomes the new seed if it grew, so the next
+browsers (of this run and of later runs on the same machine) load warm.
+
+Browsers never share a live cache directory: neither Chrome nor Firefox supports
+several processes writing to one. Seeds are only created by renaming a complete
+copy into place, so a reader never sees half a seed.
+
+Seeds are kept per browser and per app version. The version is read from
+``/app/version``; when it changes, the seeds of the other versions are deleted.
+"""
+import hashlib
+import json
+import logging
+import os
+import re
+import shutil
+import tempfile
+import time
+from typing import List, Optional
+
+import requests
+
+
+SEED_PREFIX = "seed-"
+SESSIONS_DIR = "sessions"
+# Private directories of crashed sessions are removed after this many seconds
+STALE_SESSION_AGE = 24 * 3600
+# A session's cache replaces the seed when it is this much larger
+MIN_GROWTH = 1.1
+SEEDS_KEPT = 2
+
+
+def _dir_size(path: str) -> int:
+    total = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.path.getsize(os.path.join(root, name))
+            except OSError:
+                pass  # Removed concurrently
+    return total
+
+
+def fetch_version(base_url: str, timeout: int = 15) -> Optional[str]:
+    """
+    Short fingerprint of the deployed app version, None if the page can't be read.
+
+    ``/app/version`` is hashed by its ``version`` field when it is JSON, else by its
+    visible text, so scripts and markup that change per request don't count.
+    """
+    try:
+        response = requests.get(f"{base_url.rstrip('/')}/app/version", timeout=timeout)
+        response.raise_for_status()
+    except requests.RequestException:
+        return None
+    try:
+        data = response.json()
+        text = json.dumps(data.get("version", data) if isinstance(data, dict) else data, sort_keys=True)
+    except ValueError:
+        text = re.sub(r"<(script|style)\b.*?</\1>", " ", response.text, flags=re.S | re.I)
+        text = " ".join(re.sub(r"<[^>]+>", " ", text).split())
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()[:16]
+
+
+class AssetCache:
+    """Seeds of the browser disk cache for one browser and app version."""
+
+    def __init__(self, root: str, browser_name: str, version: str, max_bytes: int = 512 * 1024 ** 2,
+                 logger=None):
+        """
+        Args:
+            root: Directory of all seeds, e.g. <project>/.asset_cache
+            browser_name: "chrome" or "firefox"; their cache formats differ
+            version: Fingerprint of the app version, see ``fetch_version``
+            max_bytes: Cache size given to the browsers; larger caches aren't promoted
+            logger: Optional logger, falls back to the module logger
+        """
+        self.browser_dir = os.path.join(root, browser_name)
+        self.version_dir = os.path.join(self.browser_dir, version)
+        self.sessions_dir = os.path.join(self.version_dir, SESSIONS_DIR)
+        self.version = version
+        self.max_bytes = max_bytes
+        self.logger = logger or logging.getLogger(__name__)
+        os.makedirs(self.sessions_dir, exist_ok=True)
+
+    def _seeds(self) -> List[str]:
+        """Complete seeds, newest first."""
+        names = [n for n in os.listdir(self.version_dir) if n.startswith(SEED_PREFIX) and not n.endswith(".tmp")]
+        return [os.path.join(self.version_dir, n) for n in sorted(names, reverse=True)]
+
+    def prune(self):
+        """Delete the seeds of other app versions and private directories of crashed sessions."""
+        for name in os.listdir(self.browser_dir):
+            path = os.path.join(self.browser_dir, name)
+            if name != self.version and os.path.isdir(path):
+                shutil.rmtree(path, ignore_errors=True)
+                self.logger.info(f"Asset cache: dropped seeds of app version {name}")
+        cutoff = time.time() - STALE_SESSION_AGE
+        for name in os.listdir(self.sessions_dir):
+            path = os.path.join(self.sessions_dir, name)
+            if os.path.getmtime(path) < cutoff:
+                shutil.rmtree(path, ignore_errors=True)
+
+    def new_session_dir(self) -> str:
+        """Private cache directory for a new browser, seeded from the newest seed."""
+        path = tempfile.mkdtemp(dir=self.sessions_dir)
+        for seed in self._seeds():
+            try:
+                shutil.copytree(seed, path, dirs_exist_ok=True)
+                self.logger.info(f"Asset cache: seeded from {os.path.basename(seed)}")
+                break
+            except (OSError, shutil.Error) as e:
+                # Pruned while copying; try the next one
+                self.logger.debug(f"Asset cache: could not copy {seed}: {e}")
+                shutil.rmtree(path, ignore_errors=True)
+                os.makedirs(path, exist_ok=True)
+        return path
+
+    def release(self, session_dir: str):
+        """Promote the cache of a quit browser to the newest seed if it grew, then delete it."""
+        tmp_seed = None
+        try:
+            seeds = self._seeds()
+            size = _dir_size(session_dir)
+            seed_size = _dir_size(seeds[0]) if seeds else 0
+            if seed_size * MIN_GROWTH < size <= self.max_bytes:
+                seed = os.path.join(self.version_dir, f"{SEED_PREFIX}{time.time_ns()}")
+                tmp_seed = f"{seed}.tmp"
+                shutil.copytree(session_dir, tmp_seed)
+                os.rename(tmp_seed, seed)
+                self.logger.info(f"Asset cache: new seed of {size / 1024 ** 2:.1f} MB")
+                for old in self._seeds()[SEEDS_KEPT:]:
+                    shutil.rmtree(old, ignore_errors=True)
+        except (OSError, shutil.Error) as e:
+            self.logger.warning(f"Asset cache: could not promote session cache: {e}")
+            if tmp_seed:
+                shutil.rmtree(tmp_seed, ignore_errors=True)
+        finally:
+            shutil.rmtree(session_dir, ignore_errors=True)
@@ -0,0 +1,157 @@
+# Copyright (c) 2025 Open Brain Institute
+# SPDX-License-Identifier: Apache-2.0
+"""
+On-disk cache of an authenticated browser session.
+
+The Keycloak login takes 10-40 seconds. After one successful login the app
+cookies and Web Storage are captured and written to disk, and later tests
+inject them into a fresh browser instead of going through the OIDC flow again.
+An inter-process lock makes sure only one pytest process logs in at a time,
+so parallel workers share a single login per run.
+"""
+import hashlib
+import json
+import logging
+import os
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import fasteners
+from selenium.common import TimeoutException
+from selenium.webdriver.support.wait import WebDriverWait
+
+
+COOKIE_KEYS = ("name", "value", "path", "domain", "secure", "httpOnly", "expiry", "sameSite")
+EXPIRY_MARGIN = 60  # seconds; treat sessions about to expire as already expired
+
+READ_STORAGE_SCRIPT = """
+    function dump(storage) {
+        var data = {};
+        for (var i = 0; i < storage.length; i++) {
+            var key = storage.key(i);
+            data[key] = storage.getItem(key);
+        }
+        return data;
+    }
+    return {local: dump(window.localStorage), session: dump(window.sessionStorage)};
+"""
+
+WRITE_STORAGE_SCRIPT = """
+    var state = arguments[0];
+    Object.keys(state.local || {}).forEach(function (k) { window.localStorage.setItem(k, state.local[k]); });
+    Object.keys(state.session || {}).forEach(function (k) { window.sessionStorage.setItem(k, state.session[k]); });
+"""
+
+
+class AuthSessionCache:
+    """Capture, persist and restore an authenticated app session."""
+
+    def __init__(self, cache_dir: str, base_url: str, username: str, max_age: int = 1800, logger=None):
+        """
+        Args:
+            cache_dir: Directory where session files are stored
+            base_url: App base URL the session belongs to
+            username: Account the session belongs to
+            max_age: Maximum age of a cached session in seconds
+            logger: Optional logger, falls back to the module logger
+        """
+        self.base_url = base_url.rstrip("/")
+        self.max_age = max_age
+        self.logger = logger or logging.getLogger(__name__)
+
+        key = hashlib.sha1(f"{self.base_url}|{username}".encode()).hexdigest()[:12]
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.path = self.cache_dir / f"session_{key}.json"
+        self.lock = fasteners.InterProcessLock(str(self.path) + ".lock")
+
+    def load(self) -> Optional[Dict[str, Any]]:
+        """Return the cached session, or None if missing or expired."""
+        try:
+            with open(self.path, "r") as f:
+                state = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+        if self.is_expired(state):
+            self.logger.info("Cached auth session expired")
+            return None
+        return state
+
+    def is_expired(self, state: Dict[str, Any]) -> bool:
+        """A session expires at max_age or at its earliest cookie expiry, whichever comes first."""
+        return time.time() + EXPIRY_MARGIN >= state.get("expires_at", 0)
+
+    def capture(self, browser) -> Dict[str, Any]:
+        """Capture cookies and Web Storage from a logged-in browser and store them on disk."""
+        cookies = [{k: c[k] for k in COOKIE_KEYS if k in c} for c in browser.get_cookies()]
+        storage = browser.execute_script(READ_STORAGE_SCRIPT)
+
+        captured_at = time.time()
+        expires_at = captured_at + self.max_age
+        cookie_expiries = [c["expiry"] for c in cookies if c.get("expiry")]
+        if cookie_expiries:
+            expires_at = min(expires_at, min(cookie_expiries))
+
+        state = {
+            "base_url": self.base_url,
+            "captured_at": captured_at,
+            "expires_at": expires_at,
+            "cookies": cookies,
+            "storage": storage,
+        }
+
+        tmp_path = self.path.with_suffix(".tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(state, f)
+        os.chmod(tmp_path, 0o600)  # contains session tokens
+        os.replace(tmp_path, self.path)
+        self.logger.info(f"Captured auth session ({len(cookies)} cookies) to {self.path}")
+        return state
+
+    def restore(self, browser, lab_url: str, timeout: int = 30) -> bool:
+        """
+        Inject the cached session into the browser and open the virtual lab.
+
+        Returns:
+            True if the browser ends up authenticated, False if there was no
+            usable session or the app redirected to the login page.
+        """
+        state = self.load()
+        if not state:
+            return False
+
+        # Cookies can only be set for the current document's domain
+        browser.get(f"{self.base_url}/app/version")
+        for cookie in state["cookies"]:
+            try:
+                browser.add_cookie(cookie)
+            except Exception as e:
+                self.logger.debug(f"Could not restore cookie {cookie.get('name')}: {e}")
+        browser.execute_script(WRITE_STORAGE_SCRIPT, state.get("storage") or {})
+
+        browser.get(lab_url)
+        try:
+            WebDriverWait(browser, timeout).until(
+                lambda d: "/auth/realms/" in d.current_url or "openid-connect" in d.current_url
+                or ("virtual-lab" in d.current_url and "sync" not in d.current_url)
+            )
+        except TimeoutException:
+            self.logger.warning(f"Restored session did not settle. Current URL: {browser.current_url}")
+            return False
+
+        if "/auth/realms/" in browser.current_url or "openid-connect" in browser.current_url:
+            self.logger.info("Cached auth session was rejected, invalidating it")
+            self.invalidate()
+            return False
+
+        self.logger.info("Restored cached auth session")
+        return True
+
+    def invalidate(self):
+        """Remove the cached session so the next test logs in again."""
+        try:
+            self.path.unlink()
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,147 @@
+# Copyright (c) 2025 Open Brain Institute
+# SPDX-License-Identifier: Apache-2.0
+"""
+Browser pool that keeps warm WebDriver instances alive between tests.
+
+Starting Firefox/Chrome and the driver process costs several seconds per test.
+The pool hands out an already running browser, and when the test is done the
+browser is reset (cookies, storage, extra tabs, window size) instead of quit.
+"""
+import logging
+import threading
+from typing import Callable, List, Optional, Tuple
+from urllib.parse import urlparse
+
+from selenium.common import WebDriverException
+
+
+DEFAULT_WINDOW_SIZE = (1400, 900)
+DEFAULT_PAGE_LOAD_TIMEOUT = 90
+
+CLEAR_STORAGE_SCRIPT = """
+    try { window.localStorage.clear(); } catch (e) {}
+    try { window.sessionStorage.clear(); } catch (e) {}
+"""
+
+
+class BrowserPool:
+    """Keep up to ``size`` idle browsers warm and reset them between tests."""
+
+    def __init__(self, factory: Callable[[], Tuple], size: int = 1, max_uses: int = 20,
+                 reset_urls: Optional[List[str]] = None, on_quit: Optional[Callable] = None, logger=None):
+        """
+        Args:
+            factory: Callable returning a new ``(browser, wait)`` tuple
+            size: Maximum number of idle browsers kept alive
+            max_uses: Number of checkouts after which a browser is recycled
+            reset_urls: Pages visited on reset to clear cookies on other origins
+                (e.g. the Keycloak realm, whose cookies are path restricted)
+            on_quit: Called with each browser after it has been quit
+            logger: Optional logger, falls back to the module logger
+        """
+        self.factory = factory
+        self.size = size
+        self.max_uses = max_uses
+        self.reset_urls = reset_urls or []
+        self.on_quit = on_quit
+        self.logger = logger or logging.getLogger(__name__)
+        self._idle = []
+        self._uses = {}
+        self._lock = threading.Lock()
+
+    def checkout(self) -> Tuple:
+        """Return a ``(browser, wait)`` tuple, reusing an idle browser when possible."""
+        with self._lock:
+            entry = self._idle.pop() if self._idle else None
+
+        if entry is None:
+            entry = self.factory()
+            self.logger.info("Browser pool: started a new browser")
+        else:
+            self.logger.info("Browser pool: reusing a warm browser")
+
+        browser = entry[0]
+        self._uses[id(browser)] = self._uses.get(id(browser), 0) + 1
+        return entry
+
+    def checkin(self, entry: Tuple):
+        """Reset the browser and keep it for the next test, or quit it."""
+        browser = entry[0]
+        uses = self._uses.get(id(browser), 0)
+
+        keep = self.size > 0 and uses < self.max_uses and len(self._idle) < self.size
+        if keep:
+            try:
+                self.reset(browser)
+            except Exception as e:
+                self.logger.warning(f"Browser pool: reset failed, discarding browser: {e}")
+                keep = False
+
+        if keep:
+            with self._lock:
+                self._idle.append(entry)
+        else:
+            self._quit(browser)
+
+    def reset(self, browser):
+        """Bring a used browser back to a clean state without restarting it."""
+        # Accessing the URL raises when the session is dead
+        _ = browser.current_url
+
+        handles = browser.window_handles
+        for handle in handles[1:]:
+            browser.switch_to.window(handle)
+            browser.close()
+        browser.switch_to.window(handles[0])
+
+        try:
+            browser.switch_to.alert.dismiss()
+        except WebDriverException:
+            pass
+
+        browser.execute_script(CLEAR_STORAGE_SCRIPT)
+        browser.delete_all_cookies()
+
+        if hasattr(browser, "execute_cdp_cmd"):
+            # Chrome can clear every origin without navigating
+            browser.execute_cdp_cmd("Network.clearBrowserCookies", {})
+            for origin in self._reset_origins():
+                browser.execute_cdp_cmd("Storage.clearDataForOrigin", {
+                    "origin": origin,
+                    "storageTypes": "cookies,local_storage,session_storage,indexeddb,service_workers,cache_storage",
+                })
+        else:
+            # Firefox only exposes cookies of the current document
+            for url in self.reset_urls:
+                browser.get(url)
+                browser.execute_script(CLEAR_STORAGE_SCRIPT)
+                browser.delete_all_cookies()
+
+        browser.get("about:blank")
+        browser.set_page_load_timeout(DEFAULT_PAGE_LOAD_TIMEOUT)
+        browser.set_window_size(*DEFAULT_WINDOW_SIZE)
+
+    def close(self):
+        """Quit every idle browser. Called at the end of the session."""
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for browser, _ in idle:
+            self._quit(browser)
+
+    def _reset_origins(self) -> List[str]:
+        origins = []
+        for url in self.reset_urls:
+            parsed = urlparse(url)
+            origin = f"{parsed.scheme}://{parsed.netloc}"
+            if origin not in origins:
+                origins.append(origin)
+        return origins
+
+    def _quit(self, browser):
+        self._uses.pop(id(browser), None)
+        try:
+            browser.quit()
+        except Exception as e:
+            self.logger.debug(f"Browser pool: quit failed: {e}")
+        if self.on_quit:
+            self.on_quit(browser)
@@ -0,0 +1,220 @@
+# Copyright (c) 2025 Open Brain Institute
+# SPDX-License-Identifier: Apache-2.0
+"""
+Template browser profiles, built once and cloned for every new browser.
+
+A browser started on an empty profile spends its first seconds creating it:
+preference files, certificate and cookie databases, startup caches. The
+template is a profile materialized by starting the browser once with the suite's
+preferences (written to ``user.js`` for Firefox), visiting ``/app/version`` and
+storing the analytics exclusion cookie with an expiry so it survives the restart.
+It is kept as a compressed archive per browser and configuration, unpacked once
+per process and cloned for each browser. The clone uses reflinks where the
+filesystem supports them and a plain copy otherwise; hard links are not an
+option because browsers update their SQLite files in place. The HTTP cache is
+not part of the template, util.asset_cache provides it.
+
+The archive records the browser version it was built with. A browser of another
+version invalidates it, and it is rebuilt by the next session.
+"""
+import hashlib
+import json
+import logging
+import os
+import shutil
+import subprocess
+import sys
+import tarfile
+import tempfile
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import fasteners
+
+
+# Bump when the build steps change, so existing archives are rebuilt
+TEMPLATE_FORMAT = 1
+# Held by a running browser, must not be copied into a template
+LOCK_FILES = {"lock", ".parentlock", "parent.lock", "SingletonLock", "SingletonCookie", "SingletonSocket"}
+COOKIE_LIFETIME = 30 * 24 * 3600
+
+
+def template_key(browser_name: str, host: str, headless: bool, preferences: Dict[str, Any]) -> str:
+    """Fingerprint of everything a template depends on; ``host`` is the domain of its cookies."""
+    data = json.dumps([TEMPLATE_FORMAT, browser_name, host, headless, preferences], sort_keys=True)
+    return hashlib.sha256(data.encode("utf-8")).hexdigest()[:16]
+
+
+def write_user_js(profile_dir: str, preferences: Dict[str, Any]):
+    """Write Firefox preferences to ``user.js``, which Firefox applies on every start."""
+    with open(os.path.join(profile_dir, "user.js"), "w") as f:
+        for name, value in preferences.items():
+            f.write(f"user_pref({json.dumps(name)}, {json.dumps(value)});\n")
+
+
+def clone_tree(source: str, target: str):
+    """Copy the contents of ``source`` into the existing ``target``, with reflinks if possible."""
+    if sys.platform.startswith("linux"):
+        command = ["cp", "-a", "--reflink=auto", f"{source}/.", target]
+    elif sys.platform == "darwin":
+        command = ["cp", "-c", "-R", f"{source}/.", target]  # clonefile on APFS
+    else:
+        command = None
+    if command:
+        try:
+            subprocess.run(command, check=True, capture_output=True)
+            return
+        except (OSError, subprocess.CalledProcessError):
+            pass  # e.g. cp -c on a filesystem without clones
+    shutil.copytree(source, target, symlinks=True, dirs_exist_ok=True)
+
+
+class ProfileTemplate:
+    """Compressed template profile of one browser configuration."""
+
+    def __init__(self, root: str, browser_name: str, key: str, logger=None):
+        """
+        Args:
+            root: Directory of the template archives
+            browser_name: "chrome" or "firefox"
+            key: Fingerprint of the configuration, see ``template_key``
+            logger: Optional logger, falls back to the module logger
+        """
+        os.makedirs(root, exist_ok=True)
+        self.browser_name = browser_name
+        self.archive = os.path.join(root, f"{browser_name}-{key}.tar.gz")
+        self.meta_path = os.path.join(root, f"{browser_name}-{key}.json")
+        self.logger = logger or logging.getLogger(__name__)
+        self._lock = fasteners.InterProcessLock(self.archive + ".lock")
+        self._unpacked: Optional[str] = None
+
+    def exists(self) -> bool:
+        return os.path.exists(self.archive) and os.path.exists(self.meta_path)
+
+    @property
+    def browser_version(self) -> Optional[str]:
+        try:
+            with open(self.meta_path) as f:
+                return json.load(f).get("browser_version")
+        except (OSError, ValueError):
+            return None
+
+    def ensure(self, launch: Callable[[str], Tuple], warmup_url: str, cookies: List[Dict[str, Any]],
+               preferences: Optional[Dict[str, Any]] = None):
+        """
+        Build the template unless it exists; parallel workers wait for the first one's build.
+
+        Args:
+            launch: Starts a browser on the given profile directory, returns ``(browser, wait)``
+            warmup_url: Page visited once, and the origin of ``cookies``
+            cookies: Cookies stored in the template, given an expiry so they persist
+            preferences: Firefox preferences written to ``user.js``
+        """
+        with self._lock:
+            if not self.exists():
+                self._build(launch, warmup_url, cookies, preferences)
+
+    def _build(self, launch, warmup_url, cookies, preferences):
+        started = time.perf_counter()
+        profile_dir = tempfile.mkdtemp(prefix="obi-profile-build-")
+        try:
+            if preferences:
+                write_user_js(profile_dir, preferences)
+            browser, _ = launch(profile_dir)
+            try:
+                browser.get(warmup_url)
+                for cookie in cookies:
+                    browser.add_cookie({**cookie, "expiry": int(time.time()) + COOKIE_LIFETIME})
+                browser.get("about:blank")
+                browser_version = browser.capabilities.get("browserVersion")
+            finally:
+                browser.quit()
+
+            tmp_archive = f"{self.archive}.{os.getpid()}.tmp"
+            with tarfile.open(tmp_archive, "w:gz") as tar:
+                tar.add(profile_dir, arcname=".",
+                        filter=lambda info: None if os.path.basename(info.name) in LOCK_FILES else info)
+            os.replace(tmp_archive, self.archive)
+            with open(self.meta_path, "w") as f:
+                json.dump({"browser_version": browser_version, "built_at": time.time()}, f)
+        finally:
+            shutil.rmtree(profile_dir, ignore_errors=True)
+        self.logger.info(f"Profile template: built {os.path.basename(self.archive)} "
+                         f"in {time.perf_counter() - started:.1f}s")
+
+    def clone(self) -> str:
+        """New profile directory cloned from the template."""
+        if self._unpacked is None:
+            unpacked = tempfile.mkdtemp(prefix="obi-profile-template-")
+            with tarfile.open(self.archive, "r:gz") as tar:
+                tar.extractall(unpacked)
+            self._unpacked = unpacked
+        profile_dir = tempfile.mkdtemp(prefix="obi-profile-")
+        clone_tree(self._unpacked, profile_dir)
+        return profile_dir
+
+    def invalidate(self):
+        """Delete the archive; the next session builds a new one."""
+        with self._lock:
+            for path in (self.archive, self.meta_path):
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+        self.logger.info(f"Profile template: invalidated {os.path.basename(self.archive)}")
+
+    def close(self):
+        if self._unpacked:
+            shutil.rmtree(self._unpacked, ignore_errors=True)
+            self._unpacked = None
+
+
+class BrowserFactory:
+    """Create browsers on a cloned template profile and a seeded asset cache, and clean up after them."""
+
+    def __init__(self, create: Callable[..., Tuple], template: Optional[ProfileTemplate] = None,
+                 asset_cache=None, logger=None):
+        """
+        Args:
+            create: ``create(profile_dir=..., cache_dir=...)`` returning ``(browser, wait)``
+            template: Template to clone profiles from, None for fresh profiles
+            asset_cache: util.asset_cache.AssetCache seeding the HTTP cache, or None
+            logger: Optional logger, falls back to the module logger
+        """
+        self.create = create
+        self.template = template
+        self.asset_cache = asset_cache
+        self.logger = logger or logging.getLogger(__name__)
+
+    def __call__(self, use_template: bool = True, use_asset_cache: bool = True) -> Tuple:
+        cache_dir = self.asset_cache.new_session_dir() if self.asset_cache and use_asset_cache else None
+        profile_dir = None
+        if use_template and self.template and self.template.exists():
+            profile_dir = self.template.clone()
+            try:
+                browser, wait = self.create(profile_dir=profile_dir, cache_dir=cache_dir)
+            except Exception as e:
+                self.logger.warning(f"Profile template: browser failed to start on it, using a fresh profile: {e}")
+                shutil.rmtree(profile_dir, ignore_errors=True)
+                self.template.invalidate()
+                profile_dir = None
+                browser, wait = self.create(profile_dir=None, cache_dir=cache_dir)
+            else:
+                if browser.capabilities.get("browserVersion") != self.template.browser_version:
+                    self.template.invalidate()
+        else:
+            browser, wait = self.create(profile_dir=None, cache_dir=cache_dir)
+        browser._profile_dir = profile_dir
+        browser._asset_cache_dir = cache_dir
+        return browser, wait
+
+    def release(self, browser):
+        """Remove the directories of a browser that has been quit."""
+        if browser._asset_cache_dir:
+            self.asset_cache.release(browser._asset_cache_dir)
+        if browser._profile_dir:
+            shutil.rmtree(browser._profile_dir, ignore_errors=True)
+
+    def close(self):
+        if self.template:
+            self.template.close()
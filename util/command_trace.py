@@ -0,0 +1,136 @@
+# Copyright (c) 2025 Open Brain Institute
+# SPDX-License-Identifier: Apache-2.0
+"""
+WebDriver command tracer.
+
+Every find_element, .text, get_attribute or execute_script is an HTTP round trip
+to the driver. The tracer records each command with its latency and the
+page-object/test line that issued it, aggregates them per test (count, total
+latency, top call sites) and exports a Chrome trace-event file that can be
+opened in chrome://tracing or https://ui.perfetto.dev.
+"""
+import html
+import json
+import os
+import sys
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from selenium.webdriver.remote.command import Command
+
+from util.instrumentation import add_listener, remove_listener
+
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir))
+# Frames from these directories are reported as call sites, skipping the generic
+# helpers so a find_element is attributed to the page-object method that called it
+CALL_SITE_DIRS = tuple(os.path.join(PROJECT_ROOT, d) + os.sep for d in ("pages", "tests"))
+HELPER_FILES = {os.path.join(PROJECT_ROOT, "pages", f) for f in ("base_page.py", "robust_base_page.py")}
+
+# Only locator parameters are kept; others may hold typed text such as passwords
+FIND_COMMANDS = {
+    Command.FIND_ELEMENT, Command.FIND_ELEMENTS,
+    Command.FIND_CHILD_ELEMENT, Command.FIND_CHILD_ELEMENTS,
+}
+
+
+def find_call_site() -> str:
+    """Return ``file:line (function)`` of the innermost page-object or test frame on the stack."""
+    frame = sys._getframe(1)
+    while frame is not None:
+        filename = frame.f_code.co_filename
+        if filename.startswith(CALL_SITE_DIRS) and filename not in HELPER_FILES:
+            return f"{os.path.relpath(filename, PROJECT_ROOT)}:{frame.f_lineno} ({frame.f_code.co_name})"
+        frame = frame.f_back
+    return "<framework>"
+
+
+class CommandTracer:
+    """Record the WebDriver commands of one test."""
+
+    def __init__(self, test_name: str):
+        self.test_name = test_name
+        self.commands: List[Tuple[str, str, float, float, Optional[Dict[str, Any]]]] = []
+        self._origin = time.perf_counter()
+
+    def start(self):
+        add_listener("command", self._on_command)
+
+    def stop(self):
+        remove_listener("command", self._on_command)
+
+    def _on_command(self, command, params, start, duration, in_wait):
+        args = None
+        if command in FIND_COMMANDS and params:
+            args = {"using": params.get("using"), "value": params.get("value")}
+        self.commands.append((command, find_call_site(), start, duration, args))
+
+    # ── aggregation ──────────────────────────────────────────────────────
+
+    def summary(self, top: int = 10) -> Dict[str, Any]:
+        """Command count, total latency, and the busiest commands and call sites."""
+        by_command: Dict[str, List[float]] = {}
+        by_site: Dict[str, List[float]] = {}
+        for command, site, _, duration, _ in self.commands:
+            by_command.setdefault(command, []).append(duration)
+            by_site.setdefault(site, []).append(duration)
+
+        def rank(grouped):
+            return [
+                {"name": name, "count": len(d), "total_ms": round(sum(d) * 1000, 1),
+                 "avg_ms": round(sum(d) / len(d) * 1000, 2)}
+                for name, d in sorted(grouped.items(), key=lambda item: sum(item[1]), reverse=True)[:top]
+            ]
+
+        return {
+            "test": self.test_name,
+            "command_count": len(self.commands),
+            "total_latency_ms": round(sum(c[3] for c in self.commands) * 1000, 1),
+            "top_commands": rank(by_command),
+            "top_call_sites": rank(by_site),
+        }
+
+    # ── export ───────────────────────────────────────────────────────────
+
+    def trace_events(self) -> List[Dict[str, Any]]:
+        """Commands as Chrome trace "complete" events (microseconds)."""
+        pid = os.getpid()
+        events = [{"name": "process_name", "ph": "M", "pid": pid, "tid": 1,
+                   "args": {"name": self.test_name}}]
+        for command, site, start, duration, args in self.commands:
+            event_args = {"call_site": site}
+            if args:
+                event_args.update(args)
+            events.append({
+                "name": command,
+                "cat": "webdriver",
+                "ph": "X",
+                "ts": round((start - self._origin) * 1e6),
+                "dur": round(duration * 1e6),
+                "pid": pid,
+                "tid": 1,
+                "args": event_args,
+            })
+        return events
+
+    def save(self, path: str):
+        """Write the Chrome trace-event file, with the summary as metadata."""
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as f:
+            json.dump({"traceEvents": self.trace_events(), "metadata": self.summary()}, f)
+
+    def to_html(self, top: int = 10) -> str:
+        """Summary for the pytest-html report."""
+        summary = self.summary(top)
+        rows = "".join(
+            f"<tr><td>{html.escape(s['name'])}</td><td>{s['count']}</td>"
+            f"<td>{s['total_ms']:.0f}ms</td><td>{s['avg_ms']:.1f}ms</td></tr>"
+            for s in summary["top_call_sites"]
+        )
+        return (
+            f"<div><strong>WebDriver commands:</strong> {summary['command_count']} "
+            f"({summary['total_latency_ms'] / 1000:.1f}s total)"
+            '<table style="border-collapse:collapse;font-size:12px;" border="1" cellpadding="3">'
+            "<tr><th>Call site</th><th>Commands</th><th>Total</th><th>Avg</th></tr>"
+            f"{rows}</table></div>"
+        )
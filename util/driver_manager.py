@@ -0,0 +1,146 @@
+# Copyright (c) 2025 Open Brain Institute
+# SPDX-License-Identifier: Apache-2.0
+"""
+Driver binary resolution and shared driver services.
+
+``GeckoDriverManager().install()`` resolves the latest release over the network
+on every browser creation. Here the driver is resolved once per machine:
+an explicit path from the environment, a binary already on PATH (the Docker
+image vendors geckodriver into /gecko), or a pinned copy in the user cache.
+webdriver-manager is only used to populate that cache, once, under a lock.
+
+Chromedriver can serve many sessions, so one long-lived chromedriver process
+is shared by every Chrome browser of the run. Geckodriver handles a single
+session per process, so Firefox gets a fresh service on the resolved binary.
+"""
+import atexit
+import logging
+import os
+import shutil
+import stat
+import threading
+from pathlib import Path
+from typing import Dict, Optional
+
+import fasteners
+from selenium.webdriver.chrome.service import Service as ChromeService
+from selenium.webdriver.firefox.service import Service as FirefoxService
+
+
+GECKODRIVER_VERSION = os.environ.get("GECKODRIVER_VERSION", "v0.33.0")
+DRIVER_CACHE_DIR = Path(os.environ.get(
+    "OBI_DRIVER_CACHE", Path.home() / ".cache" / "obi-qa-automation" / "drivers"
+))
+
+DRIVERS = {
+    "firefox": {"binary": "geckodriver", "env": "GECKODRIVER_PATH"},
+    "chrome": {"binary": "chromedriver", "env": "CHROMEDRIVER_PATH"},
+}
+
+logger = logging.getLogger(__name__)
+
+_resolved: Dict[str, Optional[str]] = {}
+_shared_services: Dict[str, "SharedChromeService"] = {}
+_lock = threading.Lock()
+
+
+def resolve_driver(browser_name: str) -> Optional[str]:
+    """
+    Return the path of the driver binary for ``browser_name``.
+
+    Resolution order: ``<DRIVER>_PATH`` env variable, PATH, pinned on-disk cache,
+    then a one-time download into that cache. Returns None for Chrome when no
+    binary is found, leaving the lookup to Selenium Manager.
+    """
+    with _lock:
+        if browser_name not in _resolved:
+            _resolved[browser_name] = _resolve(browser_name)
+            logger.info(f"Using {browser_name} driver: {_resolved[browser_name] or 'Selenium Manager'}")
+        return _resolved[browser_name]
+
+
+def _resolve(browser_name: str) -> Optional[str]:
+    driver = DRIVERS[browser_name]
+
+    env_path = os.environ.get(driver["env"])
+    if env_path:
+        if not os.access(env_path, os.X_OK):
+            raise FileNotFoundError(f"{driver['env']}={env_path} is not an executable file")
+        return env_path
+
+    on_path = shutil.which(driver["binary"])
+    if on_path:
+        return on_path
+
+    if browser_name != "firefox":
+        return None
+
+    cached = DRIVER_CACHE_DIR / driver["binary"] / GECKODRIVER_VERSION / driver["binary"]
+    if cached.exists():
+        return str(cached)
+
+    # Only one process downloads; the others wait and pick up the cached binary
+    DRIVER_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    with fasteners.InterProcessLock(str(DRIVER_CACHE_DIR / f"{driver['binary']}.lock")):
+        if not cached.exists():
+            from webdriver_manager.firefox import GeckoDriverManager
+
+            downloaded = GeckoDriverManager(version=GECKODRIVER_VERSION).install()
+            cached.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = cached.with_suffix(".tmp")
+            shutil.copyfile(downloaded, tmp_path)
+            tmp_path.chmod(tmp_path.stat().st_mode | stat.S_IXUSR | stat.S_IXGRP | stat.S_IXOTH)
+            os.replace(tmp_path, cached)
+            logger.info(f"Cached geckodriver {GECKODRIVER_VERSION} at {cached}")
+    return str(cached)
+
+
+class SharedChromeService(ChromeService):
+    """
+    Chromedriver service that outlives the browsers attached to it.
+
+    ``start`` is a no-op while the process is running and ``stop`` (called from
+    ``browser.quit()``) leaves it running; ``shutdown`` really stops it.
+    """
+
+    def start(self):
+        process = getattr(self, "process", None)
+        if process is not None and process.poll() is None:
+            return
+        super().start()
+
+    def stop(self):
+        pass
+
+    def shutdown(self):
+        super().stop()
+
+
+def get_service(browser_name: str):
+    """Return the driver service to pass to ``webdriver.Chrome``/``webdriver.Firefox``."""
+    path = resolve_driver(browser_name)
+
+    if browser_name == "firefox":
+        return FirefoxService(executable_path=path)
+
+    with _lock:
+        service = _shared_services.get(browser_name)
+        if service is None:
+            service = SharedChromeService(executable_path=path) if path else SharedChromeService()
+            _shared_services[browser_name] = service
+        return service
+
+
+def shutdown_services():
+    """Stop the shared driver processes. Called at the end of the session."""
+    with _lock:
+        services = list(_shared_services.values())
+        _shared_services.clear()
+    for service in services:
+        try:
+            service.shutdown()
+        except Exception as e:
+            logger.debug(f"Could not stop driver service: {e}")
+
+
+atexit.register(shutdown_services)
@@ -0,0 +1,144 @@
+# Copyright (c) 2025 Open Brain Institute
+# SPDX-License-Identifier: Apache-2.0
+"""
+Resource waterfall capture and HAR export.
+
+The waterfall is read from the Resource Timing API, so it works the same way on
+Chrome and Firefox without a proxy or DevTools. Resource Timing does not expose
+methods or headers, so the HAR file holds timings, sizes and cache status only.
+Cross-origin resources without Timing-Allow-Origin report zero sizes and
+timings and are marked with cache status "unknown".
+"""
+import json
+import os
+from datetime import datetime, timezone
+from typing import Any, Dict, List
+
+
+# arguments: sinceMs. Returns the resources fetched since sinceMs (relative to the
+# time origin), ordered by start time, plus the document time origin.
+RESOURCE_TIMING_SCRIPT = """
+var since = arguments[0] || 0;
+function span(start, end) { return start > 0 && end >= start ? end - start : 0; }
+var entries = performance.getEntriesByType('resource').filter(function (e) {
+    return e.startTime >= since;
+}).map(function (e) {
+    var cache = 'network';
+    if (e.transferSize === 0 && e.decodedBodySize > 0) { cache = 'cache'; }
+    else if (e.transferSize > 0 && e.encodedBodySize > 0 && e.transferSize < 300) { cache = 'revalidated'; }
+    else if (e.transferSize === 0 && e.decodedBodySize === 0 && e.responseStart === 0) { cache = 'unknown'; }
+    return {
+        url: e.name,
+        initiator: e.initiatorType,
+        protocol: e.nextHopProtocol || '',
+        status: e.responseStatus || 0,
+        start: e.startTime,
+        duration: e.duration,
+        transfer_size: e.transferSize || 0,
+        encoded_size: e.encodedBodySize || 0,
+        decoded_size: e.decodedBodySize || 0,
+        cache: cache,
+        timings: {
+            blocked: span(e.fetchStart, e.domainLookupStart || e.requestStart),
+            dns: span(e.domainLookupStart, e.domainLookupEnd),
+            connect: span(e.connectStart, e.connectEnd),
+            ssl: span(e.secureConnectionStart, e.connectEnd),
+            wait: span(e.requestStart, e.responseStart),
+            receive: span(e.responseStart, e.responseEnd)
+        }
+    };
+}).sort(function (a, b) { return a.start - b.start; });
+return {timeOrigin: performance.timeOrigin || performance.timing.navigationStart, entries: entries};
+"""
+
+CREATOR = {"name": "OBI Performance Tracker", "version": "1.0"}
+
+
+def summarize_waterfall(entries: List[Dict[str, Any]], slowest: int = 5) -> Dict[str, Any]:
+    """Aggregate a waterfall into the figures stored in the metric record."""
+    return {
+        'resource_count': len(entries),
+        'resource_transfer_size': sum(e['transfer_size'] for e in entries),
+        'cached_resource_count': sum(1 for e in entries if e['cache'] in ('cache', 'revalidated')),
+        'slowest_resources': [
+            {'url': e['url'], 'duration': int(round(e['duration'])), 'initiator': e['initiator']}
+            for e in sorted(entries, key=lambda e: e['duration'], reverse=True)[:slowest]
+        ],
+    }
+
+
+def _iso(epoch_ms: float) -> str:
+    return datetime.fromtimestamp(epoch_ms / 1000, tz=timezone.utc).isoformat()
+
+
+def build_har(pages: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Build a HAR 1.2 document.
+
+    Args:
+        pages: One dict per measured page with ``id``, ``title``, ``time_origin``
+            (epoch ms), ``since`` (ms after the time origin the page started at),
+            optional ``on_content_load``/``on_load`` and the waterfall ``entries``
+    """
+    har_pages, har_entries = [], []
+    for page in pages:
+        origin = page['time_origin']
+        har_pages.append({
+            'startedDateTime': _iso(origin + page.get('since', 0)),
+            'id': page['id'],
+            'title': page['title'],
+            'pageTimings': {
+                'onContentLoad': page.get('on_content_load') or -1,
+                'onLoad': page.get('on_load') or -1,
+            },
+        })
+        for entry in page['entries']:
+            timings = {k: round(v, 3) for k, v in entry['timings'].items()}
+            har_entries.append({
+                'pageref': page['id'],
+                'startedDateTime': _iso(origin + entry['start']),
+                'time': round(entry['duration'], 3),
+                'request': {
+                    # Resource Timing does not expose the method
+                    'method': 'GET',
+                    'url': entry['url'],
+                    'httpVersion': entry['protocol'],
+                    'cookies': [], 'headers': [], 'queryString': [],
+                    'headersSize': -1, 'bodySize': -1,
+                },
+                'response': {
+                    'status': entry['status'],
+                    'statusText': '',
+                    'httpVersion': entry['protocol'],
+                    'cookies': [], 'headers': [],
+                    'content': {'size': entry['decoded_size'], 'mimeType': ''},
+                    'redirectURL': '',
+                    'headersSize': -1,
+                    'bodySize': entry['encoded_size'] if entry['cache'] == 'network' else 0,
+                },
+                'cache': {},
+                'timings': {**timings, 'send': 0},
+                '_initiatorType': entry['initiator'],
+                '_transferSize': entry['transfer_size'],
+                '_cacheStatus': entry['cache'],
+            })
+
+    return {'log': {'version': '1.2', 'creator': CREATOR, 'pages': har_pages, 'entries': har_entries}}
+
+
+def write_har(pages: List[Dict[str, Any]], filename: str):
+    """Write the pages' waterfalls to ``filename`` as HAR."""
+    tmp_path = f"{filename}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(build_har(pages), f, indent=2)
+    os.replace(tmp_path, filename)
+
+
+def load_har_pages(filename: str) -> Dict[str, List[Dict[str, Any]]]:
+    """Return the HAR entries grouped by page id."""
+    with open(filename, 'r') as f:
+        har = json.load(f)
+    grouped = {page['id']: [] for page in har['log']['pages']}
+    for entry in har['log']['entries']:
+        grouped.setdefault(entry.get('pageref'), []).append(entry)
+    return grouped
@@ -0,0 +1,98 @@
+# Copyright (c) 2025 Open Brain Institute
+# SPDX-License-Identifier: Apache-2.0
+"""
+Health probes of the environment under test, run before the session starts.
+
+When the app or Keycloak is down, every test would still start a browser and
+wait out its login and page timeouts before failing. The gate sends one GET to
+each dependency, concurrently over a pooled session with short timeouts, so a
+broken environment is detected within seconds. A critical probe fails on a
+connection error, a timeout or an unexpected status; a non-critical one only
+produces a warning.
+"""
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List
+
+import requests
+from requests.adapters import HTTPAdapter
+
+
+# Set by the xdist controller when the gate failed in skip mode; workers inherit it
+FAILURE_ENV = "OBI_HEALTH_GATE_FAILURE"
+CONNECT_TIMEOUT = 3
+# Probes slower than this are reported, even when healthy
+SLOW_SECONDS = 3
+
+logger = logging.getLogger(__name__)
+
+
+def default_probes(base_url: str, oidc_login_url: str) -> List[Dict[str, Any]]:
+    """The app, its version page, the Keycloak login page and realm, entity-core and the auth API of the app."""
+    base_url = base_url.rstrip("/")
+    realm_url = oidc_login_url.split("/protocol/")[0]
+    return [
+        {"name": "app", "url": base_url, "critical": True},
+        {"name": "app version", "url": f"{base_url}/app/version", "critical": True, "expect": [200]},
+        {"name": "login page", "url": oidc_login_url, "critical": True},
+        {"name": "OIDC discovery", "url": f"{realm_url}/.well-known/openid-configuration", "critical": True,
+         "expect": [200]},
+        # Not yet verified against the deployed app: only warns until it is, then make it critical
+        {"name": "entity-core API", "url": f"{base_url}/api/entitycore/health", "critical": False,
+         "expect": [200]},
+        {"name": "auth session API", "url": f"{base_url}/api/auth/session", "critical": False},
+    ]
+
+
+def _probe(session: requests.Session, probe: Dict[str, Any], timeout: float) -> Dict[str, Any]:
+    result = dict(probe, status=None, error=None)
+    start = time.perf_counter()
+    try:
+        response = session.get(probe["url"], timeout=(min(CONNECT_TIMEOUT, timeout), timeout))
+        result["status"] = response.status_code
+        expected = probe.get("expect")
+        result["ok"] = response.status_code in expected if expected else response.status_code < 500
+        if not result["ok"]:
+            result["error"] = f"HTTP {response.status_code}"
+    except requests.RequestException as e:
+        result["ok"] = False
+        result["error"] = type(e).__name__
+    result["elapsed"] = time.perf_counter() - start
+    return result
+
+
+def run_probes(probes: List[Dict[str, Any]], timeout: float = 10.0) -> List[Dict[str, Any]]:
+    """
+    Run every probe concurrently.
+
+    Args:
+        probes: Dicts with name, url, critical and optionally the expected status codes
+            (by default anything below 500 is healthy)
+        timeout: Read timeout of each probe in seconds
+
+    Returns:
+        The probes with status, ok, error and elapsed seconds
+    """
+    with requests.Session() as session:
+        adapter = HTTPAdapter(pool_connections=len(probes), pool_maxsize=len(probes))
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        with ThreadPoolExecutor(max_workers=len(probes)) as executor:
+            return list(executor.map(lambda probe: _probe(session, probe, timeout), probes))
+
+
+def critical_failures(results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    return [r for r in results if r["critical"] and not r["ok"]]
+
+
+def format_results(results: List[Dict[str, Any]]) -> str:
+    lines = []
+    for r in results:
+        if r["ok"]:
+            icon = "⚠️ " if r["elapsed"] > SLOW_SECONDS else "✅"
+        else:
+            icon = "❌" if r["critical"] else "⚠️ "
+        outcome = r["error"] or f"HTTP {r['status']}"
+        lines.append(f"{icon} {r['name']:<18} {outcome:<20} {r['elapsed']:5.1f}s  {r['url'].split('?')[0]}")
+    return "\n".join(lines)
@@ -0,0 +1,107 @@
+# Copyright (c) 2025 Open Brain Institute
+# SPDX-License-Identifier: Apache-2.0
+"""
+Shared hooks on WebDriver commands, sleeps and explicit waits.
+
+Step timing, the command tracer and similar tools all need to see the same
+events. Instead of each of them monkeypatching Selenium and ``time.sleep`` (and
+having to unpatch in the right order), they register listeners here; the patches
+are installed while at least one listener is registered.
+
+Listener signatures:
+    command: fn(command, params, start, duration, in_wait)
+    sleep:   fn(seconds, start, duration, in_wait)
+    wait:    fn(method, start, duration)   # outermost waits only
+    step:    fn(name, start, duration, error)   # page-object methods, see step_timing
+
+``start`` comes from ``time.perf_counter()``; ``in_wait`` is True for events
+that happen while a WebDriverWait is polling.
+"""
+import time
+from typing import Callable, Dict, List
+
+from selenium.webdriver.remote.webdriver import WebDriver
+from selenium.webdriver.support.wait import WebDriverWait
+
+
+_listeners: Dict[str, List[Callable]] = {"command": [], "sleep": [], "wait": [], "step": []}
+_originals = {}
+_wait_depth = 0
+
+
+def add_listener(kind: str, listener: Callable):
+    """Register a listener for "command", "sleep", "wait" or "step" events."""
+    if not any(_listeners.values()):
+        _install()
+    _listeners[kind].append(listener)
+
+
+def remove_listener(kind: str, listener: Callable):
+    """Unregister a listener; the patches are removed with the last one."""
+    if listener in _listeners[kind]:
+        _listeners[kind].remove(listener)
+    if not any(_listeners.values()):
+        _uninstall()
+
+
+def has_listeners(kind: str) -> bool:
+    return bool(_listeners[kind])
+
+
+def emit(kind: str, *args):
+    """Send an event to the listeners of ``kind``; also used for events produced elsewhere."""
+    for listener in list(_listeners[kind]):
+        listener(*args)
+
+
+def _install():
+    global _originals
+    if _originals:
+        return
+    _originals = {
+        (time, "sleep"): time.sleep,
+        (WebDriverWait, "until"): WebDriverWait.until,
+        (WebDriverWait, "until_not"): WebDriverWait.until_not,
+        (WebDriver, "execute"): WebDriver.execute,
+    }
+    original_sleep = time.sleep
+    original_execute = WebDriver.execute
+
+    def sleep(seconds):
+        start = time.perf_counter()
+        try:
+            return original_sleep(seconds)
+        finally:
+            emit("sleep", seconds, start, time.perf_counter() - start, _wait_depth > 0)
+
+    def timed_wait(original):
+        def wait(wait_self, *args, **kwargs):
+            global _wait_depth
+            start = time.perf_counter()
+            _wait_depth += 1
+            try:
+                return original(wait_self, *args, **kwargs)
+            finally:
+                _wait_depth -= 1
+                if not _wait_depth:
+                    emit("wait", original.__name__, start, time.perf_counter() - start)
+        return wait
+
+    def execute(driver_self, driver_command, params=None):
+        start = time.perf_counter()
+        try:
+            return original_execute(driver_self, driver_command, params)
+        finally:
+            emit("command", driver_command, params, start, time.perf_counter() - start, _wait_depth > 0)
+
+    time.sleep = sleep
+    WebDriverWait.until = timed_wait(WebDriverWait.until)
+    WebDriverWait.until_not = timed_wait(WebDriverWait.until_not)
+    WebDriver.execute = execute
+
+
+def _uninstall():
+    global _originals
+    for (owner, name), original in _originals.items():
+        setattr(owner, name, original)
+    _originals = {}
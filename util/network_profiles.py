@@ -0,0 +1,227 @@
+# Copyright (c) 2025 Open Brain Institute
+# SPDX-License-Identifier: Apache-2.0
+"""
+Declarative network profiles: request blocking and bandwidth/latency emulation.
+
+A profile names categories of requests to block (analytics, fonts, media,
+images) and an optional throttle. It is selected with ``--network-profile`` for
+a whole run, or with ``@pytest.mark.network_profile("name")`` for a test or
+module, and applied to the browser when a test checks it out:
+
+- Chrome: DevTools ``Network.setBlockedURLs`` and ``Network.emulateNetworkConditions``.
+- Firefox: fonts, media and images are switched off with preferences. Blocked
+  hosts and the throttle go through a local filtering proxy. Preferences and
+  proxy are set at runtime in the chrome context, which needs
+  ``-remote-allow-system-access``. The proxy sees only the host of HTTPS
+  requests, so blocking on Firefox works per host, not per path.
+"""
+import fnmatch
+import logging
+import select
+import socket
+import socketserver
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+
+# DevTools URL patterns ("*" wildcard) per category
+BLOCK_PATTERNS = {
+    "analytics": [
+        "*matomo*", "*piwik*", "*google-analytics.com*", "*googletagmanager.com*",
+        "*hotjar.com*", "*doubleclick.net*",
+    ],
+    "fonts": ["*.woff2*", "*.woff*", "*.ttf*", "*.otf*", "*fonts.googleapis.com*", "*fonts.gstatic.com*"],
+    "media": ["*.mp4*", "*.webm*", "*.mov*", "*.m3u8*"],
+    "images": ["*.jpg*", "*.jpeg*", "*.png*", "*.gif*", "*.webp*", "*.avif*"],
+}
+
+# Throughput in kbit/s, latency in ms (roughly the DevTools presets)
+PROFILES: Dict[str, Dict[str, Any]] = {
+    "full": {},
+    "lean": {"block": ["analytics", "fonts", "media"]},
+    "lean-no-images": {"block": ["analytics", "fonts", "media", "images"]},
+    "cable": {"block": ["analytics"], "throttle": {"latency_ms": 28, "download_kbps": 5000, "upload_kbps": 1000}},
+    "fast-3g": {"block": ["analytics"], "throttle": {"latency_ms": 563, "download_kbps": 1440, "upload_kbps": 675}},
+    "slow-3g": {"block": ["analytics"], "throttle": {"latency_ms": 2000, "download_kbps": 400, "upload_kbps": 400}},
+}
+
+# Firefox preferences switching a category off, and their defaults
+FIREFOX_CATEGORY_PREFS = {
+    "fonts": {"browser.display.use_document_fonts": (0, 1), "gfx.downloadable_fonts.enabled": (False, True)},
+    "media": {"media.autoplay.default": (5, 1), "media.preload.default": (0, 1)},
+    "images": {"permissions.default.image": (2, 1)},
+}
+
+SET_FIREFOX_PREFS_SCRIPT = """
+var prefs = arguments[0];
+for (var name in prefs) {
+    var value = prefs[name];
+    if (typeof value === 'boolean') { Services.prefs.setBoolPref(name, value); }
+    else if (typeof value === 'number') { Services.prefs.setIntPref(name, value); }
+    else { Services.prefs.setStringPref(name, value); }
+}
+"""
+
+logger = logging.getLogger(__name__)
+
+
+def get_profile(name: str) -> Dict[str, Any]:
+    if name not in PROFILES:
+        raise ValueError(f"Unknown network profile '{name}', choose from {', '.join(PROFILES)}")
+    return PROFILES[name]
+
+
+def blocked_patterns(profile: Dict[str, Any]) -> List[str]:
+    return [pattern for category in profile.get("block", []) for pattern in BLOCK_PATTERNS[category]]
+
+
+def apply_profile(browser, name: str):
+    """Apply a profile to a browser; a no-op when it already runs with that profile."""
+    if getattr(browser, "_network_profile", "full") == name:
+        return
+    profile = get_profile(name)
+    if hasattr(browser, "execute_cdp_cmd"):
+        _apply_chrome(browser, profile)
+    else:
+        _apply_firefox(browser, profile)
+    browser._network_profile = name
+    logger.info(f"Network profile: {name}")
+
+
+def _apply_chrome(browser, profile: Dict[str, Any]):
+    throttle = profile.get("throttle")
+    browser.execute_cdp_cmd("Network.enable", {})
+    browser.execute_cdp_cmd("Network.setBlockedURLs", {"urls": blocked_patterns(profile)})
+    browser.execute_cdp_cmd("Network.emulateNetworkConditions", {
+        "offline": False,
+        "latency": throttle["latency_ms"] if throttle else 0,
+        # bytes/s; -1 disables throttling
+        "downloadThroughput": throttle["download_kbps"] * 125 if throttle else -1,
+        "uploadThroughput": throttle["upload_kbps"] * 125 if throttle else -1,
+    })
+
+
+def _apply_firefox(browser, profile: Dict[str, Any]):
+    blocked = set(profile.get("block", []))
+    prefs: Dict[str, Any] = {}
+    for category, category_prefs in FIREFOX_CATEGORY_PREFS.items():
+        for pref, (off, default) in category_prefs.items():
+            prefs[pref] = off if category in blocked else default
+
+    if blocked_patterns(profile) or profile.get("throttle"):
+        proxy = get_filter_proxy()
+        proxy.profile = profile
+        prefs.update({
+            "network.proxy.type": 1,
+            "network.proxy.http": "127.0.0.1",
+            "network.proxy.http_port": proxy.port,
+            "network.proxy.ssl": "127.0.0.1",
+            "network.proxy.ssl_port": proxy.port,
+            # Local servers (record/replay stand-in) stay direct
+            "network.proxy.no_proxies_on": "localhost, 127.0.0.1",
+            "network.proxy.allow_hijacking_localhost": False,
+        })
+    else:
+        prefs["network.proxy.type"] = 0
+
+    with browser.context(browser.CONTEXT_CHROME):
+        browser.execute_script(SET_FIREFOX_PREFS_SCRIPT, prefs)
+
+
+# ── Firefox filtering proxy ──────────────────────────────────────────────
+
+
+class _ProxyHandler(socketserver.BaseRequestHandler):
+    """CONNECT tunnels and plain HTTP forwarding with blocking and throttling."""
+
+    def handle(self):
+        proxy: "FilterProxy" = self.server.proxy
+        client = self.request
+        head = b""
+        while b"\r\n\r\n" not in head:
+            chunk = client.recv(65536)
+            if not chunk:
+                return
+            head += chunk
+        request_line = head.split(b"\r\n", 1)[0].decode("latin-1")
+        method, target, _ = request_line.split(" ", 2)
+
+        if method == "CONNECT":
+            host, _, port = target.partition(":")
+            url, rest = f"https://{host}/", b""
+        else:
+            # Plain HTTP through a proxy uses the absolute URL as target
+            url = target
+            host_port = target.split("/", 3)[2]
+            host, _, port = host_port.partition(":")
+            rest = head
+        port = int(port or (443 if method == "CONNECT" else 80))
+
+        profile = proxy.profile
+        if any(fnmatch.fnmatch(url, pattern) for pattern in blocked_patterns(profile)):
+            client.sendall(b"HTTP/1.1 403 Blocked by network profile\r\nContent-Length: 0\r\n\r\n")
+            return
+
+        throttle = profile.get("throttle")
+        if throttle:
+            time.sleep(throttle["latency_ms"] / 1000)
+        try:
+            upstream = socket.create_connection((host, port), timeout=30)
+        except OSError:
+            client.sendall(b"HTTP/1.1 502 Bad Gateway\r\nContent-Length: 0\r\n\r\n")
+            return
+        with upstream:
+            if method == "CONNECT":
+                client.sendall(b"HTTP/1.1 200 Connection Established\r\n\r\n")
+            else:
+                upstream.sendall(rest)
+            self._relay(client, upstream, throttle)
+
+    @staticmethod
+    def _relay(client, upstream, throttle: Optional[Dict[str, Any]]):
+        rates = {}
+        if throttle:
+            # bytes/s per direction of this connection
+            rates = {upstream: throttle["download_kbps"] * 125, client: throttle["upload_kbps"] * 125}
+        sockets = [client, upstream]
+        while True:
+            readable, _, _ = select.select(sockets, [], [], 60)
+            if not readable:
+                return
+            for source in readable:
+                data = source.recv(16384)
+                if not data:
+                    return
+                target = upstream if source is client else client
+                target.sendall(data)
+                if source in rates:
+                    time.sleep(len(data) / rates[source])
+
+
+class _ThreadingServer(socketserver.ThreadingMixIn, socketserver.TCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+class FilterProxy:
+    """Local HTTP/CONNECT proxy applying the current profile; one per process."""
+
+    def __init__(self):
+        self.profile: Dict[str, Any] = {}
+        self._server = _ThreadingServer(("127.0.0.1", 0), _ProxyHandler)
+        self._server.proxy = self
+        self.port = self._server.server_address[1]
+        threading.Thread(target=self._server.serve_forever, name="filter-proxy", daemon=True).start()
+
+
+_proxy: Optional[FilterProxy] = None
+_proxy_lock = threading.Lock()
+
+
+def get_filter_proxy() -> FilterProxy:
+    global _proxy
+    with _proxy_lock:
+        if _proxy is None:
+            _proxy = FilterProxy()
+        return _proxy
@@ -0,0 +1,293 @@
+# Copyright (c) 2025 Open Brain Institute
+# SPDX-License-Identifier: Apache-2.0
+"""
+Local store of performance samples and statistical regression detection.
+
+Every PerformanceTracker run is appended to a SQLite database keyed by
+environment, browser, page, metric and git SHA. New runs are compared against a
+rolling baseline of the previous runs of the same page, and only changes that are
+both statistically significant and large enough to matter count as regressions,
+so a single noisy sample neither fails the run nor hides a real slowdown.
+
+Several current samples are compared with a rank test. A single sample (the
+default ``--perf-samples=1``) can't reach a small p-value with a rank test over a
+few baseline samples, so it is compared with the spread of the baseline instead:
+its distance from the baseline median in units of the scaled median absolute
+deviation, read as a normal z-score.
+"""
+import logging
+import math
+import random
+import sqlite3
+import statistics
+import subprocess
+import time
+import uuid
+from typing import Any, Dict, List, Optional, Sequence
+
+
+# Scales the median absolute deviation to the standard deviation of a normal distribution
+MAD_TO_SIGMA = 1.4826
+
+# Metrics compared against the baseline, when present in a metric record
+TRACKED_METRICS = (
+    'total_time',
+    'largest_contentful_paint',
+    'total_blocking_time',
+    'route_change_to_interactive',
+)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS samples (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    run_id TEXT NOT NULL,
+    recorded_at REAL NOT NULL,
+    env TEXT NOT NULL,
+    browser TEXT NOT NULL,
+    git_sha TEXT,
+    page TEXT NOT NULL,
+    metric TEXT NOT NULL,
+    value REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_samples_key ON samples (env, browser, page, metric, recorded_at);
+"""
+
+
+def get_git_sha() -> Optional[str]:
+    """Return the short SHA of the checked out commit, or None outside a git checkout."""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, timeout=5, check=True
+        ).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def page_key(metric: Dict[str, Any]) -> str:
+    """Baseline key of a metric record; cold and warm samples of a page have separate baselines."""
+    if metric.get('cache_state'):
+        return f"{metric['page_name']} [{metric['cache_state']}]"
+    return metric['page_name']
+
+
+def percentile(values: Sequence[float], pct: float) -> float:
+    """Linear-interpolated percentile, pct in [0, 100]."""
+    ordered = sorted(values)
+    if len(ordered) == 1:
+        return ordered[0]
+    rank = (len(ordered) - 1) * pct / 100
+    low = math.floor(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+def spread_p_value(value: float, baseline: Sequence[float]) -> float:
+    """
+    One-sided p-value that a single ``value`` is slower than the ``baseline`` distribution.
+
+    Robust z-score against the baseline median and MAD (scaled to a standard
+    deviation), so outliers in the baseline don't widen it.
+    """
+    median = statistics.median(baseline)
+    mad = statistics.median(abs(b - median) for b in baseline) * MAD_TO_SIGMA
+    if mad == 0:
+        return 0.0 if value > median else 1.0
+    return 1 - statistics.NormalDist().cdf((value - median) / mad)
+
+
+def mann_whitney_greater(current: Sequence[float], baseline: Sequence[float]) -> float:
+    """
+    One-sided p-value that ``current`` tends to be larger than ``baseline``.
+
+    Uses the normal approximation with tie correction. With a single current
+    sample the exact value is ``(count(b >= x) + 1) / (n2 + 1)``, which can't get
+    below alpha on a small baseline; ``compare`` uses ``spread_p_value`` then.
+    """
+    n1, n2 = len(current), len(baseline)
+    if n1 == 1:
+        # Probability that a baseline sample is at least as slow as the current one
+        return (sum(1 for b in baseline if b >= current[0]) + 1) / (n2 + 1)
+
+    combined = sorted([(v, 0) for v in current] + [(v, 1) for v in baseline])
+    ranks = [0.0] * len(combined)
+    tie_term = 0
+    i = 0
+    while i < len(combined):
+        j = i
+        while j + 1 < len(combined) and combined[j + 1][0] == combined[i][0]:
+            j += 1
+        for k in range(i, j + 1):
+            ranks[k] = (i + j) / 2 + 1
+        tie_term += (j - i + 1) ** 3 - (j - i + 1)
+        i = j + 1
+
+    rank_sum = sum(r for r, (_, group) in zip(ranks, combined) if group == 0)
+    u = rank_sum - n1 * (n1 + 1) / 2
+    n = n1 + n2
+    variance = n1 * n2 / 12 * ((n + 1) - tie_term / (n * (n - 1)))
+    if variance <= 0:
+        return 1.0
+    z = (u - n1 * n2 / 2 - 0.5) / math.sqrt(variance)  # with continuity correction
+    return 0.5 * math.erfc(z / math.sqrt(2))
+
+
+def bootstrap_median_diff(current: Sequence[float], baseline: Sequence[float],
+                          resamples: int = 2000, confidence: float = 0.95, seed: int = 0) -> tuple:
+    """Bootstrap confidence interval of median(current) - median(baseline)."""
+    rng = random.Random(seed)
+    diffs = sorted(
+        statistics.median(rng.choices(current, k=len(current)))
+        - statistics.median(rng.choices(baseline, k=len(baseline)))
+        for _ in range(resamples)
+    )
+    tail = (1 - confidence) / 2 * 100
+    return percentile(diffs, tail), percentile(diffs, 100 - tail)
+
+
+class PerformanceBaseline:
+    """Append-only store of performance samples with a rolling-baseline regression check."""
+
+    def __init__(self, db_path: str, env: str, browser: str, git_sha: Optional[str] = None,
+                 window: int = 20, min_samples: int = 5, alpha: float = 0.05,
+                 min_change: float = 0.2, logger=None):
+        """
+        Args:
+            db_path: SQLite database file
+            env: Environment the samples belong to (staging, production)
+            browser: Browser the samples were measured with
+            git_sha: Commit under test, defaults to the checked out commit
+            window: Number of previous samples per page/metric forming the baseline
+            min_samples: Baseline size below which no verdict is given
+            alpha: Significance level of the one-sided rank test
+            min_change: Minimum relative increase of the median that counts as a regression
+            logger: Optional logger, falls back to the module logger
+        """
+        self.db_path = db_path
+        self.env = env
+        self.browser = browser
+        self.git_sha = git_sha if git_sha is not None else get_git_sha()
+        self.window = window
+        self.min_samples = min_samples
+        self.alpha = alpha
+        self.min_change = min_change
+        self.logger = logger or logging.getLogger(__name__)
+        # Smallest p-value the rank test can give with two current samples on the smallest baseline
+        if 1 / math.comb(min_samples + 2, 2) >= alpha:
+            raise ValueError(f"min_samples={min_samples} can never reach alpha={alpha}")
+
+        with self._connect() as conn:
+            conn.executescript(SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        # Parallel workers write to the same file; WAL lets readers and a writer coexist
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        return conn
+
+    def record(self, metrics: List[Dict[str, Any]], run_id: Optional[str] = None) -> str:
+        """Store the tracked values of a run's metric records. Returns the run id."""
+        run_id = run_id or uuid.uuid4().hex
+        now = time.time()
+        rows = [
+            (run_id, now, self.env, self.browser, self.git_sha, page_key(m), metric, float(m[metric]))
+            for m in metrics for metric in TRACKED_METRICS
+            if isinstance(m.get(metric), (int, float)) and m.get('page_name')
+        ]
+        with self._connect() as conn:
+            conn.executemany(
+                "INSERT INTO samples (run_id, recorded_at, env, browser, git_sha, page, metric, value) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows
+            )
+        return run_id
+
+    def baseline(self, page: str, metric: str, exclude_run: Optional[str] = None) -> List[float]:
+        """Return the most recent ``window`` samples of a page metric, oldest first."""
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT value FROM samples WHERE env = ? AND browser = ? AND page = ? AND metric = ? "
+                "AND run_id != ? ORDER BY recorded_at DESC LIMIT ?",
+                (self.env, self.browser, page, metric, exclude_run or "", self.window),
+            ).fetchall()
+        return [r[0] for r in reversed(rows)]
+
+    def compare(self, page: str, metric: str, current: Sequence[float],
+                exclude_run: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """
+        Compare current samples of a page metric with its baseline.
+
+        Returns:
+            Comparison dict, or None when the baseline is too small for a verdict
+        """
+        base = self.baseline(page, metric, exclude_run)
+        if len(base) < self.min_samples or not current:
+            return None
+
+        base_median = statistics.median(base)
+        current_median = statistics.median(current)
+        change = (current_median - base_median) / base_median if base_median else 0.0
+        if len(current) == 1:
+            p_value = spread_p_value(current[0], base)
+        else:
+            p_value = mann_whitney_greater(current, base)
+        ci_low, ci_high = bootstrap_median_diff(current, base) if len(current) > 1 else (None, None)
+
+        # Significant, practically relevant, and (with several samples) a shift the bootstrap agrees on
+        regression = p_value < self.alpha and change > self.min_change and (ci_low is None or ci_low > 0)
+        return {
+            'page': page,
+            'metric': metric,
+            'current_median': current_median,
+            'baseline_median': base_median,
+            'baseline_p90': percentile(base, 90),
+            'baseline_samples': len(base),
+            'change': change,
+            'p_value': p_value,
+            'ci_low': ci_low,
+            'ci_high': ci_high,
+            'regression': regression,
+        }
+
+    def evaluate(self, metrics: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Compare a run with the baseline, then add it to the store.
+
+        Metric records of the same page and cache state (repeated samples) are
+        compared as one group.
+
+        Returns:
+            The comparisons flagged as regressions
+        """
+        grouped: Dict[tuple, List[float]] = {}
+        for m in metrics:
+            for metric in TRACKED_METRICS:
+                if isinstance(m.get(metric), (int, float)) and m.get('page_name'):
+                    grouped.setdefault((page_key(m), metric), []).append(float(m[metric]))
+
+        regressions = []
+        for (page, metric), values in grouped.items():
+            result = self.compare(page, metric, values)
+            if result is None:
+                self.logger.info(f"Baseline for {page} / {metric} too small, recording only")
+                continue
+            self.logger.info(
+                f"{page} / {metric}: median {result['current_median']:.0f} vs baseline "
+                f"{result['baseline_median']:.0f} (p90 {result['baseline_p90']:.0f}, "
+                f"{result['change']:+.0%}, p={result['p_value']:.3f})"
+            )
+            if result['regression']:
+                regressions.append(result)
+
+        self.record(metrics)
+        return regressions
+
+    @staticmethod
+    def format_regressions(regressions: List[Dict[str, Any]]) -> str:
+        """Human-readable description of regressions for assertion messages."""
+        lines = ["Significant performance regressions:"]
+        for r in regressions:
+            lines.append(
+                f"  - {r['page']} / {r['metric']}: median {r['current_median']:.0f} vs baseline "
+                f"{r['baseline_median']:.0f} ({r['change']:+.0%}, p={r['p_value']:.3f}, "
+                f"n={r['baseline_samples']})"
+            )
+        return "\n".join(lines)
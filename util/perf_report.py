@@ -0,0 +1,192 @@
+# Copyright (c) 2025 Open Brain Institute
+# SPDX-License-Identifier: Apache-2.0
+"""
+Performance report building and the JSONL sample stream.
+
+PerformanceTracker writes each sample to a JSONL stream as soon as it is captured,
+so a test that fails halfway keeps everything measured up to that point. Every
+line is flushed to the OS immediately (survives a crashed or killed pytest
+process); fsync, which is what survives a machine crash, is batched to keep it
+off the hot path. Compaction turns a stream into the regular JSON report (+ HAR).
+"""
+import json
+import os
+import statistics
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from util.har import write_har
+from util.perf_baseline import percentile
+
+
+# Metrics summarized as distributions when a page is sampled several times
+DISTRIBUTION_METRICS = (
+    'total_time',
+    'dom_content_loaded_time',
+    'request_time',
+    'first_contentful_paint',
+    'largest_contentful_paint',
+    'total_blocking_time',
+    'resource_transfer_size',
+)
+
+
+class JsonlWriter:
+    """Write one JSON record per line with batched fsync."""
+
+    def __init__(self, path: str, fsync_every: int = 10, fsync_interval: float = 5.0):
+        """
+        Args:
+            path: Stream file, truncated when the writer is created
+            fsync_every: fsync after this many records
+            fsync_interval: fsync when this many seconds passed since the last one
+        """
+        self.path = path
+        self.fsync_every = fsync_every
+        self.fsync_interval = fsync_interval
+        self._pending = 0
+        self._last_sync = time.monotonic()
+        self._file = open(path, 'w')
+
+    def write(self, kind: str, data: Dict[str, Any]):
+        """Append a record of the given kind ("metric", "waterfall")."""
+        self._file.write(json.dumps({'kind': kind, 'data': data}) + '\n')
+        self._file.flush()
+        self._pending += 1
+        if self._pending >= self.fsync_every or time.monotonic() - self._last_sync >= self.fsync_interval:
+            self.sync()
+
+    def sync(self):
+        """Force pending records to disk."""
+        if self._file.closed:
+            return
+        os.fsync(self._file.fileno())
+        self._pending = 0
+        self._last_sync = time.monotonic()
+
+    def close(self):
+        if not self._file.closed:
+            self.sync()
+            self._file.close()
+
+
+def read_jsonl(path: str) -> Iterator[Dict[str, Any]]:
+    """
+    Yield the records of a stream file.
+
+    A truncated last line (the writer was killed mid-write) is skipped.
+    """
+    with open(path, 'r') as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                continue
+
+
+def stream_path(report_path: str) -> str:
+    """Path of the JSONL stream belonging to a JSON report."""
+    return str(Path(report_path).with_suffix('.jsonl'))
+
+
+def load_stream(path: str) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """Return the metric records and waterfall pages of a stream file."""
+    metrics, waterfalls = [], []
+    for record in read_jsonl(path):
+        if record.get('kind') == 'metric':
+            metrics.append(record['data'])
+        elif record.get('kind') == 'waterfall':
+            waterfalls.append(record['data'])
+    return metrics, waterfalls
+
+
+def summarize(metrics: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Generate summary statistics from metric records."""
+    if not metrics:
+        return {}
+    
+    total_times = [m['total_time'] for m in metrics if 'total_time' in m]
+    lcp_times = [m['largest_contentful_paint'] for m in metrics if m.get('largest_contentful_paint') is not None]
+    cls_values = [m['cumulative_layout_shift'] for m in metrics if m.get('cumulative_layout_shift') is not None]
+    
+    return {
+        'total_pages_measured': len(metrics),
+        'average_load_time': sum(total_times) / len(total_times) if total_times else 0,
+        'min_load_time': min(total_times) if total_times else 0,
+        'max_load_time': max(total_times) if total_times else 0,
+        'slowest_page': max(metrics, key=lambda x: x.get('total_time', 0))['page_name'],
+        'average_lcp': sum(lcp_times) / len(lcp_times) if lcp_times else None,
+        'max_cls': max(cls_values) if cls_values else None,
+        'total_blocking_time': sum(m.get('total_blocking_time') or 0 for m in metrics),
+        'distributions': summarize_distributions(metrics),
+    }
+
+
+def summarize_distributions(metrics: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """min/median/p95/stddev per page, cache state and metric for pages with several samples."""
+    grouped = {}
+    for m in metrics:
+        if 'sample_index' not in m:
+            continue
+        by_metric = grouped.setdefault(m['page_name'], {}).setdefault(m['cache_state'], {})
+        for key in DISTRIBUTION_METRICS:
+            if isinstance(m.get(key), (int, float)):
+                by_metric.setdefault(key, []).append(m[key])
+
+    return {
+        page: {
+            cache_state: {
+                key: {
+                    'samples': len(values),
+                    'min': min(values),
+                    'median': statistics.median(values),
+                    'p95': round(percentile(values, 95), 1),
+                    'stddev': round(statistics.stdev(values), 1) if len(values) > 1 else 0.0,
+                }
+                for key, values in by_metric.items()
+            }
+            for cache_state, by_metric in states.items()
+        }
+        for page, states in grouped.items()
+    }
+
+
+def build_report(metrics: List[Dict[str, Any]], waterfalls: List[Dict[str, Any]],
+                 filename: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Build the JSON report; with a filename also write it, and the waterfalls as HAR next to it.
+    """
+    report = {
+        'test_run': datetime.now().isoformat(),
+        'metrics': metrics,
+        'summary': summarize(metrics),
+    }
+    if filename is None:
+        return report
+
+    if waterfalls:
+        har_file = str(Path(filename).with_suffix('.har'))
+        write_har(waterfalls, har_file)
+        report['har_file'] = Path(har_file).name
+    tmp_path = f"{filename}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(report, f, indent=2)
+    os.replace(tmp_path, filename)
+    return report
+
+
+def compact_stream(path: str, report_path: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Build the report of a stream file.
+
+    Args:
+        path: JSONL stream
+        report_path: Where to write the JSON report; None only builds it in memory
+    """
+    metrics, waterfalls = load_stream(path)
+    return build_report(metrics, waterfalls, report_path)
@@ -2,76 +2,284 @@
 # SPDX-License-Identifier: Apache-2.0
 """
 Performance tracking utility for measuring page load times and navigation metrics.
+
+Besides Navigation Timing, PerformanceObservers record paint timings, Core Web
+Vitals (LCP, CLS, INP/first input), long tasks and soft navigations, which is
+where the client-side rendering cost of the single-page app shows up.
+Client-side route changes (React link clicks) are timed as soft navigations.
 """
-import json
 import time
+from contextlib import contextmanager
 from datetime import datetime
-from typing import Dict, Any
+from typing import Dict, Any, Optional
+
+from selenium.webdriver.support.wait import WebDriverWait
+
+from util.har import RESOURCE_TIMING_SCRIPT, summarize_waterfall
+from util.perf_report import JsonlWriter, build_report, compact_stream, load_stream, stream_path, summarize
+from util.wait_scripts import INSTALL_DOM_OBSERVER, NETWORK_TRACKER
+
+
+# Installs PerformanceObservers once per document and accumulates entries in
+# window.__obiVitals. Observers use buffered: true, so entries emitted before the
+# install are still seen; on Chrome the script is also registered via CDP.
+WEB_VITALS_OBSERVER = """
+(function () {
+    if (window.__obiVitals || !window.PerformanceObserver) { return; }
+    // The default buffer of 250 resource entries overflows on the data pages
+    if (performance.setResourceTimingBufferSize) { performance.setResourceTimingBufferSize(2000); }
+    var supported = PerformanceObserver.supportedEntryTypes || [];
+    var vitals = window.__obiVitals = {
+        supported: supported, paint: {}, lcp: null, cls: 0, clsWindow: 0, clsWindowStart: 0,
+        clsLast: 0, fid: null, interactions: {}, longTasks: [], softNavigations: []
+    };
+    function observe(type, callback, options) {
+        if (supported.indexOf(type) === -1) { return; }
+        try {
+            new PerformanceObserver(function (list) { list.getEntries().forEach(callback); })
+                .observe(Object.assign({type: type, buffered: true}, options || {}));
+        } catch (e) {}
+    }
+    observe('paint', function (e) { vitals.paint[e.name] = e.startTime; });
+    observe('largest-contentful-paint', function (e) { vitals.lcp = e.renderTime || e.loadTime || e.startTime; });
+    observe('layout-shift', function (e) {
+        if (e.hadRecentInput) { return; }
+        // Session windows: shifts less than 1s apart and at most 5s long
+        if (vitals.clsWindow && e.startTime - vitals.clsLast < 1000 && e.startTime - vitals.clsWindowStart < 5000) {
+            vitals.clsWindow += e.value;
+        } else {
+            vitals.clsWindow = e.value;
+            vitals.clsWindowStart = e.startTime;
+        }
+        vitals.clsLast = e.startTime;
+        vitals.cls = Math.max(vitals.cls, vitals.clsWindow);
+    });
+    observe('first-input', function (e) { vitals.fid = e.processingStart - e.startTime; });
+    observe('event', function (e) {
+        if (!e.interactionId) { return; }
+        vitals.interactions[e.interactionId] = Math.max(vitals.interactions[e.interactionId] || 0, e.duration);
+    }, {durationThreshold: 16});
+    observe('longtask', function (e) { vitals.longTasks.push([e.startTime, e.duration]); });
+    observe('soft-navigation', function (e) {
+        vitals.softNavigations.push({name: e.name, startTime: e.startTime, duration: e.duration});
+    });
+})();
+"""
+
+# Navigation Timing Level 2 (with a fallback to the deprecated performance.timing)
+# plus the values accumulated by WEB_VITALS_OBSERVER. All times are relative to
+# the start of the navigation.
+READ_METRICS_SCRIPT = WEB_VITALS_OBSERVER + """
+var nav = performance.getEntriesByType ? performance.getEntriesByType('navigation')[0] : null;
+var timing;
+if (nav) {
+    timing = {
+        domainLookupStart: nav.domainLookupStart, domainLookupEnd: nav.domainLookupEnd,
+        connectStart: nav.connectStart, connectEnd: nav.connectEnd,
+        requestStart: nav.requestStart, responseStart: nav.responseStart, responseEnd: nav.responseEnd,
+        domLoading: nav.responseEnd, domInteractive: nav.domInteractive,
+        domContentLoadedEventEnd: nav.domContentLoadedEventEnd, domComplete: nav.domComplete,
+        loadEventEnd: nav.loadEventEnd, navigationType: nav.type, redirectCount: nav.redirectCount,
+        transferSize: nav.transferSize
+    };
+} else {
+    var t = window.performance.timing, start = t.navigationStart;
+    timing = {navigationType: window.performance.navigation.type, redirectCount: window.performance.navigation.redirectCount};
+    ['domainLookupStart', 'domainLookupEnd', 'connectStart', 'connectEnd', 'requestStart', 'responseStart',
+     'responseEnd', 'domLoading', 'domInteractive', 'domContentLoadedEventEnd', 'domComplete', 'loadEventEnd'
+    ].forEach(function (k) { timing[k] = t[k] ? t[k] - start : 0; });
+}
+
+var v = window.__obiVitals || {paint: {}, interactions: {}, longTasks: [], softNavigations: [], supported: []};
+var durations = Object.keys(v.interactions).map(function (k) { return v.interactions[k]; })
+    .sort(function (a, b) { return b - a; });
+var fcp = v.paint['first-contentful-paint'];
+var longTaskTime = 0, blockingTime = 0;
+v.longTasks.forEach(function (task) {
+    longTaskTime += task[1];
+    if (fcp === undefined || task[0] >= fcp) { blockingTime += Math.max(0, task[1] - 50); }
+});
+return {
+    timing: timing,
+    vitals: {
+        supported: v.supported,
+        firstPaint: v.paint['first-paint'],
+        firstContentfulPaint: fcp,
+        largestContentfulPaint: v.lcp,
+        cumulativeLayoutShift: v.supported.indexOf('layout-shift') === -1 ? null : v.cls,
+        firstInputDelay: v.fid,
+        // INP: worst interaction, ignoring one outlier per 50 interactions
+        interactionToNextPaint: durations.length
+            ? durations[Math.min(durations.length - 1, Math.floor(durations.length / 50))] : null,
+        longTaskCount: v.supported.indexOf('longtask') === -1 ? null : v.longTasks.length,
+        longTaskTime: longTaskTime,
+        totalBlockingTime: blockingTime,
+        softNavigations: v.softNavigations
+    }
+};
+"""
+
+
+# Records history.pushState/replaceState, popstate and hashchange in window.__obiRoute.
+ROUTE_TRACKER = """
+(function () {
+    if (window.__obiRoute) { return; }
+    var route = window.__obiRoute = {changes: []};
+    function record(kind) { route.changes.push({kind: kind, url: location.href, time: performance.now()}); }
+    ['pushState', 'replaceState'].forEach(function (name) {
+        var original = history[name];
+        history[name] = function () {
+            var result = original.apply(this, arguments);
+            record(name);
+            return result;
+        };
+    });
+    window.addEventListener('popstate', function () { record('popstate'); });
+    window.addEventListener('hashchange', function () { record('hashchange'); });
+})();
+"""
+
+# Marks the start of a soft navigation, right before the triggering click.
+START_SOFT_NAVIGATION = INSTALL_DOM_OBSERVER + NETWORK_TRACKER + ROUTE_TRACKER + WEB_VITALS_OBSERVER + """
+var route = window.__obiRoute;
+route.changes = [];
+route.start = performance.now();
+route.startUrl = location.href;
+route.requestsAtStart = window.__obiNetwork.total;
+route.mutationsAtStart = window.__obiDomObserver.mutations;
+"""
+
+# arguments: quietMs, timeoutMs, requireUrlChange. Resolves once the URL changed
+# (if required), nothing is in flight and neither the DOM nor the network changed
+# for quietMs. The page counts as interactive at its last DOM/network activity.
+# Resolves null when the document was replaced, i.e. it was a hard navigation.
+FINISH_SOFT_NAVIGATION = """
+var quietMs = arguments[0], timeoutMs = arguments[1], requireUrlChange = arguments[2];
+var done = arguments[arguments.length - 1];
+var route = window.__obiRoute;
+if (!route || route.start === undefined) { return done(null); }
+var dom = window.__obiDomObserver, net = window.__obiNetwork, begin = performance.now();
+(function poll() {
+    var now = performance.now();
+    var urlChanged = location.href !== route.startUrl;
+    var lastActivity = Math.max(route.start, dom.lastMutation, net.lastActivity);
+    var settled = (urlChanged || !requireUrlChange) && net.inflight === 0 && now - lastActivity >= quietMs;
+    if (!settled && now - begin < timeoutMs) { return setTimeout(poll, 50); }
+
+    var longTasks = 0, blockingTime = 0;
+    ((window.__obiVitals || {}).longTasks || []).forEach(function (task) {
+        if (task[0] >= route.start) { longTasks++; blockingTime += Math.max(0, task[1] - 50); }
+    });
+    done({
+        settled: settled,
+        start: route.start,
+        url: location.href,
+        urlChanged: urlChanged,
+        routeChange: route.changes.length ? route.changes[0].time - route.start : null,
+        interactive: lastActivity - route.start,
+        historyChanges: route.changes.length,
+        requests: net.total - route.requestsAtStart,
+        mutations: dom.mutations - route.mutationsAtStart,
+        longTasks: longTasks,
+        blockingTime: blockingTime
+    });
+})();
+"""
+
+
+def _ms(value) -> Optional[int]:
+    """Round a DOMHighResTimeStamp to whole milliseconds, keeping missing values as None."""
+    return None if value is None else int(round(value))
 
 
 class PerformanceTracker:
-    """Track and report page performance metrics using Navigation Timing API."""
+    """Track and report page performance metrics using Navigation Timing and PerformanceObserver."""
     
-    def __init__(self, browser, logger):
+    def __init__(self, browser, logger, samples: int = 1, report_path: Optional[str] = None,
+                 keep_in_memory: bool = True, fsync_every: int = 10):
+        """
+        Args:
+            browser: WebDriver instance
+            logger: Logger
+            samples: Default number of cold/warm sample pairs taken by sample_page
+            report_path: JSON report written by save_report. When set, every sample
+                is also streamed to the matching .jsonl file as soon as it is captured
+            keep_in_memory: Keep samples in ``metrics``/``waterfalls``; with False
+                long journeys only hold them in the stream
+            fsync_every: Number of streamed records between fsyncs
+        """
         self.browser = browser
+        self.samples = samples
         self.logger = logger
+        self.report_path = report_path
+        self.keep_in_memory = keep_in_memory or not report_path
         self.metrics = []
+        self.waterfalls = []
+        self._page_count = 0
+        self._stream = JsonlWriter(stream_path(report_path), fsync_every=fsync_every) if report_path else None
+        self._soft_navigation = None
+        self.install_observers()
+
+    def install_observers(self):
+        """Start observing the current document (no-op if already observed)."""
+        try:
+            self.browser.execute_script(WEB_VITALS_OBSERVER)
+        except Exception as e:
+            self.logger.debug(f"Could not install performance observers: {e}")
     
-    def capture_metrics(self, page_name: str) -> Dict[str, Any]:
+    def capture_metrics(self, page_name: str, extra: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """
         Capture performance metrics for the current page.
         
         Args:
             page_name: Identifier for the page being measured
+            extra: Additional fields stored with the metric record
             
         Returns:
             Dictionary containing performance metrics
         """
         try:
-            # Get Navigation Timing API data
-            timing_data = self.browser.execute_script("""
-                var timing = window.performance.timing;
-                var navigation = window.performance.navigation;
-                return {
-                    navigationStart: timing.navigationStart,
-                    domainLookupStart: timing.domainLookupStart,
-                    domainLookupEnd: timing.domainLookupEnd,
-                    connectStart: timing.connectStart,
-                    connectEnd: timing.connectEnd,
-                    requestStart: timing.requestStart,
-                    responseStart: timing.responseStart,
-                    responseEnd: timing.responseEnd,
-                    domLoading: timing.domLoading,
-                    domInteractive: timing.domInteractive,
-                    domContentLoadedEventStart: timing.domContentLoadedEventStart,
-                    domContentLoadedEventEnd: timing.domContentLoadedEventEnd,
-                    domComplete: timing.domComplete,
-                    loadEventStart: timing.loadEventStart,
-                    loadEventEnd: timing.loadEventEnd,
-                    navigationType: navigation.type,
-                    redirectCount: navigation.redirectCount
-                };
-            """)
-            
+            data = self.browser.execute_script(READ_METRICS_SCRIPT)
+            timing_data = data['timing']
+            vitals = data['vitals']
+
             # Calculate meaningful metrics
-            nav_start = timing_data['navigationStart']
             metrics = {
                 'page_name': page_name,
                 'url': self.browser.current_url,
                 'timestamp': datetime.now().isoformat(),
-                'dns_lookup_time': timing_data['domainLookupEnd'] - timing_data['domainLookupStart'],
-                'tcp_connection_time': timing_data['connectEnd'] - timing_data['connectStart'],
-                'request_time': timing_data['responseStart'] - timing_data['requestStart'],
-                'response_time': timing_data['responseEnd'] - timing_data['responseStart'],
-                'dom_processing_time': timing_data['domComplete'] - timing_data['domLoading'],
-                'dom_interactive_time': timing_data['domInteractive'] - nav_start,
-                'dom_content_loaded_time': timing_data['domContentLoadedEventEnd'] - nav_start,
-                'page_load_time': timing_data['loadEventEnd'] - nav_start,
-                'total_time': timing_data['loadEventEnd'] - nav_start,
-                'redirect_count': timing_data['redirectCount']
+                'dns_lookup_time': _ms(timing_data['domainLookupEnd'] - timing_data['domainLookupStart']),
+                'tcp_connection_time': _ms(timing_data['connectEnd'] - timing_data['connectStart']),
+                'request_time': _ms(timing_data['responseStart'] - timing_data['requestStart']),
+                'response_time': _ms(timing_data['responseEnd'] - timing_data['responseStart']),
+                'dom_processing_time': _ms(timing_data['domComplete'] - timing_data['domLoading']),
+                'dom_interactive_time': _ms(timing_data['domInteractive']),
+                'dom_content_loaded_time': _ms(timing_data['domContentLoadedEventEnd']),
+                'page_load_time': _ms(timing_data['loadEventEnd']),
+                'total_time': _ms(timing_data['loadEventEnd']),
+                'redirect_count': timing_data['redirectCount'],
+                'navigation_type': timing_data['navigationType'],
+                # Rendering metrics; None when the browser does not support the entry type
+                'first_paint': _ms(vitals.get('firstPaint')),
+                'first_contentful_paint': _ms(vitals.get('firstContentfulPaint')),
+                'largest_contentful_paint': _ms(vitals.get('largestContentfulPaint')),
+                'cumulative_layout_shift': (round(vitals['cumulativeLayoutShift'], 4)
+                                            if vitals.get('cumulativeLayoutShift') is not None else None),
+                'first_input_delay': _ms(vitals.get('firstInputDelay')),
+                'interaction_to_next_paint': _ms(vitals.get('interactionToNextPaint')),
+                'long_task_count': vitals.get('longTaskCount'),
+                'long_task_time': _ms(vitals.get('longTaskTime')),
+                'total_blocking_time': _ms(vitals.get('totalBlockingTime')),
+                'soft_navigations': [
+                    {'url': nav['name'], 'start_time': _ms(nav['startTime']), 'duration': _ms(nav['duration'])}
+                    for nav in vitals.get('softNavigations') or []
+                ],
             }
+            metrics.update(extra or {})
+            self._capture_waterfall(metrics, on_content_load=metrics['dom_content_loaded_time'],
+                                    on_load=metrics['page_load_time'])
             
-            self.metrics.append(metrics)
+            self.add_metrics(metrics)
             self._log_metrics(metrics)
             return metrics
             
@@ -79,12 +287,194 @@ class PerformanceTracker:
             self.logger.error(f"Failed to capture performance metrics for {page_name}: {e}")
             return {}
     
+    def sample_page(self, page_name: str, url: str, samples: Optional[int] = None,
+                    cold: bool = True, warm: bool = True, timeout: int = 60) -> list:
+        """
+        Load a page several times and record every load as a separate sample.
+
+        Each round clears the HTTP cache and loads the page (cold sample), then
+        reloads it (warm sample). Samples carry ``cache_state`` and ``sample_index``;
+        the report summarizes them as distributions per page and cache state.
+
+        Args:
+            page_name: Identifier for the page being measured
+            url: URL of the page
+            samples: Number of rounds, defaults to the tracker's ``samples``
+            cold: Take a cold-cache sample in each round
+            warm: Take a warm-cache (reload) sample in each round
+            timeout: Maximum time in seconds to wait for each load
+
+        Returns:
+            The metric records of all samples
+        """
+        results = []
+        for index in range(samples or self.samples):
+            if cold:
+                self.clear_http_cache()
+                self.browser.get(url)
+                results.append(self._capture_sample(page_name, 'cold', index, timeout))
+            if warm:
+                if not cold:
+                    self.browser.get(url)
+                else:
+                    self.browser.refresh()
+                results.append(self._capture_sample(page_name, 'warm', index, timeout))
+        return results
+
+    def _capture_sample(self, page_name: str, cache_state: str, index: int, timeout: int) -> Dict[str, Any]:
+        WebDriverWait(self.browser, timeout).until(
+            lambda d: d.execute_script("return document.readyState") == "complete"
+        )
+        metrics = self.capture_metrics(page_name, extra={'cache_state': cache_state, 'sample_index': index})
+        if metrics:
+            if cache_state == 'cold' and metrics.get('cached_resource_count'):
+                self.logger.warning(f"{page_name}: cold sample {index} still served "
+                                    f"{metrics['cached_resource_count']} resources from cache")
+        return metrics
+
+    def clear_http_cache(self):
+        """Empty the browser's HTTP cache so the next load is a cold one."""
+        if hasattr(self.browser, "execute_cdp_cmd"):
+            self.browser.execute_cdp_cmd("Network.clearBrowserCache", {})
+            return
+        try:
+            # Firefox: privileged script in the chrome context (needs -remote-allow-system-access)
+            with self.browser.context(self.browser.CONTEXT_CHROME):
+                self.browser.execute_script("Services.cache2.clear();")
+        except Exception as e:
+            self.logger.warning(f"Could not clear the HTTP cache, cold samples may be warm: {e}")
+
+    def start_soft_navigation(self, page_name: str):
+        """
+        Mark the start of a client-side route change. Call right before the click.
+
+        Args:
+            page_name: Identifier for the route being navigated to
+        """
+        self._soft_navigation = page_name
+        try:
+            self.browser.execute_script(START_SOFT_NAVIGATION)
+        except Exception as e:
+            self.logger.error(f"Failed to start soft navigation timing for {page_name}: {e}")
+
+    def finish_soft_navigation(self, timeout: int = 30, quiet_ms: int = 500,
+                               require_url_change: bool = True) -> Dict[str, Any]:
+        """
+        Wait for the route change to settle and record its timing.
+
+        Args:
+            timeout: Maximum time in seconds to wait for the page to settle
+            quiet_ms: DOM/network quiet period that counts as settled
+            require_url_change: Wait for the URL to change (False for in-page updates)
+
+        Returns:
+            Dictionary containing performance metrics
+        """
+        page_name, self._soft_navigation = self._soft_navigation, None
+        try:
+            self.browser.set_script_timeout(timeout + 5)
+            result = self.browser.execute_async_script(
+                FINISH_SOFT_NAVIGATION, quiet_ms, timeout * 1000, require_url_change
+            )
+            if result is None:
+                # The click replaced the document: record it as a regular page load
+                self.logger.info(f"{page_name} was a full page load, capturing navigation timing")
+                WebDriverWait(self.browser, timeout).until(
+                    lambda d: d.execute_script("return document.readyState") == "complete"
+                )
+                return self.capture_metrics(page_name)
+
+            interactive = _ms(result['interactive'])
+            metrics = {
+                'page_name': page_name,
+                'url': result['url'],
+                'timestamp': datetime.now().isoformat(),
+                'navigation_type': 'soft',
+                'route_change_time': _ms(result['routeChange']),
+                'route_change_to_interactive': interactive,
+                'settled': result['settled'],
+                'request_count': result['requests'],
+                'dom_mutations': result['mutations'],
+                'long_task_count': result['longTasks'],
+                'total_blocking_time': _ms(result['blockingTime']),
+                # No document load for a soft navigation; total_time keeps the summary comparable
+                'total_time': interactive,
+                'page_load_time': interactive,
+                'dns_lookup_time': 0,
+                'tcp_connection_time': 0,
+                'request_time': 0,
+                'response_time': 0,
+                'dom_processing_time': 0,
+                'dom_interactive_time': 0,
+                'dom_content_loaded_time': 0,
+                'redirect_count': 0,
+            }
+            self._capture_waterfall(metrics, since=result['start'])
+            if not result['settled']:
+                self.logger.warning(f"{page_name} did not settle within {timeout}s "
+                                    f"(url changed: {result['urlChanged']})")
+
+            self.add_metrics(metrics)
+            self._log_metrics(metrics)
+            return metrics
+
+        except Exception as e:
+            self.logger.error(f"Failed to capture soft navigation metrics for {page_name}: {e}")
+            return {}
+
+    @contextmanager
+    def soft_navigation(self, page_name: str, timeout: int = 30, quiet_ms: int = 500,
+                        require_url_change: bool = True):
+        """
+        Time the client-side route change triggered inside the block.
+
+        Usage:
+            with perf.soft_navigation("Simulate Config"):
+                page.click_use_model()
+        """
+        self.start_soft_navigation(page_name)
+        yield
+        self.finish_soft_navigation(timeout=timeout, quiet_ms=quiet_ms, require_url_change=require_url_change)
+
+    def _capture_waterfall(self, metrics: Dict[str, Any], since: float = 0, on_content_load=None, on_load=None):
+        """Attach the resource waterfall of the measured page to the metric record and the HAR pages."""
+        try:
+            data = self.browser.execute_script(RESOURCE_TIMING_SCRIPT, since)
+        except Exception as e:
+            self.logger.debug(f"Could not read resource timings for {metrics['page_name']}: {e}")
+            return
+
+        self._page_count += 1
+        page_id = f"page_{self._page_count}"
+        page = {
+            'id': page_id,
+            'title': metrics['page_name'],
+            'time_origin': data['timeOrigin'],
+            'since': since,
+            'on_content_load': on_content_load,
+            'on_load': on_load,
+            'entries': data['entries'],
+        }
+        if self.keep_in_memory:
+            self.waterfalls.append(page)
+        if self._stream:
+            self._stream.write('waterfall', page)
+        metrics['page_ref'] = page_id
+        metrics.update(summarize_waterfall(data['entries']))
+
     def _log_metrics(self, metrics: Dict[str, Any]):
         """Log performance metrics in a readable format."""
         self.logger.info(f"\n{'='*60}")
         self.logger.info(f"Performance Metrics: {metrics['page_name']}")
         self.logger.info(f"{'='*60}")
         self.logger.info(f"URL: {metrics['url']}")
+        if metrics.get('navigation_type') == 'soft':
+            self.logger.info(f"Route Change: {metrics['route_change_time']}ms")
+            self.logger.info(f"Route Change to Interactive: {metrics['route_change_to_interactive']}ms")
+            self.logger.info(f"Requests: {metrics['request_count']}, Long Tasks: {metrics['long_task_count']}, "
+                             f"Total Blocking Time: {metrics['total_blocking_time']}ms")
+            self.logger.info(f"{'='*60}\n")
+            return
         self.logger.info(f"Total Page Load Time: {metrics['total_time']}ms")
         self.logger.info(f"DNS Lookup: {metrics['dns_lookup_time']}ms")
         self.logger.info(f"TCP Connection: {metrics['tcp_connection_time']}ms")
@@ -93,36 +483,46 @@ class PerformanceTracker:
         self.logger.info(f"DOM Processing: {metrics['dom_processing_time']}ms")
         self.logger.info(f"DOM Interactive: {metrics['dom_interactive_time']}ms")
         self.logger.info(f"DOM Content Loaded: {metrics['dom_content_loaded_time']}ms")
+        for label, key, unit in (
+            ("First Contentful Paint", 'first_contentful_paint', 'ms'),
+            ("Largest Contentful Paint", 'largest_contentful_paint', 'ms'),
+            ("Cumulative Layout Shift", 'cumulative_layout_shift', ''),
+            ("Interaction to Next Paint", 'interaction_to_next_paint', 'ms'),
+            ("Total Blocking Time", 'total_blocking_time', 'ms'),
+            ("Long Tasks", 'long_task_count', ''),
+            ("Resources", 'resource_count', ''),
+        ):
+            if metrics.get(key) is not None:
+                self.logger.info(f"{label}: {metrics[key]}{unit}")
         self.logger.info(f"{'='*60}\n")
     
-    def save_report(self, filename: str = "performance_report.json"):
-        """Save all collected metrics to a JSON file."""
+    def add_metrics(self, metrics: Dict[str, Any]):
+        """Record a metric record: keep it in memory and append it to the stream."""
+        if self.keep_in_memory:
+            self.metrics.append(metrics)
+        if self._stream:
+            self._stream.write('metric', metrics)
+
+    def save_report(self, filename: Optional[str] = None):
+        """
+        Save all collected metrics to a JSON file, and the resource waterfalls next to it as HAR.
+
+        When streaming, the stream is closed and compacted into the report.
+        """
+        filename = filename or self.report_path or "performance_report.json"
         try:
-            with open(filename, 'w') as f:
-                json.dump({
-                    'test_run': datetime.now().isoformat(),
-                    'metrics': self.metrics,
-                    'summary': self._generate_summary()
-                }, f, indent=2)
+            if self._stream:
+                self._stream.close()
+                compact_stream(self._stream.path, filename)
+            else:
+                build_report(self.metrics, self.waterfalls, filename)
             self.logger.info(f"Performance report saved to {filename}")
         except Exception as e:
             self.logger.error(f"Failed to save performance report: {e}")
-    
-    def _generate_summary(self) -> Dict[str, Any]:
-        """Generate summary statistics from collected metrics."""
-        if not self.metrics:
-            return {}
-        
-        total_times = [m['total_time'] for m in self.metrics if 'total_time' in m]
-        
-        return {
-            'total_pages_measured': len(self.metrics),
-            'average_load_time': sum(total_times) / len(total_times) if total_times else 0,
-            'min_load_time': min(total_times) if total_times else 0,
-            'max_load_time': max(total_times) if total_times else 0,
-            'slowest_page': max(self.metrics, key=lambda x: x.get('total_time', 0))['page_name'] if self.metrics else None
-        }
-    
+
     def get_summary(self) -> Dict[str, Any]:
         """Get summary statistics without saving to file."""
-        return self._generate_summary()
+        if self.keep_in_memory or not self._stream:
+            return summarize(self.metrics)
+        self._stream.sync()
+        return summarize(load_stream(self._stream.path)[0])
@@ -0,0 +1,267 @@
+# Copyright (c) 2025 Open Brain Institute
+# SPDX-License-Identifier: Apache-2.0
+"""
+Record/replay stand-in server for the OBI app (``--env=local``).
+
+The browser talks to a reverse proxy on localhost instead of the real site.
+In record mode the proxy forwards every request to the upstream environment and
+stores the response in a cassette directory; in replay mode it answers from the
+cassettes only, so a run needs no network and is deterministic.
+
+The upstream origin is rewritten to the local one in response bodies, Location
+headers and cookies, and back in request URLs, headers and bodies, so redirects
+and absolute URLs (including the OIDC redirect_uri) stay on the proxy. Only
+the upstream origin is proxied: with the production upstream the login realm is
+on the same host, the staging realm on another host is not.
+
+A cassette entry is keyed by method, path, query (minus cache-busting
+parameters), whether it is a React Server Components request, and a hash of the
+request body. Bodies are stored once per content hash. Cassettes hold session
+cookies and API responses of the recording account: keep them out of git.
+"""
+import atexit
+import hashlib
+import json
+import logging
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl, quote, urlencode, urlsplit
+
+import requests
+
+
+# Parameters whose value changes on every request without changing the response
+IGNORED_QUERY_PARAMS = {"_rsc", "_", "t", "timestamp"}
+# Not forwarded in either direction
+HOP_BY_HOP_HEADERS = {
+    "connection", "keep-alive", "proxy-authenticate", "proxy-authorization", "te", "trailers",
+    "transfer-encoding", "upgrade", "host", "content-length", "accept-encoding",
+}
+# Dropped from responses: bodies are stored decoded, and the local origin is plain http
+DROPPED_RESPONSE_HEADERS = HOP_BY_HOP_HEADERS | {
+    "content-encoding", "strict-transport-security", "alt-svc",
+    "content-security-policy", "content-security-policy-report-only",
+}
+TEXT_TYPES = ("text/", "json", "javascript", "xml", "x-component")
+
+logger = logging.getLogger(__name__)
+
+
+def cassette_key(method: str, path: str, query: str, rsc: bool, body: bytes) -> str:
+    """Stable key of a request."""
+    params = sorted((k, v) for k, v in parse_qsl(query, keep_blank_values=True) if k not in IGNORED_QUERY_PARAMS)
+    parts = [method.upper(), path, urlencode(params), "rsc" if rsc else "", hashlib.sha256(body).hexdigest()]
+    return hashlib.sha256("\n".join(parts).encode("utf-8")).hexdigest()[:32]
+
+
+class OriginRewriter:
+    """Replace one origin by another in plain, URL-encoded and JSON-escaped form."""
+
+    def __init__(self, source: str, target: str):
+        self.pairs = list(zip(self._forms(source), self._forms(target)))
+
+    @staticmethod
+    def _forms(origin: str) -> Tuple[str, str, str]:
+        return origin, quote(origin, safe=""), origin.replace("/", "\\/")
+
+    def text(self, value: str) -> str:
+        for old, new in self.pairs:
+            value = value.replace(old, new)
+        return value
+
+    def body(self, data: bytes) -> bytes:
+        for old, new in self.pairs:
+            data = data.replace(old.encode("utf-8"), new.encode("utf-8"))
+        return data
+
+
+def has_cassettes(directory: str) -> bool:
+    """Whether a cassette directory holds at least one recorded response."""
+    try:
+        return any(name.endswith(".json") for name in os.listdir(directory))
+    except OSError:
+        return False
+
+
+class CassetteStore:
+    """Recorded responses on disk."""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self.bodies_dir = os.path.join(directory, "bodies")
+        os.makedirs(self.bodies_dir, exist_ok=True)
+
+    def _entry_path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.json")
+
+    @staticmethod
+    def _write(path: str, data: bytes):
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+    def save(self, key: str, method: str, url: str, status: int, headers: List[Tuple[str, str]], body: bytes):
+        body_hash = hashlib.sha256(body).hexdigest()
+        body_path = os.path.join(self.bodies_dir, body_hash)
+        if not os.path.exists(body_path):
+            self._write(body_path, body)
+        entry = {"method": method, "url": url, "status": status, "headers": headers, "body": body_hash}
+        self._write(self._entry_path(key), json.dumps(entry, indent=1).encode("utf-8"))
+
+    def load(self, key: str) -> Optional[Tuple[int, List[Tuple[str, str]], bytes]]:
+        try:
+            with open(self._entry_path(key), "r") as f:
+                entry = json.load(f)
+            with open(os.path.join(self.bodies_dir, entry["body"]), "rb") as f:
+                body = f.read()
+        except (OSError, ValueError, KeyError):
+            return None
+        return entry["status"], [tuple(h) for h in entry["headers"]], body
+
+
+class ReplayProxy:
+    """Local reverse proxy recording from, or replaying, one upstream origin."""
+
+    def __init__(self, upstream: str, cassette_dir: str, mode: str = "replay", port: int = 0):
+        """
+        Args:
+            upstream: Origin of the real app, e.g. https://www.openbraininstitute.org
+            cassette_dir: Directory of the recorded responses
+            mode: "record" (forward and store) or "replay" (serve stored responses only)
+            port: Local port, 0 for any free port
+        """
+        if mode not in ("record", "replay"):
+            raise ValueError(f"Invalid replay mode: {mode}")
+        self.upstream = upstream.rstrip("/")
+        self.mode = mode
+        self.store = CassetteStore(cassette_dir)
+        self.stats: Dict[str, int] = {"hits": 0, "misses": 0, "recorded": 0}
+        self._session = requests.Session()
+        self._server = ThreadingHTTPServer(("127.0.0.1", port), self._handler_class())
+        self._server.daemon_threads = True
+        # "localhost" rather than the IP: browsers treat it as a secure context
+        self.base_url = f"http://localhost:{self._server.server_address[1]}"
+        self._to_upstream = OriginRewriter(self.base_url, self.upstream)
+        self._to_local = OriginRewriter(self.upstream, self.base_url)
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> "ReplayProxy":
+        self._thread = threading.Thread(target=self._server.serve_forever, name="replay-proxy", daemon=True)
+        self._thread.start()
+        logger.info(f"Replay proxy ({self.mode}) for {self.upstream} on {self.base_url}")
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+        logger.info(f"Replay proxy stats: {self.stats}")
+
+    # ── request handling ─────────────────────────────────────────────────
+
+    def _handler_class(self):
+        proxy = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def _handle(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                body = self.rfile.read(length) if length else b""
+                status, headers, payload = proxy.handle(self.command, self.path, list(self.headers.items()), body)
+                self.send_response(status)
+                for name, value in headers:
+                    self.send_header(name, value)
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                if self.command != "HEAD":
+                    self.wfile.write(payload)
+
+            do_GET = do_POST = do_PUT = do_PATCH = do_DELETE = do_OPTIONS = do_HEAD = _handle
+
+            def log_message(self, format, *args):
+                logger.debug(format % args)
+
+        return Handler
+
+    def handle(self, method: str, path: str, headers: List[Tuple[str, str]],
+               body: bytes) -> Tuple[int, List[Tuple[str, str]], bytes]:
+        """Answer one request, from the cassettes or from upstream."""
+        split = urlsplit(path)
+        request_path = self._to_upstream.text(split.path)
+        query = self._to_upstream.text(split.query)
+        body = self._to_upstream.body(body)
+        rsc = any(name.lower() == "rsc" for name, _ in headers)
+        key = cassette_key(method, request_path, query, rsc, body)
+
+        recorded = self.store.load(key)
+        if recorded is not None and self.mode == "replay":
+            self.stats["hits"] += 1
+        elif self.mode == "replay":
+            self.stats["misses"] += 1
+            logger.warning(f"Replay miss: {method} {path}")
+            return 404, [("Content-Type", "text/plain"), ("X-Replay-Miss", key)], b"Not recorded"
+        else:
+            try:
+                recorded = self._forward(method, request_path, query, headers, body)
+            except requests.RequestException as e:
+                logger.warning(f"Upstream request failed: {method} {path}: {e}")
+                return 502, [("Content-Type", "text/plain")], str(e).encode("utf-8")
+            self.store.save(key, method, f"{request_path}?{query}" if query else request_path, *recorded)
+            self.stats["recorded"] += 1
+
+        status, response_headers, payload = recorded
+        return status, self._localize_headers(response_headers), self._localize_body(response_headers, payload)
+
+    def _forward(self, method: str, path: str, query: str, headers: List[Tuple[str, str]],
+                 body: bytes) -> Tuple[int, List[Tuple[str, str]], bytes]:
+        url = f"{self.upstream}{path}" + (f"?{query}" if query else "")
+        forward_headers = {
+            name: self._to_upstream.text(value)
+            for name, value in headers if name.lower() not in HOP_BY_HOP_HEADERS
+        }
+        response = self._session.request(
+            method, url, headers=forward_headers, data=body or None, allow_redirects=False, timeout=120
+        )
+        # requests decodes gzip/br, so the stored body is plain and content-encoding is dropped
+        response_headers = [
+            (name, value) for name, value in response.raw.headers.items()
+            if name.lower() not in DROPPED_RESPONSE_HEADERS
+        ]
+        return response.status_code, response_headers, response.content
+
+    def _localize_headers(self, headers: List[Tuple[str, str]]) -> List[Tuple[str, str]]:
+        localized = []
+        for name, value in headers:
+            lower = name.lower()
+            if lower in DROPPED_RESPONSE_HEADERS:
+                continue
+            if lower == "location":
+                value = self._to_local.text(value)
+            elif lower == "set-cookie":
+                # Browsers accept Secure cookies on http://localhost, but not a foreign Domain
+                value = ";".join(a for a in value.split(";") if a.strip().lower().split("=")[0] != "domain")
+            localized.append((name, value))
+        return localized
+
+    def _localize_body(self, headers: List[Tuple[str, str]], body: bytes) -> bytes:
+        content_type = next((v for n, v in headers if n.lower() == "content-type"), "")
+        if any(t in content_type for t in TEXT_TYPES):
+            return self._to_local.body(body)
+        return body
+
+
+_proxy: Optional[ReplayProxy] = None
+_proxy_lock = threading.Lock()
+
+
+def get_replay_proxy(upstream: str, cassette_dir: str, mode: str = "replay", port: int = 0) -> ReplayProxy:
+    """Return the proxy of this process, starting it on first use; it is stopped at exit."""
+    global _proxy
+    with _proxy_lock:
+        if _proxy is None:
+            _proxy = ReplayProxy(upstream, cassette_dir, mode, port).start()
+            atexit.register(_proxy.stop)
+        return _proxy
@@ -0,0 +1,169 @@
+# Copyright (c) 2025 Open Brain Institute
+# SPDX-License-Identifier: Apache-2.0
+"""
+Failure artifacts off the hot path.
+
+A screenshot is taken with ``get_screenshot_as_png`` (no file round trip) and
+handed to a background thread that compresses it to WebP, skips it when it is a
+perceptual duplicate of a screenshot already stored, and writes it to a
+content-addressed store. The caller gets the final file path immediately, so the
+HTML report can reference the file instead of inlining base64. Page sources are
+stored the same way, without the image processing. util.artifacts decides where
+the store lives and keeps the index of what was stored for which test.
+
+Files are named after the SHA-256 of their source bytes, which makes writes from
+parallel workers idempotent. A perceptual duplicate is hard-linked to the file
+it duplicates instead of being encoded again.
+"""
+import base64
+import hashlib
+import io
+import logging
+import os
+import queue
+import threading
+from typing import Dict, Optional
+
+from PIL import Image
+
+
+THUMBNAIL_WIDTH = 304
+
+logger = logging.getLogger(__name__)
+
+
+def dhash(image: Image.Image, hash_size: int = 16) -> int:
+    """Difference hash: one bit per horizontally adjacent pixel pair of a downscaled grayscale image."""
+    small = image.convert("L").resize((hash_size + 1, hash_size), Image.BILINEAR)
+    pixels = list(small.getdata())
+    bits = 0
+    for row in range(hash_size):
+        offset = row * (hash_size + 1)
+        for col in range(hash_size):
+            bits = (bits << 1) | (pixels[offset + col] > pixels[offset + col + 1])
+    return bits
+
+
+class ArtifactPipeline:
+    """Background writer of screenshots and page sources into a content-addressed store."""
+
+    def __init__(self, store_dir: str, image_format: str = "webp", quality: int = 80,
+                 dedup_distance: int = 2):
+        """
+        Args:
+            store_dir: Directory of the content-addressed files
+            image_format: "webp", or "png" for optimized PNG
+            quality: WebP quality
+            dedup_distance: Maximum differing dHash bits (of 256) for two screenshots to be duplicates
+        """
+        self.store_dir = store_dir
+        self.image_format = image_format
+        self.quality = quality
+        self.dedup_distance = dedup_distance
+        self._hashes: Dict[int, str] = {}
+        self._queue: "queue.Queue" = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="artifact-pipeline", daemon=True)
+        self._thread.start()
+        os.makedirs(store_dir, exist_ok=True)
+
+    # ── producers ────────────────────────────────────────────────────────
+
+    def _path(self, data: bytes, extension: str) -> str:
+        return os.path.join(self.store_dir, f"{hashlib.sha256(data).hexdigest()[:20]}.{extension}")
+
+    def submit_screenshot(self, png: bytes) -> str:
+        """Queue a PNG screenshot; returns the path it will be stored at."""
+        path = self._path(png, self.image_format)
+        self._queue.put(("image", png, path))
+        return path
+
+    def submit_text(self, text: str, extension: str = "html") -> str:
+        """Queue a text artifact such as a page source; returns the path it will be stored at."""
+        data = text.encode("utf-8")
+        path = self._path(data, extension)
+        self._queue.put(("raw", data, path))
+        return path
+
+    # ── worker ───────────────────────────────────────────────────────────
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            try:
+                if item is None:
+                    return
+                kind, data, path = item
+                if not os.path.exists(path):
+                    if kind == "image":
+                        self._store_image(data, path)
+                    else:
+                        self._write(path, data)
+            except Exception as e:
+                logger.warning(f"Could not store artifact: {e}")
+            finally:
+                self._queue.task_done()
+
+    def _store_image(self, png: bytes, path: str):
+        image = Image.open(io.BytesIO(png))
+        image.load()
+        fingerprint = dhash(image)
+        for known, known_path in self._hashes.items():
+            if bin(known ^ fingerprint).count("1") <= self.dedup_distance and os.path.exists(known_path):
+                try:
+                    os.link(known_path, path)
+                    return
+                except FileExistsError:
+                    return
+                except OSError:
+                    break  # No hard links on this filesystem, store a copy
+
+        buffer = io.BytesIO()
+        if self.image_format == "webp":
+            image.save(buffer, format="WEBP", quality=self.quality, method=4)
+        else:
+            image.save(buffer, format="PNG", optimize=True)
+        self._write(path, buffer.getvalue())
+        self._hashes[fingerprint] = path
+
+    @staticmethod
+    def _write(path: str, data: bytes):
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+    # ── lifecycle ────────────────────────────────────────────────────────
+
+    def flush(self):
+        """Block until every queued artifact is written."""
+        self._queue.join()
+
+    def close(self):
+        """Write the remaining artifacts and stop the worker thread."""
+        if self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join()
+
+
+def thumbnail_data_uri(png: bytes, width: int = THUMBNAIL_WIDTH) -> str:
+    """Small JPEG of a screenshot as a data URI, a few KB to embed in a self-contained report."""
+    image = Image.open(io.BytesIO(png)).convert("RGB")
+    image.thumbnail((width, width * image.height // max(image.width, 1)))
+    buffer = io.BytesIO()
+    image.save(buffer, format="JPEG", quality=70)
+    return "data:image/jpeg;base64," + base64.b64encode(buffer.getvalue()).decode("ascii")
+
+
+def report_html(path: str, report_dir: Optional[str], png: Optional[bytes] = None) -> str:
+    """
+    Thumbnail linking to a stored screenshot, with a path relative to the HTML report.
+
+    With ``png`` (for --self-contained-html) the thumbnail is embedded, so the report
+    shows it on its own; only the full-size image stays an external file.
+    """
+    href = os.path.relpath(path, report_dir) if report_dir else path
+    src = thumbnail_data_uri(png) if png else href
+    return (
+        f'<div><a href="{href}" target="_blank"><img src="{src}" loading="lazy" '
+        f'style="width:{THUMBNAIL_WIDTH}px;display:block;margin-top:8px;" /></a></div>'
+    )
@@ -0,0 +1,204 @@
+# Copyright (c) 2025 Open Brain Institute
+# SPDX-License-Identifier: Apache-2.0
+"""
+Chrome trace-event export of a whole test session.
+
+The SessionTracer plugin (``--session-trace``) records pytest phases, fixture
+setup, page-object methods, waits and sleeps and WebDriver commands as trace
+events. Each xdist worker is one process in the trace with a track per kind of
+event; workers stream their events to ``trace-<worker>.jsonl`` and the
+controller merges them into ``session_trace.json`` at the end of the session,
+which can be opened in https://ui.perfetto.dev or chrome://tracing.
+"""
+import glob
+import json
+import os
+import time
+from typing import Any, Dict, List
+
+import pytest
+
+from util.instrumentation import add_listener, remove_listener
+
+
+# Track (thread) ids within a worker's process
+TRACKS = {
+    1: "pytest",
+    2: "fixtures",
+    3: "page objects",
+    4: "waits & sleeps",
+    5: "webdriver",
+}
+PYTEST, FIXTURES, PAGES, WAITS, WEBDRIVER = TRACKS
+
+MERGED_FILE = "session_trace.json"
+
+
+def worker_pid(worker_id: str) -> int:
+    """Trace process id of an xdist worker: gw0 -> 1, gw1 -> 2, serial run -> 0."""
+    if worker_id.startswith("gw") and worker_id[2:].isdigit():
+        return int(worker_id[2:]) + 1
+    return 0
+
+
+def merge_traces(output_dir: str) -> str:
+    """Merge the per-worker event streams in ``output_dir`` into one trace file."""
+    events: List[Dict[str, Any]] = []
+    for path in sorted(glob.glob(os.path.join(output_dir, "trace-*.jsonl"))):
+        with open(path, "r") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    events.append(json.loads(line))
+                except json.JSONDecodeError:
+                    continue  # A worker that crashed may have left half a line
+
+    merged_path = os.path.join(output_dir, MERGED_FILE)
+    tmp_path = f"{merged_path}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+    os.replace(tmp_path, merged_path)
+    return merged_path
+
+
+class SessionTracer:
+    """pytest plugin writing the trace events of this process."""
+
+    def __init__(self, output_dir: str, worker_id: str, is_controller: bool):
+        """
+        Args:
+            output_dir: Directory of the per-worker streams and the merged trace
+            worker_id: xdist worker id, or "master" for a serial run
+            is_controller: Whether this process merges the streams at the end
+        """
+        self.output_dir = output_dir
+        self.worker_id = worker_id
+        self.is_controller = is_controller
+        self.pid = worker_pid(worker_id)
+        # Listener timestamps come from perf_counter; wall-clock time aligns the workers
+        self._epoch_offset = time.time() - time.perf_counter()
+        self._events: List[Dict[str, Any]] = []
+        self._file = None
+        self._recording = False
+
+        os.makedirs(output_dir, exist_ok=True)
+        if is_controller:
+            for path in glob.glob(os.path.join(output_dir, "trace-*.jsonl")):
+                os.remove(path)
+
+    # ── events ───────────────────────────────────────────────────────────
+
+    def _ts(self, perf_time: float) -> int:
+        return round((perf_time + self._epoch_offset) * 1e6)
+
+    def _complete(self, tid: int, name: str, start: float, duration: float, args: Dict[str, Any] = None):
+        event = {
+            "name": name,
+            "cat": TRACKS[tid],
+            "ph": "X",
+            "ts": self._ts(start),
+            "dur": round(duration * 1e6),
+            "pid": self.pid,
+            "tid": tid,
+        }
+        if args:
+            event["args"] = args
+        self._events.append(event)
+
+    def _metadata(self) -> List[Dict[str, Any]]:
+        events = [
+            {"name": "process_name", "ph": "M", "pid": self.pid, "tid": 0, "args": {"name": self.worker_id}},
+            {"name": "process_sort_index", "ph": "M", "pid": self.pid, "tid": 0, "args": {"sort_index": self.pid}},
+        ]
+        for tid, name in TRACKS.items():
+            events.append({"name": "thread_name", "ph": "M", "pid": self.pid, "tid": tid, "args": {"name": name}})
+            events.append({"name": "thread_sort_index", "ph": "M", "pid": self.pid, "tid": tid,
+                           "args": {"sort_index": tid}})
+        return events
+
+    def flush(self):
+        """Append the buffered events to this worker's stream."""
+        if not self._recording:
+            return
+        if self._file is None:
+            path = os.path.join(self.output_dir, f"trace-{self.worker_id}.jsonl")
+            self._file = open(path, "w")
+            self._events[:0] = self._metadata()
+        for event in self._events:
+            self._file.write(json.dumps(event) + "\n")
+        self._file.flush()
+        self._events = []
+
+    def _on_command(self, command, params, start, duration, in_wait):
+        self._complete(WEBDRIVER, command, start, duration)
+
+    def _on_sleep(self, seconds, start, duration, in_wait):
+        # Polling sleeps of a WebDriverWait are covered by the wait event
+        if not in_wait:
+            self._complete(WAITS, f"sleep({seconds})", start, duration)
+
+    def _on_wait(self, method, start, duration):
+        self._complete(WAITS, f"WebDriverWait.{method}", start, duration)
+
+    def _on_step(self, name, start, duration, error):
+        self._complete(PAGES, name, start, duration, {"error": error} if error else None)
+
+    # ── pytest hooks ─────────────────────────────────────────────────────
+
+    def pytest_sessionstart(self, session):
+        if self.is_controller and getattr(session.config.option, "numprocesses", None):
+            return  # Under xdist the controller runs no tests, it only merges
+        self._recording = True
+        add_listener("command", self._on_command)
+        add_listener("sleep", self._on_sleep)
+        add_listener("wait", self._on_wait)
+        add_listener("step", self._on_step)
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_protocol(self, item, nextitem):
+        start = time.perf_counter()
+        yield
+        self._complete(PYTEST, item.nodeid, start, time.perf_counter() - start)
+        self.flush()
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_setup(self, item):
+        yield from self._phase("setup", item)
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_call(self, item):
+        yield from self._phase("call", item)
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_teardown(self, item, nextitem):
+        yield from self._phase("teardown", item)
+
+    def _phase(self, phase: str, item):
+        start = time.perf_counter()
+        outcome = yield
+        args = {"test": item.nodeid}
+        if outcome.excinfo is not None:
+            args["error"] = outcome.excinfo[0].__name__
+        self._complete(PYTEST, phase, start, time.perf_counter() - start, args)
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_fixture_setup(self, fixturedef, request):
+        start = time.perf_counter()
+        yield
+        self._complete(FIXTURES, fixturedef.argname, start, time.perf_counter() - start,
+                       {"scope": fixturedef.scope})
+
+    @pytest.hookimpl(trylast=True)
+    def pytest_sessionfinish(self, session):
+        if self._recording:
+            remove_listener("command", self._on_command)
+            remove_listener("sleep", self._on_sleep)
+            remove_listener("wait", self._on_wait)
+            remove_listener("step", self._on_step)
+            self.flush()
+            self._file.close()
+        if self.is_controller:
+            merged_path = merge_traces(self.output_dir)
+            print(f"\nSession trace saved to: {merged_path}")
@@ -0,0 +1,166 @@
+# Copyright (c) 2025 Open Brain Institute
+# SPDX-License-Identifier: Apache-2.0
+"""
+Sleep budget accounting.
+
+The SleepBudget plugin (``--sleep-report`` / ``--sleep-budget``) counts every
+``time.sleep`` issued directly from pages/ or tests/ and attributes it to its
+call site and page class. Sleeps inside WebDriverWait polling come from
+Selenium and are not counted. The totals per test travel back to the xdist
+controller in the teardown report, which prints a ranked list of call sites,
+page classes and tests and writes it to JSON. A per-test budget either warns
+or fails the test when exceeded.
+"""
+import json
+import os
+import sys
+from typing import Any, Dict, List, Optional
+
+import pytest
+
+from util.instrumentation import add_listener, remove_listener
+
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir))
+SOURCE_DIRS = tuple(os.path.join(PROJECT_ROOT, d) + os.sep for d in ("pages", "tests"))
+# Frames between the sleep call and the listener
+INTERNAL_FILES = {
+    os.path.join(PROJECT_ROOT, "util", "instrumentation.py"),
+    os.path.abspath(__file__),
+}
+USER_PROPERTY = "sleep_budget"
+
+
+def find_sleep_caller():
+    """Return ``(call_site, page_class)`` of the code that called time.sleep, or None if not ours."""
+    frame = sys._getframe(1)
+    while frame is not None and frame.f_code.co_filename in INTERNAL_FILES:
+        frame = frame.f_back
+    if frame is None or not frame.f_code.co_filename.startswith(SOURCE_DIRS):
+        return None
+
+    filename = frame.f_code.co_filename
+    site = f"{os.path.relpath(filename, PROJECT_ROOT)}:{frame.f_lineno} ({frame.f_code.co_name})"
+    owner = frame.f_locals.get("self")
+    if owner is not None and filename.startswith(SOURCE_DIRS[0]):
+        page_class = type(owner).__name__
+    else:
+        page_class = "<test code>"
+    return site, page_class
+
+
+class SleepBudget:
+    """pytest plugin accounting for the sleeps of each test."""
+
+    def __init__(self, budget: Optional[float] = None, fail: bool = False, top: int = 15,
+                 output_path: Optional[str] = None):
+        """
+        Args:
+            budget: Maximum seconds of sleep per test, None to only report
+            fail: Fail tests over budget instead of warning
+            top: Number of entries per ranking in the terminal summary
+            output_path: JSON file for the full report (written by the controller)
+        """
+        self.budget = budget
+        self.fail = fail
+        self.top = top
+        self.output_path = output_path
+        self._current: Optional[Dict[str, Any]] = None
+        self.results: Dict[str, Dict[str, Any]] = {}
+
+    def _on_sleep(self, seconds, start, duration, in_wait):
+        if self._current is None or in_wait:
+            return
+        caller = find_sleep_caller()
+        if caller is None:
+            return
+        site, page_class = caller
+        self._current["total"] += duration
+        entry = self._current["sites"].setdefault(site, {"page_class": page_class, "count": 0, "seconds": 0.0})
+        entry["count"] += 1
+        entry["seconds"] += duration
+
+    # ── pytest hooks ─────────────────────────────────────────────────────
+
+    def pytest_sessionstart(self, session):
+        add_listener("sleep", self._on_sleep)
+
+    def pytest_runtest_logstart(self, nodeid, location):
+        self._current = {"total": 0.0, "sites": {}}
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_makereport(self, item, call):
+        if call.when == "teardown" and self._current is not None:
+            # user_properties are sent to the xdist controller with the report
+            item.user_properties.append((USER_PROPERTY, self._current))
+        outcome = yield
+        report = outcome.get_result()
+        if call.when != "call" or self.budget is None or self._current is None:
+            return
+        total = self._current["total"]
+        if total <= self.budget:
+            return
+        message = f"Slept {total:.1f}s, over the sleep budget of {self.budget:.1f}s"
+        if self.fail and report.passed:
+            report.outcome = "failed"
+            report.longrepr = message
+        else:
+            item.warn(pytest.PytestWarning(message))
+
+    def pytest_runtest_logreport(self, report):
+        if report.when != "teardown":
+            return
+        for name, value in report.user_properties:
+            if name == USER_PROPERTY:
+                self.results[report.nodeid] = value
+
+    def pytest_sessionfinish(self, session):
+        remove_listener("sleep", self._on_sleep)
+        if self.output_path and not hasattr(session.config, "workerinput") and self.results:
+            os.makedirs(os.path.dirname(self.output_path), exist_ok=True)
+            with open(self.output_path, "w") as f:
+                json.dump(self.summary(top=None), f, indent=2)
+
+    def pytest_terminal_summary(self, terminalreporter):
+        if not self.results:
+            return
+        summary = self.summary(self.top)
+        tr = terminalreporter
+        tr.write_sep("=", f"SLEEP BUDGET: {summary['total']:.1f}s slept in {len(self.results)} tests")
+        for title, key in (("Call sites", "call_sites"), ("Page classes", "page_classes"), ("Tests", "tests")):
+            tr.write_line(f"{title}:")
+            for entry in summary[key]:
+                tr.write_line(f"  {entry['seconds']:>8.1f}s  {entry['count']:>5}x  {entry['name']}")
+        if self.output_path:
+            tr.write_line(f"Full sleep report: {self.output_path}")
+
+    # ── aggregation ──────────────────────────────────────────────────────
+
+    def summary(self, top: Optional[int] = 15) -> Dict[str, Any]:
+        """Sleep totals per call site, page class and test, largest first."""
+        sites: Dict[str, Dict[str, Any]] = {}
+        classes: Dict[str, Dict[str, Any]] = {}
+        tests: Dict[str, Dict[str, Any]] = {}
+        for nodeid, result in self.results.items():
+            test = tests.setdefault(nodeid, {"name": nodeid, "count": 0, "seconds": 0.0})
+            for site, entry in result["sites"].items():
+                for name, bucket in ((site, sites), (entry["page_class"], classes)):
+                    total = bucket.setdefault(name, {"name": name, "count": 0, "seconds": 0.0})
+                    total["count"] += entry["count"]
+                    total["seconds"] += entry["seconds"]
+                test["count"] += entry["count"]
+                test["seconds"] += entry["seconds"]
+
+        def rank(bucket) -> List[Dict[str, Any]]:
+            ranked = sorted(bucket.values(), key=lambda e: e["seconds"], reverse=True)
+            for entry in ranked:
+                entry["seconds"] = round(entry["seconds"], 3)
+            return ranked[:top] if top else ranked
+
+        return {
+            "total": round(sum(r["total"] for r in self.results.values()), 3),
+            "budget": self.budget,
+            "call_sites": rank(sites),
+            "page_classes": rank(classes),
+            "tests": rank(tests),
+        }
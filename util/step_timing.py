@@ -0,0 +1,202 @@
+# Copyright (c) 2025 Open Brain Institute
+# SPDX-License-Identifier: Apache-2.0
+"""
+Opt-in per-step timing of page-object methods.
+
+Public methods of CustomBasePage and its subclasses are wrapped when the class
+is defined. The wrapper costs two lookups until a StepTimer is started
+(``--step-timing``) or a "step" listener is registered (``--session-trace``);
+with a StepTimer every call becomes a step that records its
+duration, nesting, the number of WebDriver commands issued and how the time was
+spent: sleeping (time.sleep), waiting (WebDriverWait, async wait scripts),
+executing WebDriver commands, or in Python.
+"""
+import functools
+import html
+import json
+import os
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, List, Optional
+
+from selenium.webdriver.remote.command import Command
+
+from util.instrumentation import add_listener, emit, has_listeners, remove_listener
+
+
+# Async scripts are the in-page wait helpers, so they count as waiting
+WAIT_COMMANDS = {Command.W3C_EXECUTE_SCRIPT_ASYNC}
+
+_active: Optional["StepTimer"] = None
+
+
+def instrument(func):
+    """Wrap a page-object method so it is recorded as a step while a StepTimer runs."""
+    if getattr(func, "_step_timed", False):
+        return func
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        timer = _active
+        if timer is None and not has_listeners("step"):
+            return func(*args, **kwargs)
+        start = time.perf_counter()
+        error = None
+        try:
+            if timer is None:
+                return func(*args, **kwargs)
+            with timer.step(func.__qualname__):
+                return func(*args, **kwargs)
+        except Exception as e:
+            error = type(e).__name__
+            raise
+        finally:
+            emit("step", func.__qualname__, start, time.perf_counter() - start, error)
+
+    wrapper._step_timed = True
+    return wrapper
+
+
+def instrument_class(cls):
+    """Wrap the public methods defined on ``cls`` (not inherited ones)."""
+    for name, value in list(vars(cls).items()):
+        if name.startswith("_") or not callable(value) or isinstance(value, (staticmethod, classmethod, type)):
+            continue
+        setattr(cls, name, instrument(value))
+    return cls
+
+
+class StepTimer:
+    """Collect the steps of one test."""
+
+    def __init__(self, test_name: str):
+        self.test_name = test_name
+        self.steps: List[Dict[str, Any]] = []
+        self._stack: List[Dict[str, Any]] = []
+        self._origin = time.perf_counter()
+
+    # ── activation ───────────────────────────────────────────────────────
+
+    def start(self):
+        """Listen to WebDriver commands, sleeps and waits and make this the active timer."""
+        global _active
+        add_listener("command", self._on_command)
+        add_listener("sleep", self._on_sleep)
+        add_listener("wait", self._on_wait)
+        _active = self
+
+    def stop(self):
+        """Stop listening."""
+        global _active
+        remove_listener("command", self._on_command)
+        remove_listener("sleep", self._on_sleep)
+        remove_listener("wait", self._on_wait)
+        if _active is self:
+            _active = None
+
+    def _on_command(self, command, params, start, duration, in_wait):
+        self._add("commands", 1)
+        # Time of commands issued while polling is already part of the wait
+        if not in_wait:
+            self._add("wait_time" if command in WAIT_COMMANDS else "command_time", duration)
+
+    def _on_sleep(self, seconds, start, duration, in_wait):
+        if not in_wait:
+            self._add("sleep_time", duration)
+
+    def _on_wait(self, method, start, duration):
+        self._add("wait_time", duration)
+
+    # ── recording ────────────────────────────────────────────────────────
+
+    @contextmanager
+    def step(self, name: str):
+        frame = {
+            "name": name,
+            "depth": len(self._stack),
+            "start": time.perf_counter(),
+            "commands": 0,
+            "command_time": 0.0,
+            "sleep_time": 0.0,
+            "wait_time": 0.0,
+            "error": None,
+            # Re-entrant calls (e.g. a retry calling itself) must not be counted twice in aggregate()
+            "reentrant": any(f["name"] == name for f in self._stack),
+        }
+        self._stack.append(frame)
+        try:
+            yield
+        except Exception as e:
+            frame["error"] = type(e).__name__
+            raise
+        finally:
+            self._stack.pop()
+            duration = time.perf_counter() - frame["start"]
+            self.steps.append({
+                "name": name,
+                "depth": frame["depth"],
+                "start": round(frame["start"] - self._origin, 4),
+                "duration": round(duration, 4),
+                "commands": frame["commands"],
+                "command_time": round(frame["command_time"], 4),
+                "sleep_time": round(frame["sleep_time"], 4),
+                "wait_time": round(frame["wait_time"], 4),
+                "python_time": round(
+                    max(0.0, duration - frame["command_time"] - frame["sleep_time"] - frame["wait_time"]), 4
+                ),
+                "error": frame["error"],
+                "reentrant": frame["reentrant"],
+            })
+
+    def _add(self, key: str, value):
+        # Totals are inclusive: a nested step's time also counts for its callers
+        for frame in self._stack:
+            frame[key] += value
+
+    # ── output ───────────────────────────────────────────────────────────
+
+    def ordered_steps(self) -> List[Dict[str, Any]]:
+        """Steps in call order (they are recorded when they finish)."""
+        return sorted(self.steps, key=lambda s: (s["start"], s["depth"]))
+
+    def aggregate(self) -> List[Dict[str, Any]]:
+        """Totals per method, slowest first; only outermost calls count towards the time."""
+        totals: Dict[str, Dict[str, Any]] = {}
+        for step in self.steps:
+            entry = totals.setdefault(step["name"], {
+                "name": step["name"], "calls": 0, "duration": 0.0, "commands": 0,
+                "sleep_time": 0.0, "wait_time": 0.0, "command_time": 0.0, "python_time": 0.0,
+            })
+            entry["calls"] += 1
+            if not step["reentrant"]:
+                for key in ("duration", "commands", "sleep_time", "wait_time", "command_time", "python_time"):
+                    entry[key] += step[key]
+        return sorted(totals.values(), key=lambda e: e["duration"], reverse=True)
+
+    def save(self, path: str):
+        """Write the trace of the test as JSON."""
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as f:
+            json.dump({
+                "test": self.test_name,
+                "summary": self.aggregate(),
+                "steps": self.ordered_steps(),
+            }, f, indent=2)
+
+    def to_html(self, max_rows: int = 25) -> str:
+        """Summary table for the pytest-html report."""
+        if not self.steps:
+            return ""
+        rows = "".join(
+            f"<tr><td>{html.escape(e['name'])}</td><td>{e['calls']}</td><td>{e['duration']:.2f}s</td>"
+            f"<td>{e['sleep_time']:.2f}s</td><td>{e['wait_time']:.2f}s</td><td>{e['command_time']:.2f}s</td>"
+            f"<td>{e['python_time']:.2f}s</td><td>{e['commands']}</td></tr>"
+            for e in self.aggregate()[:max_rows]
+        )
+        return (
+            '<div><strong>Step timing</strong>'
+            '<table style="border-collapse:collapse;font-size:12px;" border="1" cellpadding="3">'
+            "<tr><th>Step</th><th>Calls</th><th>Total</th><th>Sleep</th><th>Wait</th>"
+            "<th>WebDriver</th><th>Python</th><th>Commands</th></tr>"
+            f"{rows}</table></div>"
+        )
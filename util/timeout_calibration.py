@@ -0,0 +1,244 @@
+# Copyright (c) 2025 Open Brain Institute
+# SPDX-License-Identifier: Apache-2.0
+"""
+Timeout calibration from the observed duration of named waits.
+
+Named waits record how long they took, whether they succeeded, and the
+hard-coded timeout they ran with. With ``--calibrated-timeouts`` a wait gets a
+per-environment timeout of p99 of its recent durations times a safety factor
+instead of the hard-coded guess. A failed wait only tells that the wait needed
+longer than it ran, so failures are right-censored samples at their timeout and
+the percentile is a Kaplan-Meier estimate; a survivorship-biased timeout would
+otherwise shrink exactly for the waits that time out. The timeout is never
+below the longest recent success. A wait that usually takes 3s
+then fails after a few seconds instead of 40, and a wait that regularly takes
+longer than its guess no longer hits that cliff. ``view_timeouts.py`` lists
+waits whose hard-coded timeout is far above or below their calibrated one.
+
+Recording is opt-in (``--record-timeouts``, ``--timeout-db`` or
+``--calibrated-timeouts``). Page objects use the module-level helpers, which do
+nothing until the session fixture activates a store::
+
+    with calibrated_wait("explore.brain_region_panel", timeout) as timeout:
+        WebDriverWait(self.browser, timeout).until(...)
+"""
+import logging
+import math
+import sqlite3
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, List, Optional, Tuple
+
+from util.perf_baseline import percentile
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS wait_samples (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    recorded_at REAL NOT NULL,
+    env TEXT NOT NULL,
+    name TEXT NOT NULL,
+    seconds REAL NOT NULL,
+    success INTEGER NOT NULL,
+    default_timeout REAL
+);
+CREATE INDEX IF NOT EXISTS idx_wait_samples_key ON wait_samples (env, name, recorded_at);
+"""
+
+_active: Optional["TimeoutCalibration"] = None
+
+
+def censored_percentile(samples: List[Tuple[float, bool]], pct: float) -> float:
+    """
+    Kaplan-Meier estimate of a percentile of durations with right-censored samples.
+
+    Args:
+        samples: (seconds, success) pairs; a failure means the duration exceeded its seconds
+        pct: Percentile, 0-100
+
+    Returns:
+        The percentile, or the longest observation when the estimate never reaches it
+        (too many failures), a lower bound of the percentile
+    """
+    target = 1 - pct / 100
+    survival = 1.0
+    at_risk = len(samples)
+    # At equal durations successes come first: a wait that failed at t survived t
+    for seconds, success in sorted(samples, key=lambda s: (s[0], not s[1])):
+        if success:
+            survival *= 1 - 1 / at_risk
+            if survival <= target + 1e-12:
+                return seconds
+        at_risk -= 1
+    return max(seconds for seconds, _ in samples)
+
+
+def required_samples(pct: float) -> int:
+    """Samples needed so that the percentile rests on at least five observations beyond it."""
+    return math.ceil(5 * 100 / (100 - pct))
+
+
+class TimeoutCalibration:
+    """Store of named wait durations and the timeouts derived from them."""
+
+    def __init__(self, db_path: str, env: str, apply: bool = False, pct: float = 99,
+                 safety_factor: float = 1.5, min_samples: Optional[int] = None, window: int = 1000,
+                 floor: float = 2.0, ceiling: float = 900.0, logger=None):
+        """
+        Args:
+            db_path: SQLite database file
+            env: Environment the durations belong to (staging, production)
+            apply: Return calibrated timeouts; otherwise only record and return defaults
+            pct: Percentile of durations the timeout is based on
+            safety_factor: Multiplier applied to that percentile
+            min_samples: Samples needed before a timeout is calibrated, by default
+                ``required_samples(pct)`` (500 for p99)
+            window: Number of most recent samples per wait considered
+            floor: Lowest calibrated timeout in seconds
+            ceiling: Highest calibrated timeout in seconds
+            logger: Optional logger, falls back to the module logger
+        """
+        self.db_path = db_path
+        self.env = env
+        self.apply = apply
+        self.pct = pct
+        self.safety_factor = safety_factor
+        self.min_samples = required_samples(pct) if min_samples is None else min_samples
+        self.window = max(window, self.min_samples)
+        self.floor = floor
+        self.ceiling = ceiling
+        self.logger = logger or logging.getLogger(__name__)
+        self._cache: Dict[str, Optional[float]] = {}
+
+        with self._connect() as conn:
+            conn.executescript(SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        # Parallel workers write to the same file; WAL lets readers and a writer coexist
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        return conn
+
+    def record(self, name: str, seconds: float, success: bool, default_timeout: Optional[float] = None):
+        """Store one observation of a named wait."""
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT INTO wait_samples (recorded_at, env, name, seconds, success, default_timeout) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (time.time(), self.env, name, seconds, int(success), default_timeout),
+            )
+
+    def _samples(self, name: str) -> List[tuple]:
+        with self._connect() as conn:
+            return conn.execute(
+                "SELECT seconds, success FROM wait_samples WHERE env = ? AND name = ? "
+                "ORDER BY recorded_at DESC LIMIT ?",
+                (self.env, name, self.window),
+            ).fetchall()
+
+    def calibrated(self, name: str) -> Optional[float]:
+        """Calibrated timeout of a wait, or None while its history is too short."""
+        # Computed once per session so timeouts don't drift while the run records
+        if name not in self._cache:
+            samples = self._samples(name)
+            durations = [seconds for seconds, success in samples if success]
+            if len(samples) < self.min_samples or not durations:
+                self._cache[name] = None
+            else:
+                value = censored_percentile(samples, self.pct) * self.safety_factor
+                value = min(max(value, self.floor), self.ceiling)
+                # Never below what the wait recently needed, even above the ceiling
+                self._cache[name] = math.ceil(max(value, max(durations)) * 10) / 10
+        return self._cache[name]
+
+    def timeout(self, name: str, default: float) -> float:
+        """Timeout to use for a wait: calibrated when applying and known, else the default."""
+        if not self.apply:
+            return default
+        value = self.calibrated(name)
+        return default if value is None else value
+
+    def report(self, ratio: float = 3.0) -> List[Dict[str, Any]]:
+        """
+        Compare the hard-coded timeout of every wait with its calibrated one.
+
+        Args:
+            ratio: How many times larger/smaller than calibrated a default must be to be flagged
+
+        Returns:
+            One entry per wait, flagged "over" (default far above what the wait needs),
+            "under" (default below the calibrated timeout) or None
+        """
+        with self._connect() as conn:
+            names = [r[0] for r in conn.execute(
+                "SELECT DISTINCT name FROM wait_samples WHERE env = ? ORDER BY name", (self.env,)
+            )]
+            # SQLite takes the bare column from the row holding MAX(), i.e. the latest default
+            defaults = {name: default for name, default, _ in conn.execute(
+                "SELECT name, default_timeout, MAX(recorded_at) FROM wait_samples "
+                "WHERE env = ? AND default_timeout IS NOT NULL GROUP BY name", (self.env,)
+            )}
+
+        entries = []
+        for name in names:
+            samples = self._samples(name)
+            durations = [seconds for seconds, success in samples if success]
+            failures = sum(1 for _, success in samples if not success)
+            calibrated = self.calibrated(name)
+            default = defaults.get(name)
+            flag = None
+            if calibrated is not None and default:
+                if default >= calibrated * ratio:
+                    flag = "over"
+                elif default < calibrated:
+                    flag = "under"
+            entries.append({
+                "name": name,
+                "samples": len(samples),
+                "failures": failures,
+                "p50": round(percentile(durations, 50), 2) if durations else None,
+                "p99": round(censored_percentile(samples, self.pct), 2) if durations else None,
+                "default_timeout": default,
+                "calibrated_timeout": calibrated,
+                "flag": flag,
+            })
+        return entries
+
+
+def activate(store: Optional[TimeoutCalibration]):
+    """Make ``store`` the store used by the module-level helpers (None to deactivate)."""
+    global _active
+    _active = store
+
+
+def is_active() -> bool:
+    """Whether named waits are recorded in this session."""
+    return _active is not None
+
+
+def calibrated_timeout(name: str, default: float) -> float:
+    """Timeout for a named wait; the default when no store is active."""
+    return default if _active is None else _active.timeout(name, default)
+
+
+def record_wait(name: str, seconds: float, success: bool, default: Optional[float] = None):
+    """Record a named wait's outcome, for waits that report failure by return value."""
+    if _active is None:
+        return
+    try:
+        _active.record(name, seconds, success, default)
+    except sqlite3.Error as e:
+        _active.logger.warning(f"Could not record wait {name}: {e}")
+
+
+@contextmanager
+def calibrated_wait(name: str, default: float):
+    """Yield the timeout for a named wait and record its duration; exceptions count as failures."""
+    timeout = calibrated_timeout(name, default)
+    start = time.perf_counter()
+    try:
+        yield timeout
+    except Exception:
+        record_wait(name, time.perf_counter() - start, False, default)
+        raise
+    record_wait(name, time.perf_counter() - start, True, default)
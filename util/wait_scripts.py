@@ -0,0 +1,145 @@
+# Copyright (c) 2025 Open Brain Institute
+# SPDX-License-Identifier: Apache-2.0
+"""
+In-page JavaScript used by the wait helpers in CustomBasePage.
+
+Each wait runs as a single execute_async_script call: the polling happens in the
+browser and the script calls back as soon as the condition holds, instead of
+Python sleeping and re-querying the page over WebDriver.
+"""
+
+# MutationObserver installed once per document; records the time of the last DOM change.
+INSTALL_DOM_OBSERVER = """
+if (!window.__obiDomObserver) {
+    var domState = {lastMutation: performance.now(), mutations: 0};
+    new MutationObserver(function (records) {
+        domState.mutations += records.length;
+        domState.lastMutation = performance.now();
+    }).observe(document.documentElement || document, {
+        childList: true, subtree: true, attributes: true, characterData: true
+    });
+    window.__obiDomObserver = domState;
+}
+"""
+
+# arguments: quietMs, timeoutMs. Resolves true once the DOM has not changed for quietMs.
+WAIT_FOR_DOM_QUIET = INSTALL_DOM_OBSERVER + """
+var quietMs = arguments[0], timeoutMs = arguments[1], done = arguments[arguments.length - 1];
+var start = performance.now();
+(function poll() {
+    var now = performance.now();
+    if (now - window.__obiDomObserver.lastMutation >= quietMs) { return done(true); }
+    if (now - start >= timeoutMs) { return done(false); }
+    setTimeout(poll, 50);
+})();
+"""
+
+# arguments: timeoutMs. Resolves after two animation frames and an idle period,
+# i.e. once React has committed pending renders and the main thread is free.
+WAIT_FOR_RENDER_IDLE = """
+var timeoutMs = arguments[0], done = arguments[arguments.length - 1];
+requestAnimationFrame(function () {
+    requestAnimationFrame(function () {
+        if (window.requestIdleCallback) {
+            requestIdleCallback(function () { done(true); }, {timeout: timeoutMs});
+        } else {
+            setTimeout(function () { done(true); }, 0);
+        }
+    });
+});
+"""
+
+# arguments: element, stableFrames, timeoutMs. Resolves true once the element's
+# bounding box is unchanged for stableFrames animation frames (animations done).
+WAIT_FOR_ELEMENT_STABLE = """
+var el = arguments[0], frames = arguments[1], timeoutMs = arguments[2];
+var done = arguments[arguments.length - 1];
+var start = performance.now(), last = null, stableCount = 0;
+(function check() {
+    if (!el.isConnected) { return done(false); }
+    var r = el.getBoundingClientRect();
+    var current = [r.x, r.y, r.width, r.height].join(',');
+    stableCount = current === last ? stableCount + 1 : 0;
+    last = current;
+    if (stableCount >= frames) { return done(true); }
+    if (performance.now() - start >= timeoutMs) { return done(false); }
+    requestAnimationFrame(check);
+})();
+"""
+
+# Wraps fetch, XMLHttpRequest and WebSocket (until open) to keep an in-flight
+# counter and the time of the last network activity. Idempotent; create_browser
+# also registers it to run before any page script (CDP on Chrome, a WebDriver BiDi
+# preload script on Firefox). When it is only injected by the first wait, requests
+# already in flight can't be counted, but their completion still shows up as a
+# resource timing entry and counts as activity.
+NETWORK_TRACKER = """
+(function () {
+    if (window.__obiNetwork) { return; }
+    var net = window.__obiNetwork = {inflight: 0, total: 0, lastActivity: performance.now()};
+    function begin() { net.inflight++; net.total++; net.lastActivity = performance.now(); }
+    function end() { net.inflight = Math.max(0, net.inflight - 1); net.lastActivity = performance.now(); }
+
+    if (window.fetch) {
+        var originalFetch = window.fetch;
+        window.fetch = function () {
+            begin();
+            try {
+                return originalFetch.apply(this, arguments).then(
+                    function (response) { end(); return response; },
+                    function (error) { end(); throw error; }
+                );
+            } catch (error) { end(); throw error; }
+        };
+    }
+
+    var originalSend = XMLHttpRequest.prototype.send;
+    XMLHttpRequest.prototype.send = function () {
+        begin();
+        this.addEventListener('loadend', end, {once: true});
+        try { return originalSend.apply(this, arguments); } catch (error) { end(); throw error; }
+    };
+
+    if (window.WebSocket) {
+        var OriginalWebSocket = window.WebSocket;
+        var TrackedWebSocket = function (url, protocols) {
+            var socket = protocols === undefined
+                ? new OriginalWebSocket(url) : new OriginalWebSocket(url, protocols);
+            var connecting = true;
+            function connected() { if (connecting) { connecting = false; end(); } }
+            begin();
+            socket.addEventListener('open', connected);
+            socket.addEventListener('error', connected);
+            socket.addEventListener('close', connected);
+            return socket;
+        };
+        TrackedWebSocket.prototype = OriginalWebSocket.prototype;
+        ['CONNECTING', 'OPEN', 'CLOSING', 'CLOSED'].forEach(function (k) {
+            TrackedWebSocket[k] = OriginalWebSocket[k];
+        });
+        window.WebSocket = TrackedWebSocket;
+    }
+
+    if (window.PerformanceObserver) {
+        try {
+            new PerformanceObserver(function () { net.lastActivity = performance.now(); })
+                .observe({type: 'resource'});
+        } catch (error) {}
+    }
+})();
+"""
+
+# arguments: idleMs, timeoutMs. Resolves once the document has loaded, nothing is
+# in flight and there was no network activity for idleMs. Returns {idle, inflight, total}.
+WAIT_FOR_NETWORK_IDLE = NETWORK_TRACKER + """
+var idleMs = arguments[0], timeoutMs = arguments[1], done = arguments[arguments.length - 1];
+var net = window.__obiNetwork, start = performance.now();
+(function poll() {
+    var now = performance.now();
+    var idle = document.readyState === 'complete' && net.inflight === 0 && now - net.lastActivity >= idleMs;
+    if (idle || now - start >= timeoutMs) {
+        return done({idle: idle, inflight: net.inflight, total: net.total});
+    }
+    setTimeout(poll, 50);
+})();
+"""
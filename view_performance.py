@@ -7,15 +7,21 @@ Performance report viewer - Analyze and visualize performance test results.
 Usage:
     python view_performance.py performance_public_pages.json
     python view_performance.py performance_*.json  # Compare multiple reports
+    python view_performance.py performance_login_flow.jsonl  # Stream of an interrupted run
 """
 import json
 import sys
 from pathlib import Path
 from typing import List, Dict, Any
 
+from util.perf_report import compact_stream
+
 
 def load_report(filepath: str) -> Dict[str, Any]:
-    """Load a performance report from JSON file."""
+    """Load a performance report from a JSON report or a JSONL sample stream."""
+    if filepath.endswith('.jsonl'):
+        # Stream of a run that may not have finished; summarize it on the fly
+        return compact_stream(filepath)
     with open(filepath, 'r') as f:
         return json.load(f)
 
@@ -37,12 +43,18 @@ def print_summary(report: Dict[str, Any], filename: str):
     print(f"{'='*70}\n")
 
 
+def _or_dash(value) -> str:
+    """Format an optional metric value for the table."""
+    return '-' if value is None else str(value)
+
+
 def print_detailed_metrics(report: Dict[str, Any]):
     """Print detailed metrics for each page."""
     metrics = report.get('metrics', [])
     
-    print(f"{'Page':<30} {'Total':<10} {'DNS':<8} {'TCP':<8} {'Request':<10} {'DOM':<10}")
-    print(f"{'-'*30} {'-'*10} {'-'*8} {'-'*8} {'-'*10} {'-'*10}")
+    print(f"{'Page':<30} {'Total':<10} {'DNS':<8} {'TCP':<8} {'Request':<10} {'DOM':<10} "
+          f"{'LCP':<8} {'CLS':<8} {'INP':<8} {'TBT':<8}")
+    print(f"{'-'*30} {'-'*10} {'-'*8} {'-'*8} {'-'*10} {'-'*10} {'-'*8} {'-'*8} {'-'*8} {'-'*8}")
     
     for metric in metrics:
         page_name = metric.get('page_name', 'Unknown')[:28]
@@ -51,8 +63,14 @@ def print_detailed_metrics(report: Dict[str, Any]):
         tcp = metric.get('tcp_connection_time', 0)
         request = metric.get('request_time', 0)
         dom = metric.get('dom_processing_time', 0)
+        # Web vitals are missing from older reports and unsupported entry types
+        lcp = _or_dash(metric.get('largest_contentful_paint'))
+        cls = _or_dash(metric.get('cumulative_layout_shift'))
+        inp = _or_dash(metric.get('interaction_to_next_paint'))
+        tbt = _or_dash(metric.get('total_blocking_time'))
         
-        print(f"{page_name:<30} {total:<10} {dns:<8} {tcp:<8} {request:<10} {dom:<10}")
+        print(f"{page_name:<30} {total:<10} {dns:<8} {tcp:<8} {request:<10} {dom:<10} "
+              f"{lcp:<8} {cls:<8} {inp:<8} {tbt:<8}")
     
     print()
 
@@ -71,6 +89,23 @@ def print_slow_pages(report: Dict[str, Any], threshold_ms: int = 3000):
         print(f"✅ All pages load under {threshold_ms}ms\n")
 
 
+def print_distributions(report: Dict[str, Any]):
+    """Print min/median/p95/stddev of sampled pages, per cache state."""
+    distributions = report.get('summary', {}).get('distributions') or {}
+    if not distributions:
+        return
+    
+    print(f"📉 Sample Distributions")
+    print(f"{'Page':<30} {'Cache':<6} {'Metric':<26} {'n':<4} {'Min':<8} {'Median':<8} {'P95':<8} {'Stddev':<8}")
+    print(f"{'-'*30} {'-'*6} {'-'*26} {'-'*4} {'-'*8} {'-'*8} {'-'*8} {'-'*8}")
+    for page_name, states in distributions.items():
+        for cache_state, metrics in states.items():
+            for metric_name, d in metrics.items():
+                print(f"{page_name[:28]:<30} {cache_state:<6} {metric_name:<26} {d['samples']:<4} "
+                      f"{d['min']:<8} {d['median']:<8} {d['p95']:<8} {d['stddev']:<8}")
+    print()
+
+
 def compare_reports(reports: List[tuple]):
     """Compare multiple performance reports."""
     print(f"\n{'='*70}")
@@ -132,6 +167,7 @@ def main():
         print("  python view_performance.py performance_*.json")
         print("  python view_performance.py report.json --detailed")
         print("  python view_performance.py report.json --breakdown 'Landing Page'")
+        print("  python view_performance.py report.jsonl    # sample stream, e.g. of a failed test")
         sys.exit(1)
     
     # Parse arguments
@@ -185,6 +221,7 @@ def main():
             print_breakdown(report)
         else:
             print_detailed_metrics(report)
+        print_distributions(report)
         
         print_slow_pages(report, threshold)
     else:
@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+# Copyright (c) 2025 Open Brain Institute
+# SPDX-License-Identifier: Apache-2.0
+"""
+Timeout calibration report - Compare hard-coded wait timeouts with their history.
+
+Usage:
+    python view_timeouts.py --env staging
+    python view_timeouts.py --env production --db .timeout_calibration.sqlite --ratio 4
+"""
+import argparse
+import sys
+
+from util.timeout_calibration import TimeoutCalibration
+
+
+def _fmt(value) -> str:
+    return "-" if value is None else f"{value:.1f}s"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare hard-coded wait timeouts with observed durations")
+    parser.add_argument("--env", default="staging", help="Environment to report on")
+    parser.add_argument("--db", default=".timeout_calibration.sqlite", help="Calibration database")
+    parser.add_argument("--ratio", type=float, default=3.0,
+                        help="Flag defaults at least this many times the calibrated timeout")
+    parser.add_argument("--safety-factor", type=float, default=1.5, help="Multiplier applied to p99")
+    args = parser.parse_args()
+
+    store = TimeoutCalibration(args.db, env=args.env, safety_factor=args.safety_factor)
+    entries = store.report(ratio=args.ratio)
+    if not entries:
+        print(f"❌ No named waits recorded for {args.env}")
+        sys.exit(1)
+
+    print(f"\n{'='*100}")
+    print(f"⏱️  TIMEOUT CALIBRATION ({args.env})")
+    print(f"{'='*100}")
+    print(f"{'Wait':<55} {'Samples':>7} {'Fail':>5} {'p50':>8} {'p99':>8} {'Default':>8} {'Calib.':>8}")
+    print(f"{'─'*100}")
+    for e in entries:
+        marker = {"over": "⬇️ ", "under": "⬆️ "}.get(e["flag"], "   ")
+        print(f"{marker}{e['name'][:52]:<52} {e['samples']:>7} {e['failures']:>5} {_fmt(e['p50']):>8} "
+              f"{_fmt(e['p99']):>8} {_fmt(e['default_timeout']):>8} {_fmt(e['calibrated_timeout']):>8}")
+
+    over = [e for e in entries if e["flag"] == "over"]
+    under = [e for e in entries if e["flag"] == "under"]
+    print(f"{'─'*100}")
+    print(f"⬇️  {len(over)} waits with a timeout far above what they need (failures take longer than necessary)")
+    print(f"⬆️  {len(under)} waits with a timeout below their calibrated one (risk of flaky timeouts)")
+
+
+if __name__ == "__main__":
+    main()